@@ -0,0 +1 @@
+"""Shared engine for the Dysnesia frontends (main2.py, admin.py, python.py)."""
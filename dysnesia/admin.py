@@ -0,0 +1,110 @@
+"""The admin/debug layer, as a plug-in over a normal game.
+
+``install(game)`` turns a game made by ``state.init()`` into the admin
+build: a far larger money multiplier, a 10x cheaper black hole, roomier
+map click zones and the harder region rules below. The debug actions
+(granting ore, unlocking the black hole) are plain functions the admin
+frontend binds to keys.
+"""
+from dysnesia import combat, state
+
+ADMIN_MULTIPLIER = 10000
+# black hole upgrade prices are divided by this
+BLACKHOLE_DISCOUNT = 10
+# (columns, rows above, rows below) of padding around each map label
+ZONE_PADDING = (6, 1, 1)
+# ore of every kind granted by the debug key
+GRANT_ORE = 50
+
+# enemy hp per region; others get the standard 80
+REGION_HP = {
+    'whispering_pines': 20,
+    'silent_graveyard': 30,
+    'hollowed_farmlands': 50,
+    'sunken_marketplace': 60,
+    'old_residential_district': 120,
+    'mirror_marsh': 200,
+    'obsidian_quarry': 20,
+    'forgotten_sanctum': 500,
+}
+
+# what the Forgotten Sanctum enemy says as you hit it, in order
+SANCTUM_DIALOGUE = (
+    "Have you really forgotten us?",
+    "Why are you doing this to me, to US??",
+    "Please, stop...",
+    "I know you're not like this..",
+    "Snap out of it..",
+    "You're dreaming...",
+    "You promised you had it controlled..",
+    "PLEASE!!",
+    "STOP!!",
+    "Why...",
+    "WHY...",
+)
+# chance an attack misses in the Obsidian Quarry
+QUARRY_MISS = 0.9
+# chance of a double hit in the Mirror Marsh (either side)
+MARSH_DOUBLE = 0.5
+
+# map lines that differ in the admin build, by index
+MAP_LINES = {
+    8: "     /   (FOREST TRAIL)   \\         | /   SILENT GRAVEYARD \\",
+    50: "                                                 ",
+}
+
+PLAYER_ASCII = [
+    " (\\_",
+    "  ( •_•)",
+    "  /︶\\╰─*>",
+    "",
+    "",
+]
+
+
+class AdminRules(combat.Rules):
+    """Region quirks: a talking, nearly harmless Sanctum, a quarry you
+    mostly miss in, and a marsh that doubles hits and heals."""
+
+    def region_rules(self, region):
+        rules = combat.RegionRules(REGION_HP.get(region, self.enemy_hp))
+        if region == 'obsidian_quarry':
+            rules.player_miss = QUARRY_MISS
+        elif region == 'mirror_marsh':
+            rules.player_double = rules.enemy_double = MARSH_DOUBLE
+            rules.heal_factor = 2
+        elif region == 'forgotten_sanctum':
+            rules.enemy_damage = 1
+        return rules
+
+    def describe(self, game, kind, amount, note):
+        if kind == "attack" and game.current_enemy_region == 'forgotten_sanctum':
+            line = SANCTUM_DIALOGUE[game.forgotten_sanctum_dialogue_index % len(SANCTUM_DIALOGUE)]
+            game.forgotten_sanctum_dialogue_index += 1
+            return f"[{combat.glitch_text(line, game.rng.glitch)}] You deal {amount} dmg."
+        return super().describe(game, kind, amount, note)
+
+
+def install(game):
+    """Apply the admin layer to a freshly initialised ``game``."""
+    game.adminmultiplier = ADMIN_MULTIPLIER
+    for upg in game.blackhole_upgrades:
+        upg["base_cost"] //= BLACKHOLE_DISCOUNT
+        upg["cost"] //= BLACKHOLE_DISCOUNT
+    game.zone_padding = ZONE_PADDING
+    game.combat_rules = AdminRules()
+    state.set_map_art(game, [MAP_LINES.get(i, line) for i, line in enumerate(game.map_art)])
+    game.admin_ore_granted_msg = ""
+    return game
+
+
+def grant_ore(game, amount=GRANT_ORE):
+    """Debug: add ``amount`` of every ore to the inventory."""
+    for name in game.ore_inventory:
+        game.ore_inventory[name] += amount
+    game.admin_ore_granted_msg = f"[ADMIN] +{amount} ore granted!"
+
+
+def unlock_blackhole(game):
+    """Debug: open the black hole page without paying for it."""
+    game.blackhole_page_unlocked = True
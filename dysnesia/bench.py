@@ -0,0 +1,371 @@
+"""Hot-path benchmarks with a regression gate.
+
+Each case loads a fresh frontend (see ``dysnesia.sim.load_frontend``), so
+it runs without a terminal, and times one call of a hot path with
+``timeit``. Results are written as JSON; given a baseline file (from an
+earlier ``--save-baseline`` run on the same machine -- the baseline is
+machine-specific and never committed) any case whose median got slower
+than the allowed percentage, widened by the run-to-run noise of both
+measurements, fails the run with exit status 1. Next to every case a fixed
+``reference_work()`` is timed, and the baseline is scaled by how its time
+changed, so a machine that is busier than when the baseline was taken
+doesn't read as a regression. A case that looks slower is measured again
+before it counts, so one noisy run can't fail the gate.
+
+    python -m dysnesia.bench                      # run, compare to bench_baseline.json
+    python -m dysnesia.bench --save-baseline      # record a new baseline
+    python -m dysnesia.bench --threshold 10 --output results.json
+    python -m dysnesia.bench --case render_line --case economy_hour
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+
+from dysnesia import planet, sim, text
+from dysnesia.text import display_width
+
+DEFAULT_BASELINE = os.path.join(sim.ROOT, "bench_baseline.json")
+# allowed slowdown against the baseline, in percent
+DEFAULT_THRESHOLD = 25.0
+# the threshold widens by this many times the larger noise (spread of the
+# repeats around their median, in percent) of baseline and current run
+NOISE_FACTOR = 3.0
+# times a case that looks slower is measured again before it fails
+DEFAULT_RETRIES = 2
+
+# name -> setup(front) returning the callable to time; front.GAME is its state
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class FakeWindow:
+    """Just enough of a curses window for ``render_line()``."""
+
+    def __init__(self, rows=40, cols=120):
+        self.rows = rows
+        self.cols = cols
+        self.cells = [""] * rows
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def addstr(self, y, x, text, attr=0):
+        self.cells[y] = text
+
+
+# --- cases -----------------------------------------------------------------
+
+def _width_lines(front):
+    g = front.GAME
+    lines = list(g.map_art) + front.generate_planet_art(6, 40)
+    lines += [f"[{u['key'].upper()}] {u['name']} - {u['desc']}" for u in g.blackhole_upgrades]
+    return lines
+
+
+@case("display_width")
+def _display_width(front):
+    lines = _width_lines(front)
+
+    def run():
+        for line in lines:
+            display_width(line)
+    return run
+
+
+@case("display_width_cold")
+def _display_width_cold(front):
+    lines = _width_lines(front)
+
+    def run():
+        # every width measured from the Unicode tables again
+        text.cache_clear()
+        for line in lines:
+            display_width(line)
+    return run
+
+
+@case("locate_labels_in_map")
+def _locate_labels(front):
+    return lambda: front.locate_labels_in_map(front.GAME.map_art)
+
+
+@case("make_absolute_zones")
+def _absolute_zones(front):
+    return lambda: front.make_absolute_zones(front.GAME.map_art, 4)
+
+
+@case("generate_planet_art")
+def _planet_art(front):
+    return lambda: front.generate_planet_art(6, 40)
+
+
+@case("generate_planet_art_cold")
+def _planet_art_cold(front):
+    def run():
+        # rasterize the planet and orbits again
+        planet.cache_clear()
+        front.generate_planet_art(6, 40)
+    return run
+
+
+def _city_runner(front, cold):
+    front.generate_city_layout()
+    front.update_building_heights(30)
+    sink = io.StringIO()
+
+    def run():
+        if cold:
+            # render the skyline rows again
+            front.city_skyline.clear()
+        sink.seek(0)
+        sink.truncate()
+        with contextlib.redirect_stdout(sink):
+            front.draw_city()
+    return run
+
+
+@case("draw_city")
+def _draw_city(front):
+    return _city_runner(front, cold=False)
+
+
+@case("draw_city_cold")
+def _draw_city_cold(front):
+    return _city_runner(front, cold=True)
+
+
+@case("spawn_new_ore")
+def _spawn_new_ore(front):
+    front.GAME.depth = front.GAME.max_depth = 3
+    return front.spawn_new_ore
+
+
+@case("auto_mine_tick")
+def _auto_mine_tick(front):
+    g = front.GAME
+    g.depth = g.max_depth = 3
+    g.auto_mine_damage = 500
+    front.spawn_new_ore()
+    return front.auto_mine_tick
+
+
+@case("perform_player_action")
+def _perform_player_action(front):
+    g = front.GAME
+    region = g.dungeon_progression_order[0]
+
+    def run():
+        # one whole fight, then forget the kill so the next one starts clean
+        front.enter_combat(location_name=region)
+        while g.combat_started:
+            front.perform_player_action("attack")
+        g.defeated_regions.discard(region)
+        del g.killed_monsters[:]
+        g.consecutive_defeats = 0
+        g.world = 2
+    return run
+
+
+@case("render_line")
+def _render_line(front):
+    win = FakeWindow()
+    art = front.GAME.map_art
+    frames = [
+        [f"{i:3d} " + line for i, line in enumerate(art[:win.rows])],
+        [f"{i:3d}*" + line for i, line in enumerate(art[:win.rows])],
+    ]
+    state = [0]
+
+    def run():
+        # alternate two screens so every line changes each call
+        state[0] ^= 1
+        for y, text in enumerate(frames[state[0]]):
+            front.render_line(win, y, text)
+    return run
+
+
+@case("economy_hour")
+def _economy_hour(front):
+    # a mid-game state: city income, auto miners at depth 3
+    g = front.GAME
+    g.rate = 500
+    g.technology_page_unlocked = True
+    g.depth = g.max_depth = 3
+    g.auto_mine_damage = 200
+    front.spawn_new_ore()
+    ticks = int(3600 / sim.TICK_SECONDS)
+
+    def run():
+        # one simulated hour, tick by tick as the game loop runs it
+        for _ in range(ticks):
+            front.sim_tick(1)
+    return run
+
+
+# --- running ---------------------------------------------------------------
+
+def measure(fn, repeat=5, min_time=0.2):
+    """``(best, median, loops, noise)`` over ``repeat`` timed batches, in
+    seconds per call; ``noise`` is the median absolute deviation of the
+    batches as a percentage of their median."""
+    timer = timeit.Timer(fn)
+    loops, total = timer.autorange()
+    if total < min_time:
+        loops = max(1, int(loops * min_time / max(total, 1e-9)))
+    runs = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+    median = statistics.median(runs)
+    noise = statistics.median(abs(r - median) for r in runs) / median * 100.0 if median > 0 else 0.0
+    return min(runs), median, loops, noise
+
+
+def reference_work():
+    """Fixed interpreter work (dict, str and int operations) timed next to
+    every case; its time tracks how fast the machine is running right now."""
+    d = {}
+    for i in range(2000):
+        d[str(i)] = i * i
+    return sum(d.values())
+
+
+def run_cases(names=None, frontend="main2", repeat=5, min_time=0.2, seed=0):
+    """Time the named cases (all by default); returns the results document."""
+    results = {}
+    for name in names or CASES:
+        random.seed(seed)
+        front = sim.load_frontend(frontend)
+        fn = CASES[name](front)
+        best, median, loops, noise = measure(fn, repeat, min_time)
+        reference = measure(reference_work, repeat, min_time / 4)[1]
+        results[name] = {"seconds": best, "median": median, "loops": loops, "noise": noise,
+                         "reference": reference}
+    return {
+        "meta": {
+            "frontend": frontend,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": results,
+    }
+
+
+def allowed_change(cur, base, threshold=DEFAULT_THRESHOLD):
+    """Slowdown in percent a case may show before it fails: ``threshold``
+    plus ``NOISE_FACTOR`` times the noisier of the two measurements."""
+    return threshold + NOISE_FACTOR * max(cur.get("noise", 0.0), base.get("noise", 0.0))
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """``(rows, failures)``; a row is ``(case, baseline s, current s, change %)``,
+    comparing medians, with the baseline scaled by the reference timings."""
+    rows = []
+    failures = []
+    base_cases = baseline.get("cases", {})
+    for name, cur in current["cases"].items():
+        base = base_cases.get(name)
+        # baselines from before medians were kept only have "seconds"
+        base_s = base.get("median", base["seconds"]) if base is not None else 0
+        if base_s <= 0:
+            rows.append((name, None, cur["median"], None))
+            continue
+        # scale the baseline by how much faster or slower the machine runs now
+        if base.get("reference") and cur.get("reference"):
+            base_s *= cur["reference"] / base["reference"]
+        change = (cur["median"] / base_s - 1.0) * 100.0
+        rows.append((name, base_s, cur["median"], change))
+        if change > allowed_change(cur, base, threshold):
+            failures.append(name)
+    return rows, failures
+
+
+def format_seconds(s):
+    if s is None:
+        return "-"
+    if s < 1e-3:
+        return f"{s * 1e6:.2f} us"
+    if s < 1.0:
+        return f"{s * 1e3:.2f} ms"
+    return f"{s:.3f} s"
+
+
+def format_rows(rows):
+    lines = [f"{'case':<24} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for name, base, cur, change in rows:
+        pct = "new" if change is None else f"{change:+.1f}%"
+        lines.append(f"{name:<24} {format_seconds(base):>12} {format_seconds(cur):>12} {pct:>9}")
+    return "\n".join(lines)
+
+
+def write_results(results, path):
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dysnesia.bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--frontend", default="main2", help="main2, admin or a path to a frontend script")
+    parser.add_argument("--case", action="append", dest="cases", choices=sorted(CASES),
+                        help="run only this case (repeatable)")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a case is more than this many percent slower")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="re-measure a case that looks slower this many times before failing it")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed batch")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.cases, args.frontend, args.repeat, args.min_time, args.seed)
+
+    if args.save_baseline:
+        write_results(results, args.output)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(format_rows(compare(results, {})[0]))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+    rows, failures = compare(results, baseline, args.threshold)
+    for _ in range(args.retries):
+        if not failures:
+            break
+        # keep each suspect case's better run, relative to its reference timing
+        again = run_cases(failures, args.frontend, args.repeat, args.min_time, args.seed)
+        for name, cur in again["cases"].items():
+            old = results["cases"][name]
+            if cur["median"] / cur["reference"] < old["median"] / old["reference"]:
+                results["cases"][name] = cur
+        rows, failures = compare(results, baseline, args.threshold)
+    write_results(results, args.output)
+    print(format_rows(rows))
+    for name in failures:
+        print(f"FAIL: {name} regressed by more than {args.threshold:g}%", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Cached World 1 city skyline.
+
+The skyline only changes when a building grows, which only happens when
+a city upgrade is bought, yet ``draw_city()`` used to rebuild every row by
+string concatenation on every frame and roll a fresh random cloud row.
+``Skyline`` memoizes the rendered rows by the tuple of building heights,
+and ``CloudStrip`` scrolls a window over a cloud row generated once.
+"""
+import random
+
+
+class Skyline:
+    """Rendered skyline rows for a list of city buildings, memoized by their heights."""
+
+    def __init__(self, width=100, max_height=15, spacing=1):
+        self.width = width
+        self.max_height = max_height
+        self.spacing = spacing
+        # tuple of building heights -> rendered rows, top row first
+        self._lines = {}
+
+    def clear(self):
+        """Forget every rendering; call after replacing the buildings."""
+        self._lines.clear()
+
+    def lines(self, buildings):
+        key = tuple(b["height"] for b in buildings)
+        rows = self._lines.get(key)
+        if rows is None:
+            rows = self._lines[key] = self._render(buildings)
+        return rows
+
+    def _render(self, buildings):
+        gap = " " * self.spacing
+        rows = []
+        for y in reversed(range(self.max_height)):
+            parts = []
+            for b in buildings:
+                b_height = b["height"]
+                if y < b_height:
+                    b_type = b["type"]
+                    parts.append((b_type["roof"] if y == b_height - 1 else b_type["body"]) * b["width"])
+                else:
+                    parts.append(" " * b["width"])
+                parts.append(gap)
+            rows.append("".join(parts).center(self.width))
+        return tuple(rows)
+
+
+class CloudStrip:
+    """A cloud row drawn once and scrolled one column per frame."""
+
+    def __init__(self, width=100, density=0.15, length=4, rand=random.random):
+        self.width = width
+        strip = "".join("☁" if rand() > 1.0 - density else " " for _ in range(width * length))
+        # doubled so any window is a plain slice
+        self._strip = strip + strip[:width]
+        self._size = len(strip)
+        self._offset = 0
+
+    def next(self):
+        """The row for this frame."""
+        row = self._strip[self._offset:self._offset + self.width]
+        self._offset = (self._offset + 1) % self._size
+        return row
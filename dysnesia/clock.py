@@ -0,0 +1,102 @@
+"""Fixed-timestep simulation clock and adaptive frame pacing.
+
+The economy advances in whole ticks measured against ``time.monotonic()``,
+so income stays exact when a frame runs long (a slow terminal, a curses
+sub-view). Rendering is paced separately and backs off
+on its own when frames get expensive.
+"""
+import time
+
+# length of one simulation tick in seconds (income is "per second")
+TICK_SECONDS = 1.0
+
+
+class SimClock:
+    """Accumulates monotonic time and hands out whole simulation ticks."""
+
+    def __init__(self, tick=TICK_SECONDS, clock=time.monotonic):
+        self.tick = float(tick)
+        self._clock = clock
+        self._last = clock()
+        self._acc = 0.0
+        # total ticks handed out since creation
+        self.ticks = 0
+
+    def due(self):
+        """Return how many ticks came due since the last call (0, 1 or many).
+
+        Slow frames are caught up: the caller runs every returned tick.
+        """
+        now = self._clock()
+        elapsed = now - self._last
+        self._last = now
+        if elapsed > 0:
+            self._acc += elapsed
+        n = int(self._acc // self.tick)
+        if n:
+            self._acc -= n * self.tick
+            self.ticks += n
+        return n
+
+    def time_to_next(self):
+        """Seconds until the next tick comes due."""
+        pending = self._acc + (self._clock() - self._last)
+        return max(0.0, self.tick - pending)
+
+    def reset(self):
+        """Drop any accumulated time (e.g. after loading a save)."""
+        self._last = self._clock()
+        self._acc = 0.0
+
+
+class FramePacer:
+    """Adaptive render cadence.
+
+    Aims for ``fps`` frames per second, but when the work done between two
+    waits (render + input) grows, the frame interval stretches up to
+    ``1 / min_fps`` so a slow terminal renders less often instead of
+    starving the loop.
+    """
+
+    def __init__(self, fps=10.0, min_fps=2.0, clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = 1.0 / float(fps)
+        self.max_interval = 1.0 / float(min_fps)
+        self.interval = self.min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._cost = None
+        self._woke = clock()
+
+    def frame_cost(self):
+        """Smoothed seconds of work per frame (None before the first frame)."""
+        return self._cost
+
+    def time_to_next(self):
+        """Seconds until the next frame is due."""
+        return max(0.0, self._woke + self.interval - self._clock())
+
+    def wait(self, sim_clock=None, idle=False):
+        """Sleep until the next frame, or the next sim tick if that is sooner.
+
+        ``idle`` means nothing on screen animates, so there is no frame
+        deadline: only the next sim tick (or ``max_interval`` without a
+        clock) bounds the wait. With an input-aware ``sleep`` (see
+        ``dysnesia.reactor``) the wait also ends as soon as a key arrives.
+        """
+        now = self._clock()
+        work = now - self._woke
+        if self._cost is None:
+            self._cost = work
+        else:
+            self._cost = self._cost * 0.8 + work * 0.2
+        # leave at least as much idle time as the frame itself took
+        self.interval = min(self.max_interval, max(self.min_interval, self._cost * 2.0))
+        if idle and sim_clock is not None:
+            delay = sim_clock.time_to_next()
+        else:
+            delay = (self.max_interval if idle else self.interval) + self._woke - now
+            if sim_clock is not None:
+                delay = min(delay, sim_clock.time_to_next())
+        if delay > 0:
+            self._sleep(delay)
+        self._woke = self._clock()
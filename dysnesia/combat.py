@@ -0,0 +1,299 @@
+"""World 2 combat.
+
+The fight itself -- rolls, damage, kills, and which world the player ends
+up in -- lives here and works on any game-state object. The frontends only
+draw it and react to the outcome ``perform_player_action()`` returns.
+A round is played by ``resolve_round()``, which only touches the fight's
+counters and a random stream, so ``dysnesia.montecarlo`` can run it (or
+its NumPy twin) without a game. Region quirks are a ``Rules`` object on
+the game (``game.combat_rules``): its ``region()`` gives the numbers the
+resolver plays with and ``describe()`` words the log; plug-in layers such
+as ``dysnesia.admin`` swap in their own. Every roll comes from the game's
+``combat`` stream (``dysnesia.rng``); text that is only drawn on screen
+uses the ``glitch`` stream, so redraws never shift a fight.
+"""
+import random
+
+from dysnesia import tables
+
+# perform_player_action() outcomes; None means the fight goes on
+DEFEATED = "defeated"
+VICTORY = "victory"
+SLAIN = "slain"
+
+# beating this region ends the game
+FINAL_REGION = "forgotten_sanctum"
+# regions cleared at which the player is sent back to World 1
+WORLD1_AFTER = (2, 4, 6)
+# clearing this region always sends the player back
+WORLD1_REGION = "obsidian_quarry"
+
+# what the player starts every fight with
+PLAYER_HP = 100
+HEALS = 3
+ABILITY_CHARGES = 1
+# inclusive ranges of the rolls
+ATTACK_ROLL = (8, 15)
+HEAL_ROLL = (12, 25)
+ABILITY_ROLL = (20, 35)
+ENEMY_ROLL = (5, 14)
+
+ERROR_CHARS = "%&*^#@$!<>?/~"
+GLITCH_SYMBOLS = "#&$*@%!()"
+
+
+def random_error_name(length=8, rng=random):
+    """Return a short garbled string made of punctuation to simulate corruption."""
+    return "".join(rng.choice(ERROR_CHARS) for _ in range(length))
+
+
+def glitch_text(text, rng=random):
+    """Replace 20-40% of the characters of ``text`` (never spaces) with glitch symbols."""
+    result = list(text)
+    num_glitches = rng.randint(len(text) // 5, (len(text) * 2) // 5)
+    for pos in rng.sample(range(len(text)), min(num_glitches, len(text))):
+        if text[pos] != " ":
+            result[pos] = rng.choice(GLITCH_SYMBOLS)
+    return "".join(result)
+
+
+class RegionRules:
+    """The numbers behind one region's fights.
+
+    ``player_miss`` and ``player_double`` are the chances an attack misses
+    or hits twice, ``enemy_double`` the chance the enemy hits twice,
+    ``heal_factor`` multiplies heals and ``enemy_damage``, when set,
+    replaces the enemy's roll.
+    """
+
+    __slots__ = ("enemy_hp", "player_miss", "player_double", "heal_factor",
+                 "enemy_double", "enemy_damage")
+
+    def __init__(self, enemy_hp, player_miss=0.0, player_double=0.0, heal_factor=1,
+                 enemy_double=0.0, enemy_damage=None):
+        self.enemy_hp = enemy_hp
+        self.player_miss = player_miss
+        self.player_double = player_double
+        self.heal_factor = heal_factor
+        self.enemy_double = enemy_double
+        self.enemy_damage = enemy_damage
+
+
+class Rules:
+    """Standard rules: every region fights the same.
+
+    Subclasses override ``region_rules()`` for the numbers and
+    ``describe()`` for the wording, per region.
+    """
+
+    enemy_hp = 80
+
+    def __init__(self):
+        # region -> RegionRules, built on first use
+        self._regions = {}
+
+    def region_rules(self, region):
+        """A new ``RegionRules`` for ``region``."""
+        return RegionRules(self.enemy_hp)
+
+    def region(self, region):
+        """The (shared, read-only) ``RegionRules`` for ``region``."""
+        rules = self._regions.get(region)
+        if rules is None:
+            rules = self._regions[region] = self.region_rules(region)
+        return rules
+
+    def enemy_max_hp(self, game, region):
+        return self.region(region).enemy_hp
+
+    def describe(self, game, kind, amount, note):
+        """The log line for one ``resolve_round()`` event."""
+        if kind == "attack":
+            if note == "miss":
+                return "Your attack missed!"
+            if note == "double":
+                return f"You attack with DOUBLE DAMAGE for {amount} dmg!"
+            return f"You attack the enemy for {amount} dmg."
+        if kind == "heal":
+            if note == "double":
+                return f"You heal for DOUBLE AMOUNT: {amount} HP!"
+            return f"You heal for {amount} HP."
+        if kind == "ability":
+            return f"You use your ability for {amount} dmg!"
+        if kind == "enemy":
+            if note == "double":
+                return f"Enemy hits you with DOUBLE DAMAGE for {amount} dmg!"
+            return f"Enemy hits you for {amount} dmg."
+        if kind == "no_heals":
+            return "No heals left!"
+        return "No ability charges!"
+
+
+class Fight:
+    """A fight's counters without a game, named as on the game state."""
+
+    __slots__ = ("player_hp", "player_max_hp", "enemy_hp", "player_heals", "player_ability_charges")
+
+    def __init__(self, enemy_hp, player_hp=PLAYER_HP, heals=HEALS, charges=ABILITY_CHARGES):
+        self.player_hp = player_hp
+        self.player_max_hp = player_hp
+        self.enemy_hp = enemy_hp
+        self.player_heals = heals
+        self.player_ability_charges = charges
+
+
+def resolve_round(rules, fight, action, rng):
+    """Play one round on ``fight`` (a ``Fight`` or a game) under ``rules``
+    (a ``RegionRules``), drawing from ``rng``.
+
+    Returns ``(events, outcome)``: ``events`` are ``(kind, amount, note)``
+    for ``Rules.describe()``, ``outcome`` is ``DEFEATED`` when the enemy
+    dies, ``SLAIN`` when the player does, otherwise None.
+    """
+    events = []
+    roll = rng.randint
+    if action == "attack":
+        dmg = roll(*ATTACK_ROLL)
+        note = None
+        if rules.player_miss and rng.random() < rules.player_miss:
+            dmg, note = 0, "miss"
+        elif rules.player_double and rng.random() < rules.player_double:
+            dmg, note = dmg * 2, "double"
+        fight.enemy_hp -= dmg
+        events.append(("attack", dmg, note))
+    elif action == "heal":
+        if fight.player_heals <= 0:
+            events.append(("no_heals", 0, None))
+        else:
+            heal = roll(*HEAL_ROLL) * rules.heal_factor
+            fight.player_hp = min(fight.player_max_hp, fight.player_hp + heal)
+            fight.player_heals -= 1
+            events.append(("heal", heal, "double" if rules.heal_factor == 2 else None))
+    elif action == "ability":
+        if fight.player_ability_charges <= 0:
+            events.append(("no_charges", 0, None))
+        else:
+            dmg = roll(*ABILITY_ROLL)
+            fight.enemy_hp -= dmg
+            fight.player_ability_charges -= 1
+            events.append(("ability", dmg, None))
+
+    if fight.enemy_hp <= 0:
+        return events, DEFEATED
+
+    edmg = roll(*ENEMY_ROLL)
+    note = None
+    if rules.enemy_damage is not None:
+        edmg = rules.enemy_damage
+    elif rules.enemy_double and rng.random() < rules.enemy_double:
+        edmg, note = edmg * 2, "double"
+    fight.player_hp -= edmg
+    events.append(("enemy", edmg, note))
+    if fight.player_hp <= 0:
+        return events, SLAIN
+    return events, None
+
+
+def next_available_dungeon(game):
+    """The next region in the progression that is not defeated yet, or None."""
+    for region in game.dungeon_progression_order:
+        if region not in game.defeated_regions:
+            return region
+    return None
+
+
+def enemy_display_name(game, region, rng=None):
+    """Name shown for a region's enemy; regions named None (the Forgotten
+    Sanctum) get a freshly garbled name every time, from ``rng`` (the
+    game's ``glitch`` stream by default)."""
+    if region is None or region == FINAL_REGION:
+        return random_error_name(rng=rng or game.rng.glitch)
+    name = game.region_enemy_map.get(region)
+    if not name:
+        return region.replace("_", " ").title()
+    return name
+
+
+def ascii_for_region(region, art=None):
+    """``(left, right)`` art for a region, matched exactly, then by substring."""
+    art = tables.ENEMY_ASCII if art is None else art
+    if not region:
+        return tables.DEFAULT_ASCII
+    pair = art.get(region)
+    if pair:
+        return pair
+    for k in art:
+        if k in region:
+            return art[k]
+    return tables.DEFAULT_ASCII
+
+
+def enter_combat(game, location_name=None):
+    """Start a fight at ``location_name`` (a region key or label), or a random region."""
+    if location_name:
+        region = str(location_name).lower()
+    else:
+        region = game.rng.combat.choice(list(game.region_enemy_map)) if game.region_enemy_map else None
+    enemy_name = game.region_enemy_map.get(region, game.rng.combat.choice(tables.MONSTER_NAMES))
+    game.current_enemy_region = region
+
+    # each region's enemy can only be killed once
+    if region in game.defeated_regions:
+        game.combat_started = False
+        game.combat_log = [f"'{enemy_name}' has already been defeated!"]
+        return
+
+    game.combat_started = True
+    game.player_max_hp = PLAYER_HP
+    game.player_hp = game.player_max_hp
+    game.enemy_max_hp = game.combat_rules.enemy_max_hp(game, region)
+    game.enemy_hp = game.enemy_max_hp
+    game.player_heals = HEALS
+    game.player_ability_charges = ABILITY_CHARGES
+    # canonical name (None for dynamically named regions)
+    game.current_enemy_name = enemy_name
+    game.combat_log = [f"'{enemy_display_name(game, region, game.rng.combat)}' has appeared at {location_name or 'Unknown Location'}!"]
+
+
+def record_kill(game):
+    """Mark the current region defeated and add its enemy to the kill list (newest first)."""
+    region = game.current_enemy_region
+    if not region or region in game.defeated_regions:
+        return
+    game.defeated_regions.add(region)
+    if game.region_enemy_map.get(region) is None:
+        name = enemy_display_name(game, region, game.rng.combat)
+    else:
+        name = game.current_enemy_name or game.region_enemy_map[region]
+    if name and name not in game.killed_monsters:
+        game.killed_monsters.insert(0, name)
+    game.consecutive_defeats += 1
+
+
+def perform_player_action(game, action):
+    """Play one round: the player's ``action`` (attack/heal/ability), then the enemy's hit.
+
+    Returns ``DEFEATED`` or ``VICTORY`` (the final region) when the enemy
+    dies, ``SLAIN`` when the player does, otherwise None.
+    """
+    rules = game.combat_rules
+    region = game.current_enemy_region
+    events, outcome = resolve_round(rules.region(region), game, action, game.rng.combat)
+    log = game.combat_log
+    for kind, amount, note in events:
+        log.append(rules.describe(game, kind, amount, note))
+
+    if outcome == DEFEATED:
+        log.append("Enemy defeated!")
+        record_kill(game)
+        game.combat_started = False
+        if region == FINAL_REGION:
+            return VICTORY
+        # back to World 1 after each pair of regions, and after the quarry;
+        # the frontend plays the transition when combat returns
+        if len(game.defeated_regions) in WORLD1_AFTER or region == WORLD1_REGION:
+            game.world = 1
+    elif outcome == SLAIN:
+        log.append("You were slain...")
+        game.combat_started = False
+    return outcome
@@ -0,0 +1,200 @@
+"""Upgrade pricing and bulk-purchase math.
+
+City and black hole upgrades share one pricing rule: level ``k`` of an
+upgrade costs ``base_cost * multiplier ** k`` (multiplier ``0`` means a
+flat price). Because the rule is geometric, the total for ``n`` levels and
+the number of levels a budget can afford both come out in closed form, so
+buying x10 / x100 / max is a single step instead of one frame per level.
+
+The ``buy_*`` functions are the purchases themselves, on any game-state
+object; the frontends wrap them with their sanity and UI side effects.
+"""
+import math
+
+from dysnesia import effects
+
+# the black hole unlock needs this depth and one of this ore
+BLACKHOLE_DEPTH = 5
+BLACKHOLE_ORE = "orichalcum_shard"
+
+# money bonus per black hole ship
+SHIP_BONUS = 0.05
+
+# order sizes the frontends cycle through; "max" means as many as affordable
+BUY_MODES = (1, 10, 100, "max")
+
+
+def next_buy_mode(mode):
+    """Return the order size that follows ``mode`` in ``BUY_MODES``."""
+    try:
+        i = BUY_MODES.index(mode)
+    except ValueError:
+        return BUY_MODES[0]
+    return BUY_MODES[(i + 1) % len(BUY_MODES)]
+
+
+def buy_mode_label(mode):
+    return "MAX" if mode == "max" else f"x{mode}"
+
+
+def _growth(upg):
+    m = upg.get("multiplier", 0) or 0
+    return m if m > 0 else 1.0
+
+
+def level_cost(upg, level):
+    """Price of buying level ``level`` (0-based) of an upgrade."""
+    return int(upg.get("base_cost", upg["cost"]) * _growth(upg) ** level)
+
+
+def remaining_levels(upg):
+    return max(0, upg["max"] - upg["count"])
+
+
+def bulk_cost(upg, n):
+    """Total price of the next ``n`` levels (geometric series, no loop)."""
+    n = min(int(n), remaining_levels(upg))
+    if n <= 0:
+        return 0
+    m = _growth(upg)
+    first = upg.get("base_cost", upg["cost"]) * m ** upg["count"]
+    if m == 1.0:
+        return int(first * n)
+    return int(first * (m ** n - 1) / (m - 1))
+
+
+def max_affordable(upg, money, limit=None):
+    """How many of the next levels ``money`` pays for, capped by max and ``limit``."""
+    cap = remaining_levels(upg)
+    if limit is not None:
+        cap = min(cap, int(limit))
+    if cap <= 0 or money <= 0:
+        return 0
+    m = _growth(upg)
+    first = upg.get("base_cost", upg["cost"]) * m ** upg["count"]
+    if first <= 0:
+        return cap
+    # estimate in float, then settle against the exact ``money``
+    budget = float(money)
+    if m == 1.0:
+        n = int(budget // first)
+    else:
+        # invert money >= first * (m^n - 1) / (m - 1)
+        n = int(math.log(1 + budget * (m - 1) / first, m))
+    n = max(0, min(cap, n))
+    # float logs can land one level either side of the exact answer
+    while n > 0 and bulk_cost(upg, n) > money:
+        n -= 1
+    while n < cap and bulk_cost(upg, n + 1) <= money:
+        n += 1
+    return n
+
+
+def plan_purchase(upg, money, amount=1):
+    """Return ``(levels, total_cost)`` for an order of ``amount`` levels.
+
+    ``amount`` is an int or ``"max"``. The order is filled with as many
+    levels as ``money`` covers, never more than ``amount`` or the
+    upgrade's ``max``.
+    """
+    limit = None if amount == "max" else amount
+    n = max_affordable(upg, money, limit)
+    return n, bulk_cost(upg, n)
+
+
+def quote(upg, money, amount=1):
+    """``(levels, total_cost)`` to display for an order.
+
+    What ``money`` currently buys, or, when nothing is affordable yet, the
+    price of the full order (one level for ``"max"``).
+    """
+    n, total = plan_purchase(upg, money, amount)
+    if n == 0:
+        n = min(remaining_levels(upg), 1 if amount == "max" else int(amount))
+        total = bulk_cost(upg, n)
+    return n, total
+
+
+def ships_money_multiplier(game):
+    """Money multiplier from the black hole ships: 5% per ship."""
+    return 1.0 + game.ships_count * SHIP_BONUS
+
+
+# --- purchases ---------------------------------------------------------------
+
+def buy_upgrade(game, upg, amount=1):
+    """Buy up to ``amount`` levels of a city upgrade, applying its effect (if
+    any) once per level; returns the levels bought."""
+    n, total = plan_purchase(upg, game.money, amount)
+    if n <= 0:
+        return 0
+    game.money -= total
+    game.rate += upg["rate_inc"] * n
+    upg["count"] += n
+    game.w1upgrades += n
+    if "effect" in upg:
+        for _ in range(n):
+            effects.apply(upg["effect"], game)
+    if upg["count"] < upg["max"]:
+        upg["cost"] = level_cost(upg, upg["count"])
+    return n
+
+
+def buy_blackhole_upgrade(game, upg, amount=1):
+    """Buy up to ``amount`` levels of a black hole upgrade, applying its effect
+    once per level; returns the levels bought."""
+    n, total = plan_purchase(upg, game.money, amount)
+    if n <= 0:
+        return 0
+    game.money -= total
+    upg["count"] += n
+    game.blackhole_upgrades_count += n
+    for _ in range(n):
+        effects.apply(upg["effect"], game)
+    # price of the next level (flat when multiplier is 0)
+    upg["cost"] = level_cost(upg, upg["count"])
+    return n
+
+
+def buy_research(game, res):
+    """Buy a research entry; returns True when it was bought."""
+    if res["purchased"] or game.money < res["cost"]:
+        return False
+    game.money -= res["cost"]
+    res["purchased"] = True
+    effects.apply(res["effect"], game)
+    return True
+
+
+def can_afford_technology(game, tech):
+    if game.money < tech["money_cost"]:
+        return False
+    inv = game.ore_inventory
+    return all(inv.get(name, 0) >= n for name, n in tech["ore_costs"].items())
+
+
+def buy_technology(game, tech):
+    """Buy a technology with money and ore; returns True when it was bought."""
+    if tech["purchased"] or not can_afford_technology(game, tech):
+        return False
+    game.money -= tech["money_cost"]
+    for name, n in tech["ore_costs"].items():
+        game.ore_inventory[name] -= n
+    tech["purchased"] = True
+    effects.apply(tech["effect"], game)
+    return True
+
+
+def unlock_blackhole(game):
+    """Unlock the black hole page from the mining end; returns True on success.
+
+    Needs depth ``BLACKHOLE_DEPTH``, one ``BLACKHOLE_ORE`` and the money cost.
+    """
+    if game.max_depth < BLACKHOLE_DEPTH or game.blackhole_page_unlocked:
+        return False
+    if game.ore_inventory.get(BLACKHOLE_ORE, 0) < 1 or game.money < game.blackhole_unlock_cost:
+        return False
+    game.money -= game.blackhole_unlock_cost
+    game.ore_inventory[BLACKHOLE_ORE] -= 1
+    game.blackhole_page_unlocked = True
+    return True
@@ -0,0 +1,139 @@
+"""Typed, precompiled purchase effects.
+
+Research and technology entries used to carry Python source strings that
+were ``exec()``'d on every purchase. They now carry ``Effect`` descriptors
+(or tuples of them) built with the helpers below. Each descriptor compiles
+to a closure once, when it is created, and ``validate_table()`` checks
+every entry against the game state at load time, so a typo in a table
+fails at startup instead of mid-game.
+
+Effects act on any object exposing the named fields as attributes
+(normally a ``dysnesia.state.GameState``), which makes them replayable by
+the idle and simulation tooling.
+"""
+
+
+def _mul(field, value):
+    def fn(state):
+        setattr(state, field, getattr(state, field) * value)
+    return fn
+
+
+def _add(field, value):
+    def fn(state):
+        setattr(state, field, getattr(state, field) + value)
+    return fn
+
+
+def _set(field, value):
+    def fn(state):
+        setattr(state, field, value)
+    return fn
+
+
+def _max(field, value):
+    def fn(state):
+        setattr(state, field, max(getattr(state, field), value))
+    return fn
+
+
+def _message(field, value):
+    def fn(state):
+        if not getattr(state, "quiet_effects", False):
+            print(value)
+    return fn
+
+
+# op name -> closure factory
+OPS = {
+    "mul": _mul,
+    "add": _add,
+    "set": _set,
+    "max": _max,
+    "message": _message,
+}
+NUMERIC_OPS = ("mul", "add", "max")
+
+
+class Effect:
+    """One compiled effect: ``op`` applied to ``field`` with ``value``."""
+
+    __slots__ = ("op", "field", "value", "_fn")
+
+    def __init__(self, op, field, value):
+        if op not in OPS:
+            raise ValueError(f"unknown effect op {op!r}")
+        if op in NUMERIC_OPS and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"effect {op} {field} needs a number, got {value!r}")
+        self.op = op
+        self.field = field
+        self.value = value
+        self._fn = OPS[op](field, value)
+
+    def __call__(self, state):
+        self._fn(state)
+
+    def __repr__(self):
+        return f"Effect({self.op!r}, {self.field!r}, {self.value!r})"
+
+
+def mul(field, factor):
+    return Effect("mul", field, factor)
+
+
+def add(field, amount):
+    return Effect("add", field, amount)
+
+
+def set_flag(field, value=True):
+    return Effect("set", field, value)
+
+
+def at_least(field, value):
+    return Effect("max", field, value)
+
+
+def message(text):
+    return Effect("message", None, text)
+
+
+def as_tuple(effect):
+    """Normalize a table's ``effect`` value to a tuple of ``Effect``."""
+    if effect is None:
+        return ()
+    if isinstance(effect, Effect):
+        return (effect,)
+    return tuple(effect)
+
+
+def apply(effect, state):
+    """Apply an entry's effect (single ``Effect`` or a sequence) to ``state``."""
+    if isinstance(effect, Effect):
+        effect._fn(state)
+        return
+    for e in effect:
+        e._fn(state)
+
+
+def validate_table(table, state, name="table"):
+    """Check every entry's effects up front; raises ValueError on the first bad one.
+
+    Numeric ops must target numeric fields that exist on ``state``; flags
+    must target existing fields.
+    """
+    for entry in table:
+        label = f"{name}[{entry.get('key')!r}] {entry.get('name', '')}"
+        effs = entry.get("effect")
+        if isinstance(effs, str):
+            raise ValueError(f"{label}: string effects are no longer supported")
+        for e in as_tuple(effs):
+            if not isinstance(e, Effect):
+                raise ValueError(f"{label}: {e!r} is not an Effect")
+            if e.op == "message":
+                continue
+            if not hasattr(state, e.field):
+                raise ValueError(f"{label}: unknown field {e.field!r}")
+            if e.op in NUMERIC_OPS:
+                cur = getattr(state, e.field)
+                if isinstance(cur, bool) or not isinstance(cur, (int, float)):
+                    raise ValueError(f"{label}: field {e.field!r} is not numeric")
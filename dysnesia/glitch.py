@@ -0,0 +1,139 @@
+"""Glitch transitions played as frames of the main loop.
+
+The world transition used to block the game for five seconds, drawing
+every frame cell by cell with ``random.choice``, and the victory screen
+looped until interrupted. A ``Transition`` is only state -- the step on
+screen and when the next frame is due -- so the frontend draws it through
+its ``ConsoleScreen`` like any page, the simulation keeps ticking between
+frames, and a key skips ahead. Frames come from a ``NoisePool``: a few
+noise screens per terminal size made in bulk (``randbytes()`` mapped onto
+the glyphs with one ``bytes.translate``), each shown rotated by a random
+number of rows so the pool doesn't visibly repeat.
+"""
+import time
+
+GLYPHS = "#$%*^&@!~+=<>?/|"
+# noise screens kept per terminal size
+POOL_FRAMES = 8
+# seconds each frame stays up, cycled; the world transition flickers
+FLICKER = (0.08, 0.12)
+# length of the world transition
+DURATION = 5.0
+
+
+class NoisePool:
+    """Pre-generated noise screens, per terminal size."""
+
+    def __init__(self, glyphs=GLYPHS, frames=POOL_FRAMES):
+        # byte -> glyph; 16 glyphs split the 256 byte values evenly
+        self._table = bytes(ord(glyphs[i % len(glyphs)]) for i in range(256))
+        self.frames = frames
+        self._pools = {}
+
+    def get(self, cols, rows, rng):
+        """The screens for a ``cols`` x ``rows`` terminal (lists of rows), made on first use."""
+        pool = self._pools.get((cols, rows))
+        if pool is None:
+            # stay off the last column and row so nothing scrolls
+            width, height = max(1, cols - 1), max(1, rows - 1)
+            pool = []
+            for _ in range(self.frames):
+                text = rng.randbytes(width * height).translate(self._table).decode("ascii")
+                pool.append([text[i:i + width] for i in range(0, len(text), width)])
+            self._pools[(cols, rows)] = pool
+        return pool
+
+
+def center(lines, message):
+    """Overlay ``message`` on the middle row."""
+    mid = len(lines) // 2
+    row = lines[mid]
+    pad = max(0, (len(row) - len(message)) // 2)
+    lines[mid] = row[:pad] + message + row[pad + len(message):]
+    return lines
+
+
+class Transition:
+    """One glitch effect in progress.
+
+    ``steps`` are ``(message, seconds)``: the message (None for pure
+    noise) goes on each frame through ``overlay(lines, message)``;
+    ``seconds`` None holds the step until a key. Any key moves to the
+    next step, so a key during a plain transition cancels it.
+    """
+
+    def __init__(self, pool, rng, steps=((None, DURATION),), delays=FLICKER, overlay=center,
+                 ragged=False, clock=time.monotonic):
+        self.pool = pool
+        self.rng = rng
+        self.steps = list(steps)
+        self.delays = delays
+        self.overlay = overlay
+        # cut each row at a random length between half and full width
+        self.ragged = ragged
+        self._clock = clock
+        self.step = 0
+        self.frames = 0
+        self._step_started = clock()
+        self._due = self._step_started
+
+    @property
+    def message(self):
+        return self.steps[self.step][0] if self.step < len(self.steps) else None
+
+    def _step_left(self, now):
+        seconds = self.steps[self.step][1]
+        return None if seconds is None else self._step_started + seconds - now
+
+    def _next_step(self, now):
+        self.step += 1
+        self._step_started = now
+        self._due = now
+
+    def done(self):
+        """True once the last step is over."""
+        now = self._clock()
+        while self.step < len(self.steps):
+            left = self._step_left(now)
+            if left is None or left > 0:
+                return False
+            self._next_step(now)
+        return True
+
+    def press(self, key=None):
+        """A key: skip to the next step (ends the transition after the last)."""
+        if self.step < len(self.steps):
+            self._next_step(self._clock())
+
+    def cancel(self):
+        self.step = len(self.steps)
+
+    def due(self):
+        """Whether the next frame should be drawn now."""
+        return self._clock() >= self._due
+
+    def time_to_next(self):
+        """Seconds until the next frame or the end of the step, whichever is first."""
+        now = self._clock()
+        left = self._due - now
+        if self.step < len(self.steps):
+            step_left = self._step_left(now)
+            if step_left is not None:
+                left = min(left, step_left)
+        return max(0.0, left)
+
+    def frame(self, cols, rows):
+        """The next frame for a ``cols`` x ``rows`` terminal, as a list of rows."""
+        rng = self.rng
+        pool = self.pool.get(cols, rows, rng)
+        lines = pool[rng.randrange(len(pool))]
+        shift = rng.randrange(len(lines))
+        lines = lines[shift:] + lines[:shift]
+        if self.ragged:
+            lines = [line[:rng.randint(len(line) // 2, len(line))] for line in lines]
+        message = self.message
+        if message:
+            lines = self.overlay(lines, message)
+        self._due = self._clock() + self.delays[self.frames % len(self.delays)]
+        self.frames += 1
+        return lines
@@ -0,0 +1,129 @@
+"""Closed-form offline / idle progress.
+
+Instead of replaying tens of thousands of one-second ticks, ``project()``
+works out what a span of idle time is worth analytically:
+
+* passive income is ``ticks * rate * adminmultiplier * othermultiplier *
+  ships_multiplier``;
+* auto-mining carries overflow damage from ore to ore (see
+  ``dysnesia.mining``), so over ``T`` ticks the miners deal
+  ``T * auto_mine_damage`` and break about that divided by the mean ore
+  hp (``mining.mean_hp()``), split across the depth's ore table by spawn
+  weight. The table is the one ``spawn_new_ore()`` draws from
+  (``ores.OreSampler.table()``, deepest table past the last depth).
+
+Both the game loop (large catch-ups after a long pause or a resumed save)
+and headless tools call the same API.
+"""
+from dysnesia import economy, mining, ores
+from dysnesia.clock import TICK_SECONDS
+
+
+class IdleResult:
+    """What a span of idle time produced."""
+
+    def __init__(self, ticks, money, ore, ore_hp=None):
+        # whole simulation ticks covered
+        self.ticks = ticks
+        # money earned (income + ore sales)
+        self.money = money
+        # ore name -> count mined
+        self.ore = ore
+        # hp left on the ore that was being mined, or None when it broke and
+        # a fresh ore should be spawned
+        self.ore_hp = ore_hp
+
+    @property
+    def ores_mined(self):
+        return sum(self.ore.values())
+
+    def __repr__(self):
+        return f"IdleResult(ticks={self.ticks}, money={self.money:.2f}, ore={self.ore})"
+
+
+def income_per_tick(rate, adminmultiplier=1, othermultiplier=1.0, ships_multiplier=1.0):
+    """Passive income earned by one simulation tick."""
+    return rate * adminmultiplier * othermultiplier * ships_multiplier
+
+
+def _apportion(total, weights):
+    """Split an integer ``total`` across ``weights`` (largest remainder)."""
+    wsum = float(sum(weights))
+    if total <= 0 or wsum <= 0:
+        return [0] * len(weights)
+    exact = [total * w / wsum for w in weights]
+    counts = [int(x) for x in exact]
+    short = total - sum(counts)
+    order = sorted(range(len(weights)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in order[:short]:
+        counts[i] += 1
+    return counts
+
+
+def project(seconds, rate, adminmultiplier=1, othermultiplier=1.0, ships_multiplier=1.0,
+            auto_mine_damage=0, depth=1, ore_types=None, current_ore=None, ore_hp=None,
+            tick=TICK_SECONDS, ore_sampler=None):
+    """Project ``seconds`` of idle play without simulating individual ticks.
+
+    ``current_ore`` / ``ore_hp`` describe the ore on the rock when idling
+    starts; it is finished first, then the renewal estimate takes over.
+    The ores come from ``ore_sampler`` (an ``ores.OreSampler``), or from
+    one built over ``ore_types``. Returns an ``IdleResult``; nothing is
+    mutated.
+    """
+    ticks = int(seconds // tick) if seconds > 0 else 0
+    money = ticks * income_per_tick(rate, adminmultiplier, othermultiplier, ships_multiplier)
+    ore = {}
+    if ticks <= 0 or auto_mine_damage <= 0 or (ore_sampler is None and not ore_types):
+        return IdleResult(ticks, money, ore, ore_hp)
+
+    ore_mult = adminmultiplier * othermultiplier
+    remaining = ticks * auto_mine_damage
+
+    # finish the ore already being mined; the overflow carries on
+    if current_ore is not None:
+        hp = current_ore["hp"] if ore_hp is None else ore_hp
+        if hp > remaining:
+            return IdleResult(ticks, money, ore, hp - remaining)
+        remaining -= hp
+        ore[current_ore["name"]] = 1
+        money += current_ore["value"] * ore_mult
+
+    # expected number of fresh ores the rest of the damage breaks
+    if ore_sampler is None:
+        ore_sampler = ores.OreSampler(ore_types)
+    table = ore_sampler.table(depth)
+    weights = [o["weight"] for o in table.items]
+    cycles = int(remaining // mining.mean_hp(table))
+    for o, n in zip(table.items, _apportion(cycles, weights)):
+        if n:
+            ore[o["name"]] = ore.get(o["name"], 0) + n
+            money += n * o["value"] * ore_mult
+    return IdleResult(ticks, money, ore, None)
+
+
+def catch_up(game, seconds):
+    """Apply ``seconds`` of idle progress to a ``GameState`` in one step.
+
+    Returns the ``IdleResult`` that was applied.
+    """
+    res = project(
+        seconds,
+        game.rate,
+        adminmultiplier=game.adminmultiplier,
+        othermultiplier=game.othermultiplier,
+        ships_multiplier=economy.ships_money_multiplier(game),
+        auto_mine_damage=game.auto_mine_damage,
+        depth=game.depth,
+        current_ore=game.current_ore,
+        ore_hp=game.ore_hp,
+        ore_sampler=game.ore_sampler,
+    )
+    game.money += res.money
+    for name, n in res.ore.items():
+        game.ore_inventory[name] = game.ore_inventory.get(name, 0) + n
+    if res.ore_hp is not None:
+        game.ore_hp = res.ore_hp
+    elif res.ore:
+        mining.spawn_new_ore(game)
+    return res
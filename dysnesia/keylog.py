@@ -0,0 +1,113 @@
+"""Background key logging for the debug builds.
+
+``KeyLogger.log()`` sits on the input path, so it only appends
+``(time, key)`` to a bounded deque -- no file open, no formatting, no
+syscall. A daemon writer thread wakes every ``flush_interval`` seconds,
+formats whatever has arrived and appends it to the log in one write,
+rotating the file (``<path>.1``, ``<path>.2``, ...) once it would grow
+past ``max_bytes`` (counted in bytes, as written). If the writer ever
+falls behind by more than the ring holds, the oldest keys are dropped (and
+counted) rather than stalling input. An ``OSError`` stops the writer; the
+error is kept in ``failed`` and ``log()`` ignores keys from then on.
+"""
+import collections
+import os
+import threading
+import time
+
+# keys held between flushes before the oldest are dropped
+RING_SIZE = 4096
+
+
+class KeyLogger:
+    """Owns one key log file and its background writer thread."""
+
+    def __init__(self, path, tag="", ring_size=RING_SIZE, flush_interval=0.5,
+                 max_bytes=1024 * 1024, backups=3):
+        self.path = path
+        # written on every line (e.g. the input backend)
+        self.tag = tag
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._ring = collections.deque(maxlen=ring_size)
+        self._stop = threading.Event()
+        self._thread = None
+        # keys logged / written so far; the difference not in the ring was dropped
+        self.logged = 0
+        self.written = 0
+        # the OSError that stopped the writer, or None while logging works
+        self.failed = None
+
+    @property
+    def dropped(self):
+        return self.logged - self.written - len(self._ring)
+
+    def log(self, key):
+        """Record one key. Never touches the disk."""
+        if self.failed is not None:
+            return
+        self._ring.append((time.time(), key))
+        self.logged += 1
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._writer, name="dysnesia-keylog", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout=2.0):
+        """Write out everything logged so far and stop the writer."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --- writer thread -------------------------------------------------
+    def _drain(self):
+        lines = []
+        ring = self._ring
+        while ring:
+            t, key = ring.popleft()
+            lines.append(f"{t}:{self.tag}:{key!r}\n")
+        return "".join(lines).encode("utf-8"), len(lines)
+
+    def _writer(self):
+        f = None
+        try:
+            while True:
+                stopping = self._stop.wait(self.flush_interval)
+                data, n = self._drain()
+                if n:
+                    if f is None:
+                        f = open(self.path, "ab")
+                    if f.tell() and f.tell() + len(data) > self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, "ab")
+                    f.write(data)
+                    f.flush()
+                    self.written += n
+                if stopping:
+                    break
+        except OSError as e:
+            self.failed = e
+            self._ring.clear()
+        finally:
+            if f is not None:
+                try:
+                    f.close()
+                except OSError:
+                    pass
+
+    def _rotate(self):
+        """Shift ``path`` -> ``path.1`` -> ... -> ``path.<backups>`` (the oldest is lost)."""
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
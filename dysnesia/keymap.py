@@ -0,0 +1,53 @@
+"""Key dispatch for the purchase pages.
+
+Each page used to answer a keypress by scanning its table for the entry
+with that key, and the mining page walked every technology again to see
+whether a purchased one unlocks the tech pressed. ``KeyMap`` indexes each
+table by key and inverts the tech tree's ``unlocks`` lists once, so a
+keypress is one dict lookup and an unlock check only visits the techs
+that can unlock it. ``state.init()`` and ``GameState.copy()`` build it;
+call ``refresh()`` after swapping a table on a live game.
+"""
+
+# the purchase tables, by the name of the game field holding them
+TABLES = ("upgrades", "research", "technology", "blackhole_upgrades")
+# the starting technology, available without a prerequisite
+FREE_TECH = "1"
+
+
+class KeyMap:
+    """``{table: {key: entry}}`` plus the reverse ``unlocks`` index of the tech tree."""
+
+    __slots__ = ("pages", "unlocked_by")
+
+    def __init__(self, game):
+        self.pages = {}
+        for name in TABLES:
+            page = self.pages[name] = {}
+            for entry in getattr(game, name):
+                # the first entry with a key wins, as the scans did
+                page.setdefault(entry["key"], entry)
+        # tech key -> the techs whose "unlocks" list names it
+        unlocked_by = {}
+        for tech in game.technology:
+            for key in tech.get("unlocks", ()):
+                unlocked_by.setdefault(key, []).append(tech)
+        self.unlocked_by = {key: tuple(techs) for key, techs in unlocked_by.items()}
+
+
+def refresh(game):
+    """Rebuild ``game.keymap`` from the game's current tables."""
+    game.keymap = KeyMap(game)
+    return game.keymap
+
+
+def lookup(game, table, key):
+    """The entry of ``table`` (a ``TABLES`` name) bound to ``key``, or None."""
+    return game.keymap.pages[table].get(key)
+
+
+def tech_unlocked(game, tech):
+    """Whether ``tech`` is the free tech or a purchased tech unlocks it."""
+    if tech["key"] == FREE_TECH:
+        return True
+    return any(prev["purchased"] for prev in game.keymap.unlocked_by.get(tech["key"], ()))
@@ -0,0 +1,197 @@
+"""Money as an exact fixed-point amount, and its short display form.
+
+``game.money`` used to be a float: income is ``rate * adminmultiplier *
+othermultiplier`` per tick and prices climb past 1e15, so a long session
+added tiny incomes to a huge balance and lost them, and every comparison
+against an int price went through float. A ``Money`` is an int count of
+cents (``SCALE`` per unit): Python ints never overflow, adding a float
+income rounds it to the cent once, and comparing with an int price is
+exact. It mixes with plain numbers, so ``game.money += income``,
+``game.money -= total`` and ``game.money >= upg["cost"]`` read as before.
+
+``format_money()`` is the display form -- ``1.23M``, ``4.56T`` --
+memoized, since the prices on a page are the same every frame.
+"""
+import functools
+import numbers
+
+# fixed-point units per unit of money (cents)
+SCALE = 100
+# decimal places SCALE gives
+PLACES = len(str(SCALE)) - 1
+
+# one suffix per factor of 1000; past the last the exponent is spelled out
+SUFFIXES = ("", "K", "M", "B", "T", "Qa", "Qi", "Sx", "Sp", "Oc", "No", "Dc")
+
+# distinct amounts remembered by format_money()
+FORMAT_CACHE_SIZE = 4096
+
+_new = object.__new__
+
+
+def _units(value):
+    """``value`` in fixed-point units; raises TypeError for non-numbers."""
+    if isinstance(value, Money):
+        return value.units
+    if isinstance(value, float):
+        return round(value * SCALE)
+    if isinstance(value, int):
+        return value * SCALE
+    # NumPy scalars and other registered number types
+    if isinstance(value, numbers.Integral):
+        return int(value) * SCALE
+    if isinstance(value, numbers.Real):
+        return round(float(value) * SCALE)
+    raise TypeError(f"not an amount of money: {value!r}")
+
+
+class Money:
+    """An exact amount of money; immutable, mixes with ints and floats."""
+
+    __slots__ = ("units",)
+
+    def __init__(self, value=0):
+        self.units = _units(value)
+
+    @classmethod
+    def from_units(cls, units):
+        new = _new(cls)
+        new.units = units
+        return new
+
+    @classmethod
+    def parse(cls, value):
+        """A ``Money`` from a save: ``dump()``'s string, or an old float/int."""
+        if isinstance(value, str):
+            whole, _, frac = value.partition(".")
+            sign = -1 if whole.startswith("-") else 1
+            frac = (frac + "0" * PLACES)[:PLACES]
+            return cls.from_units(int(whole) * SCALE + sign * int(frac or 0))
+        return cls(value)
+
+    def dump(self):
+        """Exact JSON-friendly form (a decimal string), read back by ``parse()``."""
+        whole, cents = divmod(abs(self.units), SCALE)
+        return f"{'-' if self.units < 0 else ''}{whole}.{cents:0{PLACES}d}"
+
+    # --- arithmetic ---
+    # income arrives as a float every tick, so floats skip _units()
+
+    def __add__(self, other):
+        if other.__class__ is float:
+            units = self.units + round(other * SCALE)
+        else:
+            try:
+                units = self.units + _units(other)
+            except TypeError:
+                return NotImplemented
+        new = _new(Money)
+        new.units = units
+        return new
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if other.__class__ is float:
+            units = self.units - round(other * SCALE)
+        else:
+            try:
+                units = self.units - _units(other)
+            except TypeError:
+                return NotImplemented
+        new = _new(Money)
+        new.units = units
+        return new
+
+    def __rsub__(self, other):
+        try:
+            return Money.from_units(_units(other) - self.units)
+        except TypeError:
+            return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return Money.from_units(self.units * other)
+        if isinstance(other, numbers.Real):
+            return Money.from_units(round(self.units * float(other)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Money.from_units(-self.units)
+
+    # --- comparison ---
+
+    def _cmp_units(self, other):
+        # int prices compare exactly; floats compare against the float of the units
+        if isinstance(other, Money):
+            return other.units
+        if isinstance(other, (int, float)) or isinstance(other, numbers.Real):
+            return other * SCALE
+        return None
+
+    def __eq__(self, other):
+        u = self._cmp_units(other)
+        return NotImplemented if u is None else self.units == u
+
+    def __lt__(self, other):
+        u = self._cmp_units(other)
+        return NotImplemented if u is None else self.units < u
+
+    def __le__(self, other):
+        u = self._cmp_units(other)
+        return NotImplemented if u is None else self.units <= u
+
+    def __gt__(self, other):
+        u = self._cmp_units(other)
+        return NotImplemented if u is None else self.units > u
+
+    def __ge__(self, other):
+        u = self._cmp_units(other)
+        return NotImplemented if u is None else self.units >= u
+
+    def __hash__(self):
+        whole, cents = divmod(self.units, SCALE)
+        return hash(whole) if not cents else hash(self.units / SCALE)
+
+    # --- conversion ---
+
+    def __bool__(self):
+        return self.units != 0
+
+    def __float__(self):
+        return self.units / SCALE
+
+    def __int__(self):
+        # toward zero, like int(float)
+        return -(-self.units // SCALE) if self.units < 0 else self.units // SCALE
+
+    def __format__(self, spec):
+        return format(float(self), spec)
+
+    def __str__(self):
+        return format_money(self)
+
+    def __repr__(self):
+        return f"Money({self.dump()})"
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_units(units):
+    sign = "-" if units < 0 else ""
+    units = abs(units)
+    if units < 1000 * SCALE:
+        return f"{sign}{units / SCALE:.2f}"
+    whole = units // SCALE
+    group = (len(str(whole)) - 1) // 3
+    # two decimals, truncated so 999.999K never shows as 1000.00K
+    mantissa = whole // 10 ** (group * 3 - 2) / 100 if group else whole
+    if group < len(SUFFIXES):
+        return f"{sign}{mantissa:.2f}{SUFFIXES[group]}"
+    return f"{sign}{mantissa:.2f}e{group * 3}"
+
+
+def format_money(value):
+    """Short display form of an amount: ``950.00``, ``12.34K``, ``1.50T``."""
+    return _format_units(_units(value))
@@ -0,0 +1,289 @@
+"""Monte Carlo dungeon balance.
+
+Plays many independent fights per World 2 region with a fixed player
+policy and reports the win rate, expected turns and heals used, so a
+dungeon can be judged without playing it. Each region's numbers come from
+the frontend's own rules (``game.combat_rules.region()``), so the admin
+quirks -- the Mirror Marsh doubling, the Obsidian Quarry misses, the
+Forgotten Sanctum's 1-damage hits -- are the real ones.
+
+With NumPy every fight of a region advances together, one array operation
+per round, and finished fights drop out of the arrays; without it each
+fight is played through ``combat.resolve_round()``. Both give the same
+distribution.
+
+    python -m dysnesia.montecarlo                    # standard rules (main2.py)
+    python -m dysnesia.montecarlo --frontend admin --fights 100000
+    python -m dysnesia.montecarlo --heal-below 50 --ability first --json
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+from dysnesia import combat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# fights per region by default; the pure Python path plays fewer
+FIGHTS = 100000
+PYTHON_FIGHTS = 10000
+# rounds after which a fight counts as a loss (nothing ends a stalemate)
+MAX_TURNS = 1000
+# ability timings a Policy understands
+ABILITY_TIMINGS = ("first", "finish", "never")
+
+# action codes on the vectorized path
+ATTACK, HEAL, ABILITY = 0, 1, 2
+
+
+class Policy:
+    """Heal below ``heal_below`` HP while heals last; otherwise use the
+    ability when ``ability`` says (``"first"``: the opening round,
+    ``"finish"``: once its lowest roll kills, ``"never"``) and attack."""
+
+    def __init__(self, heal_below=40, ability="finish"):
+        if ability not in ABILITY_TIMINGS:
+            raise ValueError(f"ability must be one of {ABILITY_TIMINGS}, not {ability!r}")
+        self.heal_below = heal_below
+        self.ability = ability
+
+    def __repr__(self):
+        return f"heal<{self.heal_below}, ability={self.ability}"
+
+    def choose(self, fight, turn):
+        """The action for one fight (a ``combat.Fight``) in round ``turn``."""
+        if fight.player_heals > 0 and fight.player_hp < self.heal_below:
+            return "heal"
+        if fight.player_ability_charges > 0:
+            if self.ability == "first" and turn == 0:
+                return "ability"
+            if self.ability == "finish" and fight.enemy_hp <= combat.ABILITY_ROLL[0]:
+                return "ability"
+        return "attack"
+
+    def choose_array(self, player_hp, enemy_hp, heals, charges, turn):
+        """``choose()`` for arrays of fights, as ``ATTACK``/``HEAL``/``ABILITY`` codes."""
+        action = np.full(player_hp.shape, ATTACK, dtype=np.int8)
+        if self.ability == "first" and turn == 0:
+            action[charges > 0] = ABILITY
+        elif self.ability == "finish":
+            action[(charges > 0) & (enemy_hp <= combat.ABILITY_ROLL[0])] = ABILITY
+        action[(heals > 0) & (player_hp < self.heal_below)] = HEAL
+        return action
+
+
+class RegionEstimate:
+    """Outcome of the fights played in one region."""
+
+    __slots__ = ("region", "enemy_hp", "fights", "wins", "unfinished", "turns", "heals")
+
+    def __init__(self, region, enemy_hp, fights, wins, unfinished, turns, heals):
+        self.region = region
+        self.enemy_hp = enemy_hp
+        self.fights = fights
+        self.wins = wins
+        # fights still going after MAX_TURNS (counted as losses)
+        self.unfinished = unfinished
+        # totals over all fights
+        self.turns = turns
+        self.heals = heals
+
+    @property
+    def win_rate(self):
+        return self.wins / self.fights
+
+    @property
+    def stderr(self):
+        """Standard error of ``win_rate``."""
+        p = self.win_rate
+        return math.sqrt(p * (1.0 - p) / self.fights)
+
+    @property
+    def mean_turns(self):
+        return self.turns / self.fights
+
+    @property
+    def mean_heals(self):
+        return self.heals / self.fights
+
+    def as_dict(self):
+        return {
+            "region": self.region,
+            "enemy_hp": self.enemy_hp,
+            "fights": self.fights,
+            "win_rate": self.win_rate,
+            "stderr": self.stderr,
+            "turns": self.mean_turns,
+            "heals": self.mean_heals,
+            "unfinished": self.unfinished,
+        }
+
+
+def _play_python(rules, policy, fights, rng, max_turns):
+    wins = unfinished = turns = heals = 0
+    for _ in range(fights):
+        fight = combat.Fight(rules.enemy_hp)
+        outcome = None
+        turn = 0
+        while outcome is None and turn < max_turns:
+            _, outcome = combat.resolve_round(rules, fight, policy.choose(fight, turn), rng)
+            turn += 1
+        wins += outcome == combat.DEFEATED
+        unfinished += outcome is None
+        turns += turn
+        heals += combat.HEALS - fight.player_heals
+    return wins, unfinished, turns, heals
+
+
+def _roll(rng, bounds, n):
+    low, high = bounds
+    return rng.integers(low, high + 1, n)
+
+
+def _play_numpy(rules, policy, fights, rng, max_turns):
+    player = np.full(fights, combat.PLAYER_HP, dtype=np.int64)
+    enemy = np.full(fights, rules.enemy_hp, dtype=np.int64)
+    heals = np.full(fights, combat.HEALS, dtype=np.int64)
+    charges = np.full(fights, combat.ABILITY_CHARGES, dtype=np.int64)
+    wins = turns = heals_used = 0
+    turn = 0
+    while player.size and turn < max_turns:
+        n = player.size
+        action = policy.choose_array(player, enemy, heals, charges, turn)
+        turn += 1
+
+        dmg = _roll(rng, combat.ATTACK_ROLL, n)
+        if rules.player_miss:
+            dmg[rng.random(n) < rules.player_miss] = 0
+        if rules.player_double:
+            dmg = np.where(rng.random(n) < rules.player_double, dmg * 2, dmg)
+        attack = action == ATTACK
+        ability = (action == ABILITY) & (charges > 0)
+        heal = (action == HEAL) & (heals > 0)
+        enemy -= np.where(attack, dmg, 0)
+        enemy -= np.where(ability, _roll(rng, combat.ABILITY_ROLL, n), 0)
+        charges -= ability
+        amount = _roll(rng, combat.HEAL_ROLL, n) * rules.heal_factor
+        player = np.where(heal, np.minimum(combat.PLAYER_HP, player + amount), player)
+        heals -= heal
+
+        won = enemy <= 0
+        if rules.enemy_damage is not None:
+            edmg = rules.enemy_damage
+        else:
+            edmg = _roll(rng, combat.ENEMY_ROLL, n)
+            if rules.enemy_double:
+                edmg = np.where(rng.random(n) < rules.enemy_double, edmg * 2, edmg)
+        player -= np.where(won, 0, edmg)
+        done = won | (player <= 0)
+
+        wins += int(won.sum())
+        k = int(done.sum())
+        if k:
+            turns += k * turn
+            heals_used += int((combat.HEALS - heals[done]).sum())
+            live = ~done
+            player, enemy, heals, charges = player[live], enemy[live], heals[live], charges[live]
+    unfinished = int(player.size)
+    turns += unfinished * turn
+    heals_used += int((combat.HEALS - heals).sum())
+    return wins, unfinished, turns, heals_used
+
+
+def estimate(rules, region, policy=None, fights=None, seed=None, vectorize=True, max_turns=MAX_TURNS):
+    """Play ``fights`` fights in ``region`` under ``rules`` (a ``combat.Rules``).
+
+    Returns a ``RegionEstimate``. NumPy is used when installed and
+    ``vectorize`` is true.
+    """
+    policy = policy or Policy()
+    numbers = rules.region(region)
+    if vectorize and np is not None:
+        fights = fights or FIGHTS
+        totals = _play_numpy(numbers, policy, fights, np.random.default_rng(seed), max_turns)
+    else:
+        fights = fights or PYTHON_FIGHTS
+        totals = _play_python(numbers, policy, fights, random.Random(seed), max_turns)
+    return RegionEstimate(region, numbers.enemy_hp, fights, *totals)
+
+
+def estimate_dungeons(game, policy=None, fights=None, seed=None, vectorize=True, max_turns=MAX_TURNS):
+    """``estimate()`` every region of ``game.dungeon_progression_order`` under its rules."""
+    out = []
+    for i, region in enumerate(game.dungeon_progression_order):
+        region_seed = None if seed is None else seed + i
+        out.append(estimate(game.combat_rules, region, policy, fights, region_seed, vectorize, max_turns))
+    return out
+
+
+class MonteCarloReport:
+    """Per-region estimates of one run."""
+
+    def __init__(self, frontend, policy, engine, estimates, wall):
+        self.frontend = frontend
+        self.policy = policy
+        self.engine = engine
+        self.estimates = estimates
+        self.wall = wall
+
+    def as_dict(self):
+        return {
+            "frontend": self.frontend,
+            "policy": self.policy,
+            "engine": self.engine,
+            "regions": [e.as_dict() for e in self.estimates],
+            "wall_seconds": self.wall,
+        }
+
+    def format(self):
+        fights = self.estimates[0].fights if self.estimates else 0
+        lines = [f"{self.frontend} / {self.policy}: {fights:,} fights per region ({self.engine})",
+                 f"  {'region':<26} {'enemy hp':>8} {'win rate':>9} {'+/-':>6} {'turns':>7} {'heals':>6}"]
+        for e in self.estimates:
+            line = (f"  {e.region:<26} {e.enemy_hp:>8} {e.win_rate:>9.1%} {e.stderr:>6.1%} "
+                    f"{e.mean_turns:>7.1f} {e.mean_heals:>6.2f}")
+            if e.unfinished:
+                line += f"  ({e.unfinished} unfinished)"
+            lines.append(line)
+        lines.append(f"  in {self.wall:.3f}s")
+        return "\n".join(lines)
+
+
+def run(frontend="main2", policy=None, fights=None, seed=0, vectorize=True):
+    """Load ``frontend`` and estimate its dungeons; returns a ``MonteCarloReport``."""
+    from dysnesia import sim
+    front = sim.load_frontend(frontend)
+    policy = policy or Policy()
+    start = time.perf_counter()
+    estimates = estimate_dungeons(front.GAME, policy, fights, seed, vectorize)
+    wall = time.perf_counter() - start
+    engine = "numpy" if vectorize and np is not None else "python"
+    return MonteCarloReport(frontend, repr(policy), engine, estimates, wall)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dysnesia.montecarlo", description=__doc__.split("\n")[0])
+    parser.add_argument("--frontend", default="main2", help="main2, admin or a path to a frontend script")
+    parser.add_argument("--fights", type=int, help=f"fights per region (default {FIGHTS:,}, "
+                                                   f"{PYTHON_FIGHTS:,} without NumPy)")
+    parser.add_argument("--heal-below", type=int, default=40, help="heal when HP drops below this")
+    parser.add_argument("--ability", choices=ABILITY_TIMINGS, default="finish", help="when to use the ability")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--python", action="store_true", help="use the pure Python engine even with NumPy")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.frontend, Policy(args.heal_below, args.ability), args.fights, args.seed,
+                 vectorize=not args.python)
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Constant-time weighted ore spawning.
+
+``spawn_new_ore()`` used to sum the depth's weights and walk the list on
+every spawn, then copy the chosen dict. ``OreSampler`` builds a Walker
+alias table per depth once (Vose's construction), so a spawn is one
+random draw and two list lookups, and it hands back a shared read-only
+ore record instead of a fresh copy.
+"""
+import random
+from types import MappingProxyType
+
+
+def freeze(ore):
+    """Read-only view of an ore dict; supports ``ore["hp"]`` and ``.get()`` but not writes."""
+    return MappingProxyType(dict(ore))
+
+
+class AliasTable:
+    """Walker/Vose alias table over ``items`` with the given ``weights``."""
+
+    __slots__ = ("items", "prob", "alias", "n", "derived")
+
+    def __init__(self, items, weights):
+        n = len(items)
+        if n == 0:
+            raise ValueError("alias table needs at least one item")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("alias table needs a positive total weight")
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # leftovers are 1.0 up to float error
+        for i in small + large:
+            prob[i] = 1.0
+        self.items = tuple(items)
+        self.prob = tuple(prob)
+        self.alias = tuple(alias)
+        self.n = n
+        # data other modules compute from the table, dropped along with it
+        self.derived = {}
+
+    def sample(self, rand=random.random):
+        """One item, using a single uniform draw for both column and coin."""
+        u = rand() * self.n
+        i = int(u)
+        if i >= self.n:
+            i = self.n - 1
+        if u - i < self.prob[i]:
+            return self.items[i]
+        return self.items[self.alias[i]]
+
+
+class OreSampler:
+    """Per-depth alias tables for an ``ore_types`` mapping (depth -> list of ore dicts)."""
+
+    def __init__(self, ore_types):
+        self.ore_types = ore_types
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every table; call after editing ``ore_types``."""
+        self._tables = {}
+        for depth, table in self.ore_types.items():
+            self._tables[depth] = AliasTable([freeze(o) for o in table], [o["weight"] for o in table])
+        # depths past the deepest table reuse it, like the old spawn_new_ore()
+        self._deepest = self._tables[max(self._tables)] if self._tables else None
+
+    def table(self, depth):
+        return self._tables.get(depth, self._deepest)
+
+    def sample(self, depth, rand=random.random):
+        """Shared, read-only ore record for ``depth``."""
+        return self._tables.get(depth, self._deepest).sample(rand)
@@ -0,0 +1,216 @@
+"""Cached planet and orbit rasters for the black hole views.
+
+The planet only changes when ``blackhole_growth`` does, yet both the
+console page and the curses orbital view used to classify every cell with
+``math.hypot`` and run cos/sin for every orbit dot on every frame. Here
+the planet is rasterized once per size (and, for curses, per terminal
+size), the dotted orbits once per rotation phase, and ship positions come
+from a precomputed sine/cosine table. A frame only composites the ships
+over the cached background.
+"""
+import functools
+import math
+
+# entries in the cos/sin lookup table (one full turn)
+TRIG_STEPS = 4096
+_TWO_PI = 2 * math.pi
+_COS = tuple(math.cos(_TWO_PI * i / TRIG_STEPS) for i in range(TRIG_STEPS))
+_SIN = tuple(math.sin(_TWO_PI * i / TRIG_STEPS) for i in range(TRIG_STEPS))
+
+# ship glyphs of the console page and the curses view
+CONSOLE_SHIPS = ("▲", "▶", "✦", "◉", "✺", "*", "✶")
+CURSES_SHIPS = ("▲", "◆", "✦", "✸", "✺", "✶", "✹")
+
+
+def cos_sin(angle):
+    """(cos, sin) of ``angle`` radians from the lookup table."""
+    i = int(round(angle * (TRIG_STEPS / _TWO_PI))) % TRIG_STEPS
+    return _COS[i], _SIN[i]
+
+
+def exact_cos_sin(angle):
+    return math.cos(angle), math.sin(angle)
+
+
+def radius(size):
+    return max(1, 2 + size)
+
+
+def _cell(dist, r):
+    if dist <= r * 0.6:
+        return "O"
+    if dist <= r * 0.95:
+        return "o"
+    if dist <= r * 1.15:
+        return "~"
+    return " "
+
+
+@functools.lru_cache(maxsize=32)
+def orbits(size):
+    """(rx, ry) of each landscape orbit; more rings as the planet grows (1 to 5)."""
+    r = radius(size)
+    count = max(1, min(5, 1 + (size // 2)))
+    return tuple((int(r * (3.2 + j * 1.0)), max(1, int(r * (0.7 + j * 0.25)))) for j in range(count))
+
+
+@functools.lru_cache(maxsize=128)
+def ship_split(size, ships):
+    """Ships per orbit, proportional to orbit size, remainder dealt round-robin."""
+    rings = orbits(size)
+    weights = [rx + ry for (rx, ry) in rings]
+    total_w = max(1, sum(weights))
+    per_orbit = [max(0, (ships * w) // total_w) for w in weights]
+    rem = ships - sum(per_orbit)
+    j = 0
+    while rem > 0:
+        per_orbit[j % len(rings)] += 1
+        rem -= 1
+        j += 1
+    return tuple(per_orbit)
+
+
+def ships(size, count, cx, cy, spin=0.0, phase=0.6, trig=cos_sin):
+    """Yield ``(x, y, n)`` for ship ``n`` of ``count`` around a planet centred on (``cx``, ``cy``).
+
+    Orbit ``j`` is turned by ``spin / (6 + j)`` plus ``j * phase`` radians.
+    ``trig`` maps an angle to (cos, sin); the table lookup by default.
+    """
+    if count <= 0:
+        return
+    n = 0
+    for j, cnt in enumerate(ship_split(size, count)):
+        if cnt <= 0:
+            continue
+        rx, ry = orbits(size)[j]
+        base = spin / (6.0 + j) + j * phase
+        for k in range(cnt):
+            c, s = trig(_TWO_PI * k / cnt + base)
+            yield int(cx + rx * c), int(cy + ry * s), n
+            n += 1
+
+
+@functools.lru_cache(maxsize=32)
+def _console_background(size):
+    r = radius(size)
+    height = r * 2 + 1
+    width = r * 4 + 1
+    cx = width // 2
+    cy = height // 2
+    canvas = [[_cell(math.hypot((x - cx) / 2.0, y - cy), r) for x in range(width)] for y in range(height)]
+    for (rx, ry) in orbits(size):
+        for a in range(0, 360, 8):
+            ang = math.radians(a)
+            ox = int(cx + rx * math.cos(ang))
+            oy = int(cy + ry * math.sin(ang))
+            if 0 <= oy < height and 0 <= ox < width and canvas[oy][ox] == " ":
+                canvas[oy][ox] = "."
+    return tuple("".join(row) for row in canvas)
+
+
+@functools.lru_cache(maxsize=64)
+def console_art(size, count):
+    """Planet page lines: the cached planet and orbits with ``count`` ships on top.
+
+    The page is static, so ships use exact trig and the result is cached.
+    """
+    rows = list(_console_background(size))
+    height = len(rows)
+    width = len(rows[0])
+    edits = {}
+    for x, y, n in ships(size, count, width // 2, height // 2, trig=exact_cos_sin):
+        if 0 <= y < height and 0 <= x < width:
+            edits.setdefault(y, {})[x] = CONSOLE_SHIPS[n % len(CONSOLE_SHIPS)]
+    for y, cols in edits.items():
+        row = list(rows[y])
+        for x, glyph in cols.items():
+            row[x] = glyph
+        rows[y] = "".join(row)
+    rows.append(" ")
+    rows.append(f" Planet Size: {size} | Ships: {count} ")
+    return tuple(rows)
+
+
+def cache_clear():
+    """Forget every cached console raster (cold benchmarks)."""
+    for fn in (orbits, ship_split, _console_background, console_art):
+        fn.cache_clear()
+
+
+class OrbitalLayer:
+    """Planet and orbit rasters for the curses view at one (size, terminal size).
+
+    Drawable rows are ``1 .. maxy - 5``; the bottom four are the status area.
+    """
+
+    # degrees between orbit dots
+    DOT_STEP = 10
+
+    def __init__(self, size, maxy, maxx):
+        self.size = size
+        self.maxy = maxy
+        self.maxx = maxx
+        self.cx = maxx // 2
+        self.cy = maxy // 2
+        r = radius(size)
+        self.planet_width = r * 4 + 1
+        self.orbits = orbits(size)
+        # (y, x, text) runs of the planet, clipped to the drawable area
+        self.planet = self._planet_rows(r)
+        # (orbit, phase in degrees mod DOT_STEP) -> dot cells
+        self._dots = {}
+
+    def visible(self, y, x):
+        return 1 <= y < self.maxy - 4 and 0 <= x < self.maxx
+
+    def _planet_rows(self, r):
+        half = self.planet_width // 2
+        x0 = max(0, self.cx - half - 1)
+        x1 = min(self.maxx - 1, self.cx + half)
+        rows = []
+        for dy in range(-r, r + 1):
+            y = self.cy + dy
+            if not 1 <= y < self.maxy - 4 or x1 < x0:
+                continue
+            text = "".join(_cell(math.hypot((x - self.cx) / 2.0, dy), r) for x in range(x0, x1 + 1))
+            rows.append((y, x0, text))
+        return tuple(rows)
+
+    def dots(self, j, turn):
+        """Dot cells of orbit ``j`` rotated by ``turn`` whole degrees."""
+        key = (j, turn % self.DOT_STEP)
+        cells = self._dots.get(key)
+        if cells is None:
+            rx, ry = self.orbits[j]
+            cells = []
+            for a in range(key[1], 360, self.DOT_STEP):
+                ang = math.radians(a)
+                x = int(self.cx + rx * math.cos(ang))
+                y = int(self.cy + ry * math.sin(ang))
+                if self.visible(y, x):
+                    cells.append((y, x))
+            cells = self._dots[key] = tuple(cells)
+        return cells
+
+    def ships(self, count, spin):
+        """Visible ``(y, x, glyph)`` for ``count`` ships at rotation ``spin``."""
+        out = []
+        for x, y, n in ships(self.size, count, self.cx, self.cy, spin, phase=0.7):
+            if self.visible(y, x):
+                out.append((y, x, CURSES_SHIPS[n % len(CURSES_SHIPS)]))
+        return out
+
+
+class OrbitalCache:
+    """Keeps the ``OrbitalLayer`` for the current (growth, terminal size)."""
+
+    def __init__(self):
+        self._key = None
+        self._layer = None
+
+    def get(self, size, maxy, maxx):
+        key = (size, maxy, maxx)
+        if key != self._key:
+            self._layer = OrbitalLayer(size, maxy, maxx)
+            self._key = key
+        return self._layer
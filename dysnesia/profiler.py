@@ -0,0 +1,163 @@
+"""Frame-time instrumentation.
+
+Each view splits its frames into phases -- ``render``, ``input`` and
+``sim`` -- and the time spent in each is kept per (view, phase) in a
+fixed-size ring buffer, so memory stays flat however long the game runs
+and the percentiles always describe the recent frames.
+
+Sections nest: time spent in an inner section (say a ``sim`` catch-up run
+from a key handler) is charged to it alone, not to the enclosing ``input``
+section as well.
+"""
+import contextlib
+import time
+from array import array
+
+# samples kept per (view, phase)
+RING_SIZE = 512
+PHASES = ("render", "input", "sim")
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """The last ``size`` float samples."""
+
+    __slots__ = ("size", "count", "_data", "_next")
+
+    def __init__(self, size=RING_SIZE):
+        self.size = size
+        # samples recorded in total (may exceed size)
+        self.count = 0
+        self._data = array("d", bytes(8 * size))
+        self._next = 0
+
+    def add(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count += 1
+
+    def values(self):
+        return self._data[:min(self.count, self.size)]
+
+    def percentiles(self, ps=PERCENTILES):
+        """Nearest-rank percentiles of the kept samples, or None when empty."""
+        vals = sorted(self.values())
+        if not vals:
+            return None
+        n = len(vals)
+        return tuple(vals[min(n - 1, max(0, -(-p * n // 100) - 1))] for p in ps)
+
+
+class Profiler:
+    """Per-view, per-phase frame timings.
+
+    ``enter(view)`` at the top of a view's loop names the view; then wrap
+    work in ``section(phase)`` or pair ``begin(phase)`` with ``end()``. A
+    section may stay open across calls (the console frame is begun by
+    ``clear()`` and presented by ``pace_frame()``).
+    """
+
+    def __init__(self, size=RING_SIZE, clock=time.perf_counter):
+        self.size = size
+        self.clock = clock
+        self.view = None
+        # whether the views draw the overlay line
+        self.overlay = False
+        # path of the last dump, shown on the overlay
+        self.last_dump = None
+        # (view, phase) -> RingBuffer
+        self._rings = {}
+        # open sections: [view, phase, start, time already charged]
+        self._stack = []
+
+    def enter(self, view):
+        """Start a frame of ``view``, closing anything left open by the last one."""
+        if self._stack:
+            self.close()
+        self.view = view
+
+    def record(self, phase, seconds, view=None):
+        key = (view or self.view, phase)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = RingBuffer(self.size)
+        ring.add(seconds)
+
+    def begin(self, phase):
+        now = self.clock()
+        if self._stack:
+            outer = self._stack[-1]
+            outer[3] += now - outer[2]
+        self._stack.append([self.view, phase, now, 0.0])
+
+    def end(self, phase=None):
+        """Close the innermost section, or with ``phase`` everything up to the
+        innermost section of that phase (nothing if none is open)."""
+        if phase is not None and not self.is_open(phase):
+            return
+        while self._stack:
+            now = self.clock()
+            view, top, start, spent = self._stack.pop()
+            self.record(top, spent + now - start, view)
+            if self._stack:
+                self._stack[-1][2] = now
+            if phase is None or top == phase:
+                return
+
+    def is_open(self, phase):
+        return any(s[1] == phase for s in self._stack)
+
+    def close(self):
+        """End every open section."""
+        while self._stack:
+            self.end()
+
+    @contextlib.contextmanager
+    def section(self, phase):
+        self.begin(phase)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def stats(self):
+        """{view: {phase: (samples, p50, p95, p99)}} with times in seconds."""
+        out = {}
+        for (view, phase), ring in sorted(self._rings.items(), key=lambda kv: (str(kv[0][0]), kv[0][1])):
+            pct = ring.percentiles()
+            if pct is not None:
+                out.setdefault(view, {})[phase] = (ring.count,) + pct
+        return out
+
+    def overlay_line(self, view=None):
+        """One line of p50/p95/p99 milliseconds per phase for ``view``."""
+        view = view or self.view
+        parts = [f"[{view}]"]
+        for phase in PHASES:
+            ring = self._rings.get((view, phase))
+            pct = ring.percentiles() if ring is not None else None
+            if pct is None:
+                continue
+            parts.append(phase + " " + "/".join(f"{v * 1000:.1f}" for v in pct))
+        parts.append("ms p50/p95/p99")
+        if self.last_dump:
+            parts.append(f"(saved {self.last_dump})")
+        return "  ".join(parts)
+
+    def report(self):
+        """Plain-text table of every view and phase."""
+        lines = [f"{'view':<24} {'phase':<8} {'samples':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+        for view, phases in self.stats().items():
+            for phase, (count, p50, p95, p99) in phases.items():
+                lines.append(
+                    f"{str(view):<24} {phase:<8} {count:>8} {p50 * 1000:>9.3f} {p95 * 1000:>9.3f} {p99 * 1000:>9.3f}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write ``report()`` to ``path``; returns the path."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(time.strftime("# %Y-%m-%d %H:%M:%S\n"))
+            f.write(self.report())
+        self.last_dump = path
+        return path
@@ -0,0 +1,134 @@
+"""Event-driven keyboard input.
+
+The console loops used to poll stdin with a zero ``select()`` timeout and
+then sleep a fixed slice, so a keypress waited for the sleep to run out
+and an idle game still woke up ten times a second. ``InputReactor`` owns
+stdin instead: ``wait()`` blocks in ``select()`` until a key arrives or a
+deadline passes, and ``read_char()`` hands out decoded characters from
+its own buffer, so a multi-byte escape sequence read in one go is never
+stranded where ``select()`` can't see it.
+
+The curses views get the same behaviour from ``getch()`` with a timeout;
+``wait_ms()`` converts the next deadline into that timeout.
+"""
+import codecs
+import collections
+import os
+import select
+import sys
+import time
+
+USING_WINDOWS = sys.platform == "win32"
+if USING_WINDOWS:
+    import msvcrt
+
+# Windows consoles can't be select()ed; kbhit() is polled at this period
+POLL_SECONDS = 0.01
+
+
+def wait_ms(sim_clock=None, frame=None):
+    """Milliseconds a blocking ``getch()`` may wait.
+
+    Until the next sim tick, or ``frame`` seconds when the view animates,
+    whichever is sooner; ``-1`` (block) when there is no deadline at all.
+    """
+    delay = None
+    if sim_clock is not None:
+        delay = sim_clock.time_to_next()
+    if frame is not None:
+        delay = frame if delay is None else min(delay, frame)
+    if delay is None:
+        return -1
+    # round up so we wake just after the deadline, not just before it
+    return max(1, int(delay * 1000) + 1)
+
+
+class InputReactor:
+    """Buffered, blocking-with-timeout reader for the terminal."""
+
+    def __init__(self, stream=None):
+        self._stream = stream if stream is not None else sys.stdin
+        self._pending = collections.deque()
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._eof = False
+        try:
+            self._fd = self._stream.fileno()
+        except Exception:
+            self._fd = None
+
+    def _fill(self, timeout):
+        """Read whatever is available within ``timeout`` seconds (None blocks)."""
+        if self._eof:
+            if timeout:
+                time.sleep(timeout)
+            return False
+        if USING_WINDOWS:
+            return self._fill_windows(timeout)
+        if self._fd is None:
+            if timeout:
+                time.sleep(timeout)
+            return False
+        try:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        if not ready:
+            return False
+        try:
+            data = os.read(self._fd, 1024)
+        except OSError:
+            return False
+        if not data:
+            # stdin closed: stop reporting it as readable forever
+            self._eof = True
+            return False
+        self._pending.extend(self._decoder.decode(data))
+        return bool(self._pending)
+
+    def _fill_windows(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            got = False
+            while msvcrt.kbhit():
+                try:
+                    self._pending.append(msvcrt.getwch())
+                    got = True
+                except Exception:
+                    break
+            if got:
+                return True
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                time.sleep(min(POLL_SECONDS, left))
+            else:
+                time.sleep(POLL_SECONDS)
+
+    def pending(self):
+        """True when a character can be read without blocking."""
+        return bool(self._pending) or self._fill(0)
+
+    def wait(self, timeout):
+        """Block until input is available or ``timeout`` seconds pass.
+
+        Returns True when input is ready. Nothing is consumed, so this is a
+        drop-in ``sleep`` for ``FramePacer`` that wakes early on a keypress.
+        """
+        if self._pending:
+            return True
+        return self._fill(max(0.0, timeout) if timeout is not None else None)
+
+    def read_char(self, timeout=0):
+        """Next character, or None if none arrives within ``timeout`` seconds."""
+        if not self._pending:
+            self._fill(timeout)
+        if self._pending:
+            return self._pending.popleft()
+        return None
+
+    def drain(self, timeout=0.01):
+        """Discard buffered and pending input (e.g. escape sequences left by curses)."""
+        self._pending.clear()
+        while self._fill(timeout):
+            self._pending.clear()
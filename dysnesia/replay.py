@@ -0,0 +1,486 @@
+"""Record a play session and replay it headless, as fast as the CPU allows.
+
+Recording (``DYSNESIA_RECORD=session.jsonl python main2.py``) reseeds the
+game's random streams, snapshots the starting state and then logs every
+input the game reads -- console characters, curses keys and mouse events,
+``input()`` lines -- with its time since the start, one JSON line each.
+
+Replaying (``python -m dysnesia.replay session.jsonl``) loads the same
+frontend, restores the snapshot and seed, and runs its real main loop
+against a virtual clock: every sleep, select and curses timeout advances
+the clock instead of waiting, and each input is handed over when the
+clock reaches its timestamp. Output goes to a null sink and curses is
+replaced by a headless window, so a ten-minute session replays in a
+fraction of the time and makes a repeatable benchmark for the frame
+profiler (``--profile``). The final state is compared against the digest
+recorded at exit; it matches as long as the inputs land on the same
+simulation ticks, which holds unless a recorded frame ran long enough to
+shift a key across a tick boundary.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from dysnesia import save, sim
+from dysnesia.clock import FramePacer, SimClock
+
+try:
+    import curses as _curses
+except ImportError:
+    _curses = None
+
+# set to a file path to record the session there
+RECORD_ENV = "DYSNESIA_RECORD"
+FORMAT_VERSION = 1
+# virtual time a non-blocking curses poll costs, so polling loops still advance
+POLL_SECONDS = 0.001
+
+
+class ReplayFinished(BaseException):
+    """Raised inside the frontend once the recorded session is over."""
+
+
+def digest(game):
+    """Short hash of everything a save keeps, to compare two runs."""
+    data = json.dumps(save.capture(game), sort_keys=True, default=str)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def frontend_name(front):
+    return os.path.splitext(os.path.basename(front.__file__))[0]
+
+
+def restart(front):
+    """Bring a freshly seeded or restored game to the point play begins."""
+    front.generate_city_layout()
+    front.spawn_new_ore()
+    front.sim_clock.reset()
+
+
+# --- recording -------------------------------------------------------------
+
+class Recorder:
+    """Writes one session file: header, ``[t, kind, value]`` events, trailer."""
+
+    def __init__(self, path, frontend, clock=time.monotonic):
+        self.path = path
+        self.frontend = frontend
+        self._clock = clock
+        self._start = None
+        self._file = None
+        self.events = 0
+
+    def begin(self, game, size, seed=None):
+        """Reseed ``game`` and write the header with its starting state."""
+        game.rng.seed(seed)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._start = self._clock()
+        header = {
+            "version": FORMAT_VERSION,
+            "frontend": self.frontend,
+            "seed": game.rng.seed_value,
+            "size": list(size),
+            "time": time.time(),
+            "state": save.capture(game),
+        }
+        self._file.write(json.dumps(header, default=str) + "\n")
+
+    def add(self, kind, value):
+        if self._file is None:
+            return
+        t = round(self._clock() - self._start, 6)
+        self._file.write(json.dumps([t, kind, value]) + "\n")
+        self.events += 1
+
+    def close(self, game):
+        """Write the trailer (end time and final-state digest) and close the file."""
+        if self._file is None:
+            return
+        end = round(self._clock() - self._start, 6)
+        self._file.write(json.dumps({"end": end, "digest": digest(game)}) + "\n")
+        self._file.close()
+        self._file = None
+
+
+class RecordingReactor:
+    """Wraps an ``InputReactor`` and records every character it hands out."""
+
+    def __init__(self, inner, recorder):
+        self._inner = inner
+        self._rec = recorder
+
+    def read_char(self, timeout=0):
+        ch = self._inner.read_char(timeout)
+        if ch is not None:
+            self._rec.add("key", ch)
+        return ch
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+class RecordingWindow:
+    """Wraps a curses window and records the keys ``getch()`` returns."""
+
+    def __init__(self, win, recorder):
+        self._win = win
+        self._rec = recorder
+
+    def getch(self, *args):
+        ch = self._win.getch(*args)
+        if ch != -1:
+            self._rec.add("ckey", ch)
+        return ch
+
+    def __getattr__(self, name):
+        return getattr(self._win, name)
+
+
+class RecordingCurses:
+    """Stands in for the ``curses`` module: records mouse events and wraps the screen."""
+
+    def __init__(self, module, recorder):
+        self._module = module
+        self._rec = recorder
+
+    def wrapper(self, func, *args, **kwargs):
+        rec = self._rec
+        return self._module.wrapper(lambda scr, *a, **kw: func(RecordingWindow(scr, rec), *a, **kw),
+                                    *args, **kwargs)
+
+    def getmouse(self):
+        event = self._module.getmouse()
+        self._rec.add("mouse", list(event))
+        return event
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+def record(front, path):
+    """Start recording the running frontend module ``front`` to ``path``.
+
+    Call after ``load_game()``; returns the ``Recorder`` to ``close(GAME)``
+    when the game exits.
+    """
+    rec = Recorder(path, frontend_name(front))
+    rec.begin(front.GAME, shutil.get_terminal_size())
+    front.input_reactor = RecordingReactor(front.input_reactor, rec)
+    if getattr(front, "curses", None) is not None:
+        front.curses = RecordingCurses(front.curses, rec)
+    read_line = getattr(front, "input", input)
+
+    def recorded_input(prompt=""):
+        line = read_line(prompt)
+        rec.add("line", line)
+        return line
+
+    front.input = recorded_input
+    restart(front)
+    return rec
+
+
+# --- replaying -------------------------------------------------------------
+
+class Feed:
+    """The recorded events plus the virtual clock they are handed out against."""
+
+    def __init__(self, events, end):
+        self.events = collections.deque(events)
+        self.end = end
+        self.now = 0.0
+        self.total = len(self.events)
+
+    def advance(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+        if self.now > self.end:
+            raise ReplayFinished()
+
+    def wait(self, timeout):
+        """Advance up to ``timeout`` seconds (None: no limit), stopping at the next event."""
+        step = timeout if timeout is not None else self.end - self.now + POLL_SECONDS
+        # stop at the next event; one already due is waiting for another reader
+        if self.events and self.events[0][0] > self.now:
+            step = min(step, self.events[0][0] - self.now)
+        self.advance(step)
+
+    def due(self, kind):
+        """Whether the next event is a ``kind`` input whose time has come."""
+        return bool(self.events) and self.events[0][1] == kind and self.events[0][0] <= self.now
+
+    def take(self, kind):
+        """The value of the next event if it is due and of ``kind``, else None."""
+        if self.due(kind):
+            return self.events.popleft()[2]
+        return None
+
+    def reply(self, kind):
+        """The next event as the answer to a blocking call (mouse, input line)."""
+        if not self.events or self.events[0][1] != kind:
+            # the session went another way than the recording
+            self.advance(self.end - self.now + POLL_SECONDS)
+        t, _, value = self.events.popleft()
+        self.advance(t - self.now)
+        return value
+
+
+class VirtualTime:
+    """Stands in for the ``time`` module: the clocks read the feed, sleeps advance it."""
+
+    def __init__(self, feed, start):
+        self._feed = feed
+        self._start = start
+
+    def time(self):
+        return self._start + self._feed.now
+
+    def monotonic(self):
+        return self._feed.now
+
+    def sleep(self, seconds):
+        self._feed.advance(seconds)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class ReplayReactor:
+    """``InputReactor`` fed from the recorded console keys."""
+
+    def __init__(self, feed):
+        self._feed = feed
+
+    def pending(self):
+        return self._feed.due("key")
+
+    def wait(self, timeout):
+        if not self._feed.due("key"):
+            self._feed.wait(timeout)
+        return self._feed.due("key")
+
+    def read_char(self, timeout=0):
+        if timeout and not self._feed.due("key"):
+            self._feed.wait(timeout)
+        return self._feed.take("key")
+
+    def drain(self, timeout=0.01):
+        pass
+
+
+class HeadlessWindow:
+    """A curses window that draws nothing and reads the recorded keys."""
+
+    def __init__(self, feed, size):
+        self._feed = feed
+        self._size = size
+        self._delay = -1
+
+    def getmaxyx(self):
+        cols, rows = self._size
+        return rows, cols
+
+    def timeout(self, ms):
+        self._delay = ms
+
+    def nodelay(self, flag):
+        self._delay = 0 if flag else -1
+
+    def getch(self, *args):
+        feed = self._feed
+        if not feed.due("ckey"):
+            if self._delay < 0:
+                feed.wait(None)
+            elif self._delay == 0:
+                feed.advance(POLL_SECONDS)
+            else:
+                feed.wait(self._delay / 1000.0)
+        ch = feed.take("ckey")
+        return -1 if ch is None else ch
+
+    def addstr(self, *args):
+        pass
+
+    chgat = erase = clear = keypad = refresh = noutrefresh = addstr
+
+
+class HeadlessCurses:
+    """Stands in for the ``curses`` module during a replay."""
+
+    class error(Exception):
+        pass
+
+    # used by the frontends when the real module is missing
+    FALLBACK = {
+        "KEY_UP": 259, "KEY_DOWN": 258, "KEY_NPAGE": 338, "KEY_PPAGE": 339,
+        "KEY_MOUSE": 409, "A_NORMAL": 0, "A_BOLD": 2097152, "A_REVERSE": 262144,
+        "ALL_MOUSE_EVENTS": 268435455, "REPORT_MOUSE_POSITION": 268435456,
+        "BUTTON1_PRESSED": 2, "BUTTON1_CLICKED": 4, "BUTTON4_PRESSED": 65536,
+        "BUTTON5_PRESSED": 2097152,
+    }
+
+    def __init__(self, feed, size):
+        self._feed = feed
+        self._size = size
+        constants = dict(self.FALLBACK)
+        if _curses is not None:
+            constants.update((k, v) for k, v in vars(_curses).items() if k.isupper())
+        self.__dict__.update(constants)
+
+    def wrapper(self, func, *args, **kwargs):
+        return func(HeadlessWindow(self._feed, self._size), *args, **kwargs)
+
+    def getmouse(self):
+        return tuple(self._feed.reply("mouse"))
+
+    def mousemask(self, mask):
+        return mask, 0
+
+    def curs_set(self, visibility):
+        return 1
+
+    def noecho(self):
+        pass
+
+    doupdate = use_default_colors = start_color = noecho
+
+
+class ReplayResult:
+    """What a replay did and how long it took."""
+
+    __slots__ = ("frontend", "events", "unread", "virtual_seconds", "wall_seconds",
+                 "ticks", "digest", "expected", "front")
+
+    @property
+    def matches(self):
+        return self.expected is not None and self.digest == self.expected
+
+    @property
+    def speedup(self):
+        return self.virtual_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def as_dict(self):
+        out = {name: getattr(self, name) for name in self.__slots__ if name != "front"}
+        out["matches"] = self.matches
+        out["speedup"] = self.speedup
+        return out
+
+
+class _NullOut:
+    """Discards the frontend's output."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def load(path):
+    """Read a session file: ``(header, events, trailer)``."""
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: not a version {FORMAT_VERSION} session")
+    header, body = lines[0], lines[1:]
+    trailer = body.pop() if body and isinstance(body[-1], dict) else {}
+    return header, body, trailer
+
+
+def replay(path, frontend=None):
+    """Replay the session in ``path`` headless; returns a ``ReplayResult``."""
+    header, events, trailer = load(path)
+    end = trailer.get("end", events[-1][0] if events else 0.0)
+    feed = Feed(events, end)
+    size = tuple(header.get("size", (80, 24)))
+    front = sim.load_frontend(frontend or header["frontend"], quiet=False)
+
+    vtime = VirtualTime(feed, header.get("time", time.time()))
+    reactor = ReplayReactor(feed)
+    front.time = vtime
+    front.input_reactor = reactor
+    front.sim_clock = SimClock(clock=vtime.monotonic)
+    front.frame_pacer = FramePacer(clock=vtime.monotonic, sleep=reactor.wait)
+    front.curses = HeadlessCurses(feed, size)
+    front.HAVE_CURSES = True
+    front.termios = None
+    front.DEBUG_KEYLOG = False
+
+    def read_line(prompt=""):
+        return feed.reply("line")
+
+    front.input = read_line
+
+    def load_game():
+        save.restore(front.GAME, header["state"])
+        front.GAME.rng.seed(header["seed"])
+        restart(front)
+        return True
+
+    front.load_game = load_game
+
+    saved_env = {k: os.environ.get(k) for k in ("COLUMNS", "LINES", RECORD_ENV)}
+    os.environ["COLUMNS"], os.environ["LINES"] = str(size[0]), str(size[1])
+    os.environ.pop(RECORD_ENV, None)
+    saved_out = sys.stdout
+    sys.stdout = _NullOut()
+    started = time.perf_counter()
+    try:
+        front.main()
+    except (ReplayFinished, SystemExit):
+        pass
+    finally:
+        wall = time.perf_counter() - started
+        sys.stdout = saved_out
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+    result = ReplayResult()
+    result.frontend = header["frontend"]
+    result.events = feed.total
+    result.unread = len(feed.events)
+    result.virtual_seconds = feed.now
+    result.wall_seconds = wall
+    result.ticks = front.sim_clock.ticks
+    result.digest = digest(front.GAME)
+    result.expected = trailer.get("digest")
+    result.front = front
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dysnesia.replay",
+                                     description="Replay a recorded session headless.")
+    parser.add_argument("session", help=f"file written with {RECORD_ENV}=<file>")
+    parser.add_argument("--frontend", help="frontend to replay into (default: the recorded one)")
+    parser.add_argument("--profile", action="store_true", help="print the frame profiler report")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    result = replay(args.session, args.frontend)
+    if args.json:
+        print(json.dumps(result.as_dict(), indent=2))
+    else:
+        state = "matches" if result.matches else ("differs" if result.expected else "no digest recorded")
+        print(f"{result.frontend}: {result.events} events ({result.unread} unread), "
+              f"{result.virtual_seconds:.1f}s of play, {result.ticks} ticks "
+              f"in {result.wall_seconds:.2f}s wall ({result.speedup:.0f}x)")
+        print(f"final state {state} ({result.digest[:12]})")
+    if args.profile:
+        print(result.front.frame_profiler.report())
+    return 0 if result.matches or result.expected is None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Seeded random streams, one per subsystem.
+
+Every subsystem draws from its own ``random.Random``, all derived from one
+seed, so a cloud drifting across the city never shifts the next ore or
+the next combat roll, and the seed plus the player's inputs (see
+``dysnesia.replay``) reproduce a game exactly. A game carries its
+streams as ``game.rng``; ``GameState.copy()`` copies their positions.
+
+Without an explicit seed one is drawn from the stdlib generator, so
+``random.seed()`` before creating a game keeps runs repeatable as before.
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# subsystem streams: ore spawns and auto-mining draws, combat rolls and enemy
+# names, the city layout and clouds, and the glitch effects
+STREAMS = ("ores", "combat", "city", "glitch")
+
+
+class RNG:
+    """The random streams of one game, as attributes named after ``STREAMS``."""
+
+    __slots__ = STREAMS + ("seed_value", "_numpy")
+
+    def __init__(self, seed=None):
+        for name in STREAMS:
+            setattr(self, name, random.Random())
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseed every stream in place (references to them stay valid)."""
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed_value = seed
+        for name in STREAMS:
+            getattr(self, name).seed(f"{seed}/{name}")
+        self._numpy = None
+
+    def numpy(self):
+        """NumPy generator for the vectorized mining draws, or None without NumPy."""
+        if self._numpy is None and np is not None:
+            self._numpy = np.random.default_rng(random.Random(f"{self.seed_value}/mining").getrandbits(64))
+        return self._numpy
+
+    def copy(self):
+        """Independent streams at the same positions."""
+        new = RNG.__new__(RNG)
+        new.seed_value = self.seed_value
+        for name in STREAMS:
+            stream = random.Random()
+            stream.setstate(getattr(self, name).getstate())
+            setattr(new, name, stream)
+        new._numpy = None
+        if self._numpy is not None:
+            new._numpy = np.random.default_rng()
+            new._numpy.bit_generator.state = self._numpy.bit_generator.state
+        return new
+
+    def __repr__(self):
+        return f"RNG(seed={self.seed_value!r})"
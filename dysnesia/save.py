@@ -0,0 +1,283 @@
+"""Persistent saves: compact snapshot + append-only journal.
+
+Layout of a save slot (``<dir>/<slot>.snapshot.json`` and
+``<dir>/<slot>.journal``):
+
+* the snapshot is the full persisted state at some point in time;
+* every later change is one JSON line in the journal holding only the
+  fields that changed since the previous record (absolute values, so
+  replaying a record twice is harmless).
+
+``SaveManager.record()`` only diffs and enqueues on the caller's thread;
+a background writer appends, fsyncs in batches and compacts the journal
+into a fresh snapshot once it grows past ``compact_bytes``. If the writer
+hits an ``OSError`` (disk full, directory gone) it stops, keeps the error
+in ``failed`` and ``record()`` drops everything after that, so a dead
+writer never lets the queue grow without bound. Loading replays the
+journal tail on top of the snapshot, ignoring a torn last line from a
+crash.
+
+The ore being mined (``current_ore``, ``ore_hp``) is deliberately not
+saved: loading spawns a fresh ore at the saved depth.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+from dysnesia.money import Money
+
+SAVE_VERSION = 1
+
+# plain values persisted as-is
+SCALAR_FIELDS = (
+    "money", "rate", "othermultiplier", "w1upgrades", "player_level",
+    "research_page_unlocked", "technology_page_unlocked", "mining_page_unlocked",
+    "blackhole_page_unlocked", "blackhole_page_first_visit",
+    "blackhole_growth", "blackhole_upgrades_count", "ships_count",
+    "ore_damage", "auto_mine_damage", "auto_miner_count", "depth", "max_depth",
+    "sanity_points", "sanity_stage", "awaiting_cycle_return", "cycle_return_applied",
+    "last_send_cause", "last_send_depth", "consecutive_defeats", "buy_mode",
+)
+# ``Money`` fields, persisted as exact decimal strings (older saves hold floats)
+MONEY_FIELDS = ("money",)
+# dicts persisted as-is
+DICT_FIELDS = ("ore_inventory", "sanity_awarded")
+# per-entry progress of the data tables, keyed by entry key
+TABLE_FIELDS = {
+    "upgrades": ("count", "cost", "seen"),
+    "blackhole_upgrades": ("count", "cost", "seen"),
+    "research": ("purchased",),
+    "technology": ("purchased",),
+}
+
+
+def default_save_dir():
+    return os.environ.get("DYSNESIA_SAVE_DIR") or os.path.join(os.path.expanduser("~"), ".dysnesia")
+
+
+def capture(game):
+    """Return the persisted part of ``game`` as a JSON-friendly dict."""
+    data = {}
+    for name in SCALAR_FIELDS:
+        if hasattr(game, name):
+            data[name] = getattr(game, name)
+    for name in MONEY_FIELDS:
+        if isinstance(data.get(name), Money):
+            data[name] = data[name].dump()
+    for name in DICT_FIELDS:
+        if hasattr(game, name):
+            data[name] = dict(getattr(game, name))
+    for name, cols in TABLE_FIELDS.items():
+        table = getattr(game, name, None)
+        if table is not None:
+            data[name] = {e["key"]: [e.get(c) for c in cols] for e in table}
+    data["defeated_regions"] = sorted(getattr(game, "defeated_regions", ()))
+    data["killed_monsters"] = list(getattr(game, "killed_monsters", ()))
+    return data
+
+
+def restore(game, data):
+    """Write a captured dict back onto ``game``. Unknown keys are ignored."""
+    for name in SCALAR_FIELDS:
+        if name in data and hasattr(game, name):
+            value = data[name]
+            if name in MONEY_FIELDS:
+                value = Money.parse(value)
+            setattr(game, name, value)
+    for name in DICT_FIELDS:
+        if name in data and hasattr(game, name):
+            target = getattr(game, name)
+            target.clear()
+            target.update(data[name])
+    for name, cols in TABLE_FIELDS.items():
+        rows = data.get(name)
+        table = getattr(game, name, None)
+        if not rows or table is None:
+            continue
+        for e in table:
+            row = rows.get(e["key"])
+            if row is None:
+                continue
+            for c, v in zip(cols, row):
+                e[c] = v
+    if "defeated_regions" in data and hasattr(game, "defeated_regions"):
+        game.defeated_regions.clear()
+        game.defeated_regions.update(data["defeated_regions"])
+    if "killed_monsters" in data and hasattr(game, "killed_monsters"):
+        game.killed_monsters[:] = data["killed_monsters"]
+
+
+def diff(old, new):
+    """Changed fields of ``new`` relative to ``old`` (dicts diffed one level deep)."""
+    out = {}
+    for k, v in new.items():
+        prev = old.get(k)
+        if v == prev:
+            continue
+        if isinstance(v, dict) and isinstance(prev, dict):
+            out[k] = {ik: iv for ik, iv in v.items() if prev.get(ik) != iv}
+        else:
+            out[k] = v
+    return out
+
+
+def merge(base, delta):
+    """Apply a journal delta to ``base`` in place (inverse of ``diff``)."""
+    for k, v in delta.items():
+        if isinstance(v, dict) and isinstance(base.get(k), dict):
+            base[k].update(v)
+        else:
+            base[k] = v
+    return base
+
+
+class SaveManager:
+    """Owns one save slot and its background writer thread."""
+
+    def __init__(self, directory=None, slot="main", compact_bytes=256 * 1024,
+                 flush_interval=1.0, batch_size=64):
+        self.directory = directory or default_save_dir()
+        self.slot = slot
+        self.snapshot_path = os.path.join(self.directory, f"{slot}.snapshot.json")
+        self.journal_path = os.path.join(self.directory, f"{slot}.journal")
+        self.compact_bytes = compact_bytes
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._last = {}
+        # writer-side view of the full state, used for compaction
+        self._merged = {}
+        self.saved_at = None
+        # the OSError that stopped the writer, or None while saving works
+        self.failed = None
+
+    # --- loading -------------------------------------------------------
+    def load(self):
+        """Return the saved state dict (snapshot + journal tail) or None."""
+        state = None
+        saved_at = None
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            if snap.get("version") == SAVE_VERSION:
+                state = snap.get("state") or {}
+                saved_at = snap.get("saved_at")
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # torn write from a crash: everything after it is unusable
+                        break
+                    if state is None:
+                        state = {}
+                    merge(state, rec.get("d", {}))
+                    saved_at = rec.get("t", saved_at)
+        except OSError:
+            pass
+        self.saved_at = saved_at
+        if state is not None:
+            self._last = json.loads(json.dumps(state))
+            self._merged = json.loads(json.dumps(state))
+        return state
+
+    # --- recording -----------------------------------------------------
+    def start(self):
+        if self._thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._writer, name="dysnesia-save", daemon=True)
+            self._thread.start()
+
+    def record(self, event, data):
+        """Journal whatever changed in ``data`` (a ``capture()`` dict). Never blocks on disk.
+
+        Returns False (and drops the change) when nothing changed or the
+        writer has failed.
+        """
+        if self.failed is not None:
+            return False
+        delta = diff(self._last, data)
+        if not delta:
+            return False
+        merge(self._last, json.loads(json.dumps(delta)))
+        self._queue.put({"t": time.time(), "ev": event, "d": delta})
+        return True
+
+    def close(self, timeout=2.0):
+        """Flush everything queued and stop the writer."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --- writer thread -------------------------------------------------
+    def _writer(self):
+        journal = None
+        pending = 0
+        last_sync = time.monotonic()
+        try:
+            journal = open(self.journal_path, "a", encoding="utf-8")
+            while True:
+                try:
+                    rec = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    rec = False
+                if rec is None:
+                    break
+                if rec:
+                    journal.write(json.dumps(rec, separators=(",", ":")) + "\n")
+                    merge(self._merged, rec["d"])
+                    self.saved_at = rec["t"]
+                    pending += 1
+                if pending and (pending >= self.batch_size or time.monotonic() - last_sync >= self.flush_interval):
+                    self._sync(journal)
+                    pending = 0
+                    last_sync = time.monotonic()
+                    if journal.tell() >= self.compact_bytes:
+                        journal = self._compact(journal)
+            if pending:
+                self._sync(journal)
+            if journal.tell() >= self.compact_bytes:
+                journal = self._compact(journal)
+        except OSError as e:
+            self.failed = e
+            # nothing more gets written; let the queued records go
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+        finally:
+            if journal is not None:
+                try:
+                    journal.close()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _sync(journal):
+        journal.flush()
+        try:
+            os.fsync(journal.fileno())
+        except OSError:
+            pass
+
+    def _compact(self, journal):
+        """Fold the journal into a new snapshot and start an empty journal."""
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": SAVE_VERSION, "saved_at": self.saved_at, "state": self._merged}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        journal.close()
+        # records are absolute values, so a crash before this truncate only
+        # means the old tail is replayed harmlessly on the next load
+        return open(self.journal_path, "w", encoding="utf-8")
@@ -0,0 +1,144 @@
+"""Diff-based ANSI renderer for the console (non-curses) pages.
+
+The console pages are written with plain ``print()``. Instead of
+``os.system("clear")`` before every frame, ``ConsoleScreen.begin()``
+captures everything printed for the frame and ``present()`` compares it
+with the previous frame line by line, emitting only cursor moves and the
+rows that changed in one buffered ``write`` -- the same idea as
+``render_line()``'s ``_last_screen`` for curses, without curses.
+"""
+import io
+import os
+import shutil
+import sys
+
+from dysnesia.text import wrap
+
+CSI = "\x1b["
+
+
+class ConsoleScreen:
+    """Captures printed frames and repaints only the rows that changed."""
+
+    def __init__(self, stream=None):
+        self._stream = stream
+        self._real = None
+        self._saved = None
+        self._buf = None
+        self._prev = None
+        self._size = None
+        if os.name == "nt":
+            # turn on VT escape processing in the Windows console
+            try:
+                os.system("")
+            except Exception:
+                pass
+
+    @property
+    def capturing(self):
+        return self._real is not None
+
+    def _out(self):
+        return self._stream or sys.stdout
+
+    def begin(self):
+        """Start a new frame; presents the frame in progress first, if any."""
+        if self._real is not None:
+            self.present()
+        self._saved = sys.stdout
+        self._real = self._out()
+        self._buf = io.StringIO()
+        sys.stdout = self._buf
+
+    def release(self):
+        """Present the current frame and stop capturing.
+
+        Used before handing the terminal to something else (curses, input(),
+        a blocking prompt): whatever it draws is unknown to us, so the next
+        frame is a full repaint.
+        """
+        self.present()
+        self._prev = None
+
+    def control(self, seq):
+        """Write a terminal control sequence (mouse modes and the like)
+        straight to the terminal, never into the captured frame."""
+        out = self._real if self._real is not None else self._out()
+        try:
+            out.write(seq)
+            out.flush()
+        except Exception:
+            pass
+
+    def invalidate(self):
+        """Forget the previous frame so the next present() repaints everything."""
+        self._prev = None
+
+    def wipe(self):
+        """Stop capturing and clear the terminal."""
+        self.present()
+        out = self._out()
+        try:
+            if out.isatty():
+                out.write(CSI + "H" + CSI + "2J")
+                out.flush()
+        except Exception:
+            pass
+        self._prev = None
+
+    @staticmethod
+    def layout(text, cols):
+        """Split captured text into physical terminal rows of at most ``cols`` columns."""
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        rows = []
+        for line in lines:
+            rows.extend(wrap(line.replace("\r", ""), cols))
+        return rows
+
+    def diff(self, rows, height):
+        """ANSI string that turns the previous frame into ``rows``."""
+        prev = self._prev
+        out = []
+        if prev is None or len(rows) > height:
+            out.append(CSI + "H" + CSI + "2J")
+            out.append("\n".join(rows))
+            return "".join(out)
+        for i, line in enumerate(rows):
+            if i >= len(prev) or prev[i] != line:
+                out.append(f"{CSI}{i + 1};1H{line}{CSI}K")
+        for i in range(len(rows), len(prev)):
+            if prev[i]:
+                out.append(f"{CSI}{i + 1};1H{CSI}K")
+        # park the cursor under the frame like a plain print would
+        out.append(f"{CSI}{min(height, len(rows) + 1)};1H")
+        return "".join(out)
+
+    def present(self):
+        """Write the captured frame as a minimal diff. No-op when not capturing."""
+        if self._real is None:
+            return
+        real = self._real
+        text = self._buf.getvalue()
+        sys.stdout = self._saved
+        self._saved = None
+        self._real = None
+        self._buf = None
+        try:
+            tty = real.isatty()
+        except Exception:
+            tty = False
+        if not tty:
+            real.write(text)
+            real.flush()
+            return
+        cols, height = shutil.get_terminal_size()
+        if self._size != (cols, height):
+            self._prev = None
+            self._size = (cols, height)
+        rows = self.layout(text, cols)
+        real.write(self.diff(rows, height))
+        real.flush()
+        # frames taller than the terminal scroll, so positions can't be reused
+        self._prev = rows if len(rows) <= height else None
@@ -0,0 +1,470 @@
+"""Headless balance simulator.
+
+Loads a frontend script (``main2.py`` or ``admin.py``) as a fresh,
+terminal-free module and plays its ``GAME`` state with a purchase policy. Instead of
+ticking, it works out how long the next purchase takes to afford, jumps
+there with ``idle.catch_up()`` and buys through the frontend's own buy
+functions, so the tables and purchase rules under test are the real ones.
+When the policy has nothing left it can buy, the rest of ``--hours`` is
+idled out in one jump. The report is the simulated time at which each
+milestone was first hit.
+
+    python -m dysnesia.sim                        # greedy policy on main2.py
+    python -m dysnesia.sim --frontend admin --json
+    python -m dysnesia.sim --policy plan.json     # scripted purchase order
+    python -m dysnesia.sim --expect break_the_reality=60   # CI gate (hours)
+
+Simplifications: every send to World 2 returns at once (map and combat are
+not played), and manual mining is a fixed click rate on the mining page.
+"""
+import argparse
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+import time
+
+from dysnesia import economy, idle, keymap, mining
+from dysnesia.clock import TICK_SECONDS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# milestone name -> predicate on the game state, in progression order
+MILESTONES = (
+    ("research_unlock", lambda g: g.research_page_unlocked),
+    ("tech_unlock", lambda g: g.technology_page_unlocked),
+    ("depth_2", lambda g: g.max_depth >= 2),
+    ("depth_3", lambda g: g.max_depth >= 3),
+    ("depth_4", lambda g: g.max_depth >= 4),
+    ("depth_5", lambda g: g.max_depth >= 5),
+    ("blackhole_unlock", lambda g: g.blackhole_page_unlocked),
+    ("break_the_reality", lambda g: any(u["key"] == "n" and u["count"] > 0 for u in g.blackhole_upgrades)),
+)
+
+_loaded = 0
+
+
+def load_frontend(name="main2", quiet=True):
+    """Execute a frontend script as a new module, without its save journal.
+
+    With ``quiet`` its glitch transitions and effect messages are stripped
+    too; ``dysnesia.replay`` keeps them and swaps the terminal instead.
+    """
+    global _loaded
+    path = name if name.endswith(".py") else os.path.join(ROOT, name + ".py")
+    _loaded += 1
+    modname = f"_dysnesia_sim_{_loaded}"
+    spec = importlib.util.spec_from_file_location(modname, path)
+    front = importlib.util.module_from_spec(spec)
+    sys.modules[modname] = front
+    try:
+        spec.loader.exec_module(front)
+    finally:
+        sys.modules.pop(modname, None)
+    # never touch the player's save
+    front.persist = lambda event: None
+    if not quiet:
+        return front
+    # no glitch transitions, no effect messages
+    front.glitch_transition = lambda: None
+    front.GAME.quiet_effects = True
+    return front
+
+
+# --- purchases -------------------------------------------------------------
+
+class Action:
+    """One purchase: ``kind`` is upgrade/research/technology/blackhole/unlock_blackhole."""
+
+    __slots__ = ("kind", "entry")
+
+    def __init__(self, kind, entry=None):
+        self.kind = kind
+        self.entry = entry
+
+    @property
+    def key(self):
+        return self.entry["key"] if self.entry is not None else None
+
+    def money_cost(self, game):
+        if self.kind in ("upgrade", "blackhole", "research"):
+            return self.entry["cost"]
+        if self.kind == "technology":
+            return self.entry["money_cost"]
+        return game.blackhole_unlock_cost
+
+    def ore_costs(self):
+        if self.kind == "technology":
+            return self.entry.get("ore_costs", {})
+        if self.kind == "unlock_blackhole":
+            return {"orichalcum_shard": 1}
+        return {}
+
+    def perform(self, front):
+        """Buy one level through the frontend module. Returns True if anything was bought."""
+        e = self.entry
+        if self.kind == "upgrade":
+            before = e["count"]
+            front.buy_upgrade(e)
+            return e["count"] > before
+        if self.kind == "blackhole":
+            before = e["count"]
+            front.buy_blackhole_upgrade(e)
+            return e["count"] > before
+        if self.kind == "research":
+            front.buy_research(e)
+            return e["purchased"]
+        if self.kind == "technology":
+            front.buy_technology(e)
+            return e["purchased"]
+        return front.unlock_blackhole()
+
+    def __repr__(self):
+        return self.kind if self.entry is None else f"{self.kind}:{self.key}"
+
+
+def tech_unlocked(game, tech):
+    """Prerequisite rule of the mining page: tech 1 is free, others need an unlocker."""
+    # only the number keys are gated by prerequisites in the frontend
+    return keymap.tech_unlocked(game, tech) or not tech["key"].isdigit()
+
+
+def candidates(game):
+    """Every purchase the current state could make, affordable or not."""
+    out = []
+    for upg in game.upgrades:
+        if upg["count"] < upg["max"]:
+            out.append(Action("upgrade", upg))
+    if game.research_page_unlocked:
+        out.extend(Action("research", r) for r in game.research if not r["purchased"])
+    if game.technology_page_unlocked:
+        out.extend(Action("technology", t) for t in game.technology
+                   if not t["purchased"] and tech_unlocked(game, t))
+        if game.max_depth >= 5 and not game.blackhole_page_unlocked:
+            out.append(Action("unlock_blackhole"))
+    if game.blackhole_page_unlocked:
+        out.extend(Action("blackhole", u) for u in game.blackhole_upgrades if u["count"] < u["max"])
+    return out
+
+
+def find_action(game, kind, key=None):
+    """Look up the ``Action`` for a scripted step; None if it no longer applies."""
+    if kind == "unlock_blackhole":
+        return None if game.blackhole_page_unlocked else Action(kind)
+    table = {"upgrade": "upgrades", "research": "research",
+             "technology": "technology", "blackhole": "blackhole_upgrades"}.get(kind)
+    if table is None:
+        raise ValueError(f"unknown step kind {kind!r}")
+    e = keymap.lookup(game, table, key)
+    if e is None:
+        raise ValueError(f"no {kind} with key {key!r}")
+    if e.get("purchased") or ("max" in e and e["count"] >= e["max"]):
+        return None
+    return Action(kind, e)
+
+
+# --- policies --------------------------------------------------------------
+
+class GreedyPolicy:
+    """Always goes for the purchase that becomes affordable soonest (cheapest on ties)."""
+
+    def __init__(self):
+        self._rejected = set()
+
+    def choose(self, sim):
+        best = None
+        best_rank = None
+        for action in candidates(sim.game):
+            if (action.kind, action.key) in self._rejected:
+                continue
+            ticks, _ = sim.eta(action)
+            if ticks is None:
+                continue
+            rank = (ticks, action.money_cost(sim.game))
+            if best_rank is None or rank < best_rank:
+                best, best_rank = action, rank
+        return best
+
+    def bought(self, action):
+        pass
+
+    def rejected(self, action):
+        self._rejected.add((action.kind, action.key))
+
+
+class ScriptedPolicy:
+    """Buys a fixed list of steps in order.
+
+    Steps are strings such as ``"upgrade:a"``, ``"research:3"``,
+    ``"technology:7"``, ``"blackhole:n"`` or ``"unlock_blackhole"``; an
+    ``"xN"`` suffix (``"upgrade:a x10"``) repeats a step. Steps that no
+    longer apply (maxed, already bought) are skipped.
+    """
+
+    def __init__(self, steps):
+        self.steps = []
+        for step in steps:
+            text, _, times = step.partition(" x")
+            kind, _, key = text.strip().partition(":")
+            self.steps.append([kind, key or None, int(times) if times else 1])
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["steps"] if isinstance(data, dict) else data)
+
+    def choose(self, sim):
+        while self.steps:
+            kind, key, _ = self.steps[0]
+            action = find_action(sim.game, kind, key)
+            if action is not None:
+                return action
+            self.steps.pop(0)
+        return None
+
+    def bought(self, action):
+        self.steps[0][2] -= 1
+        if self.steps[0][2] <= 0:
+            self.steps.pop(0)
+
+    rejected = bought
+
+
+# --- simulation ------------------------------------------------------------
+
+class SimReport:
+    """Outcome of one run: milestone times in simulated seconds (None if not reached)."""
+
+    def __init__(self, frontend, policy, milestones, seconds, purchases, wall, reason):
+        self.frontend = frontend
+        self.policy = policy
+        self.milestones = milestones
+        self.seconds = seconds
+        self.purchases = purchases
+        self.wall = wall
+        self.reason = reason
+
+    @property
+    def hours_per_second(self):
+        return self.seconds / 3600.0 / self.wall if self.wall > 0 else float("inf")
+
+    def as_dict(self):
+        return {
+            "frontend": self.frontend,
+            "policy": self.policy,
+            "milestones": self.milestones,
+            "simulated_seconds": self.seconds,
+            "purchases": self.purchases,
+            "wall_seconds": self.wall,
+            "end": self.reason,
+        }
+
+    def format(self):
+        lines = [f"{self.frontend} / {self.policy}: {self.reason}"]
+        for name, _ in MILESTONES:
+            t = self.milestones.get(name)
+            lines.append(f"  {name:<18} {format_duration(t) if t is not None else '--'}")
+        lines.append(f"  {self.purchases} purchases, {format_duration(self.seconds)} simulated "
+                     f"in {self.wall:.3f}s ({self.hours_per_second:,.0f} sim hours/s)")
+        return "\n".join(lines)
+
+
+def format_duration(seconds):
+    s = int(seconds)
+    return f"{s // 3600}:{s // 60 % 60:02d}:{s % 60:02d}"
+
+
+class Simulation:
+    """Plays a frontend's game forward with a policy, purchase to purchase."""
+
+    def __init__(self, front, policy, clicks_per_second=5.0, max_hours=1000.0):
+        self.front = front
+        self.game = front.GAME
+        self.policy = policy
+        self.clicks = clicks_per_second
+        self.limit = int(max_hours * 3600 / TICK_SECONDS)
+        self.ticks = 0
+        self.milestones = {}
+        self._depth_stats = {}
+
+    # mining model
+    def mining_damage(self):
+        """Damage per tick: auto miners plus manual clicks once the mining page is open."""
+        g = self.game
+        manual = self.clicks * g.ore_damage if g.technology_page_unlocked else 0
+        return g.auto_mine_damage + manual
+
+    def depth_stats(self, depth, damage):
+        """``(ores per tick by name, ore money per tick before multipliers)`` at a depth."""
+        key = (depth, damage)
+        stats = self._depth_stats.get(key)
+        if stats is None:
+            table = self.game.ore_sampler.table(depth)
+            wsum = float(sum(o["weight"] for o in table.items))
+            # overflow damage carries, so ores break at damage / mean hp per tick
+            per_tick = damage / mining.mean_hp(table)
+            rates = {}
+            for o in table.items:
+                rates[o["name"]] = rates.get(o["name"], 0.0) + o["weight"] / wsum * per_tick
+            value = sum(o["weight"] / wsum * per_tick * o["value"] for o in table.items)
+            stats = self._depth_stats[key] = (rates, value)
+        return stats
+
+    def eta(self, action):
+        """``(ticks until affordable, depth to mine at)``; ticks is None if unreachable."""
+        g = self.game
+        passive = idle.income_per_tick(g.rate, g.adminmultiplier, g.othermultiplier,
+                                       economy.ships_money_multiplier(g))
+        need_money = action.money_cost(g) - float(g.money)
+        need_ore = {n: a - g.ore_inventory.get(n, 0) for n, a in action.ore_costs().items()}
+        need_ore = {n: a for n, a in need_ore.items() if a > 0}
+        damage = self.mining_damage()
+        ore_mult = g.adminmultiplier * g.othermultiplier
+        best = None
+        best_depth = g.depth
+        depths = range(1, g.max_depth + 1) if damage > 0 else (g.depth,)
+        for d in depths:
+            if damage > 0:
+                rates, value = self.depth_stats(d, damage)
+            else:
+                rates, value = {}, 0.0
+            income = passive + value * ore_mult
+            if need_money <= 0:
+                t = 0.0
+            elif income > 0:
+                t = need_money / income
+            else:
+                continue
+            for name, short in need_ore.items():
+                r = rates.get(name, 0.0)
+                if r <= 0:
+                    t = None
+                    break
+                t = max(t, short / r)
+            if t is not None and (best is None or t < best):
+                best, best_depth = t, d
+        if best is None:
+            return None, g.depth
+        return int(math.ceil(best - 1e-9)), best_depth
+
+    def advance(self, ticks):
+        """Skip ``ticks`` of play in closed form (income plus mining)."""
+        g = self.game
+        extra = self.mining_damage() - g.auto_mine_damage
+        g.auto_mine_damage += extra
+        try:
+            idle.catch_up(g, ticks * TICK_SECONDS)
+        finally:
+            g.auto_mine_damage -= extra
+        self.ticks += ticks
+
+    def set_depth(self, depth):
+        g = self.game
+        if depth != g.depth:
+            g.depth = depth
+            mining.spawn_new_ore(g)
+
+    def idle_out(self):
+        """Nothing left to buy: play the rest of the time limit as one idle stretch."""
+        if self.ticks < self.limit:
+            self.advance(self.limit - self.ticks)
+        self._check_milestones()
+
+    def _check_milestones(self):
+        for name, reached in MILESTONES:
+            if name not in self.milestones and reached(self.game):
+                self.milestones[name] = self.ticks * TICK_SECONDS
+
+    def run(self):
+        """Play until every milestone is hit or time is up; once the policy has
+        nothing it can buy, the rest of the time limit is idled out."""
+        g = self.game
+        if g.current_ore is None:
+            mining.spawn_new_ore(g)
+        purchases = 0
+        reason = "time limit"
+        self._check_milestones()
+        while self.ticks < self.limit:
+            if len(self.milestones) == len(MILESTONES):
+                reason = "all milestones"
+                break
+            action = self.policy.choose(self)
+            if action is None:
+                reason = "policy finished"
+                self.idle_out()
+                break
+            wait, depth = self.eta(action)
+            if wait is None:
+                reason = f"stalled on {action!r}"
+                self.idle_out()
+                break
+            self.set_depth(depth)
+            if wait > 0:
+                # the ore estimate can be an ore short, so re-plan after each jump
+                self.advance(min(wait, self.limit - self.ticks))
+            elif action.perform(self.front):
+                purchases += 1
+                self.policy.bought(action)
+            else:
+                # affordable on paper but refused by the frontend: don't retry forever
+                self.policy.rejected(action)
+                self.advance(1)
+            self._check_milestones()
+        return purchases, reason
+
+
+def run(frontend="main2", policy=None, clicks_per_second=5.0, max_hours=1000.0, seed=0):
+    """Load ``frontend`` fresh, play it and return a ``SimReport``."""
+    random.seed(seed)
+    front = load_frontend(frontend)
+    if policy is None:
+        policy = GreedyPolicy()
+    sim = Simulation(front, policy, clicks_per_second, max_hours)
+    start = time.perf_counter()
+    purchases, reason = sim.run()
+    wall = time.perf_counter() - start
+    name = type(policy).__name__.replace("Policy", "").lower()
+    return SimReport(frontend, name, dict(sim.milestones), sim.ticks * TICK_SECONDS, purchases, wall, reason)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dysnesia.sim", description=__doc__.split("\n")[0])
+    parser.add_argument("--frontend", default="main2", help="main2, admin or a path to a frontend script")
+    parser.add_argument("--policy", default="greedy", help="'greedy' or a JSON file of scripted steps")
+    parser.add_argument("--clicks", type=float, default=5.0, help="manual mining clicks per second")
+    parser.add_argument("--hours", type=float, default=1000.0, help="simulated time limit in hours")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--expect", action="append", default=[], metavar="MILESTONE=HOURS",
+                        help="fail (exit 1) unless MILESTONE is reached within HOURS")
+    args = parser.parse_args(argv)
+    expect = []
+    names = [name for name, _ in MILESTONES]
+    for spec in args.expect:
+        name, _, hours = spec.partition("=")
+        if name not in names:
+            parser.error(f"unknown milestone {name!r} in --expect (one of {', '.join(names)})")
+        try:
+            expect.append((name, float(hours)))
+        except ValueError:
+            parser.error(f"--expect {spec!r}: HOURS must be a number")
+
+    policy = GreedyPolicy() if args.policy == "greedy" else ScriptedPolicy.from_file(args.policy)
+    report = run(args.frontend, policy, args.clicks, args.hours, args.seed)
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.format())
+
+    failed = []
+    for name, hours in expect:
+        t = report.milestones.get(name)
+        if t is None or t > hours * 3600:
+            failed.append(f"{name} not reached within {hours:g}h")
+    for msg in failed:
+        print(f"FAIL: {msg}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""The game-state model: every field a game carries and its starting value.
+
+A game is a ``GameState``: a ``__slots__`` object with exactly the fields
+below, so a misspelt field is an AttributeError instead of a silent new
+global, attribute access skips the instance dict, and ``copy()`` is cheap
+enough to snapshot a game for saves and simulations. ``new_game()`` makes
+one with its own copies of the data tables, so several games can live in
+one process. Plug-in layers (``dysnesia.admin``) adjust the result.
+"""
+import itertools
+
+from dysnesia import combat, effects, keymap, ores, rng, tables
+from dysnesia.money import Money
+
+# plain fields and their starting values
+DEFAULTS = {
+    # --- progression ---
+    "world": 1,
+    "page": 0,
+    # exact fixed point (see dysnesia.money)
+    "money": Money(0),
+    "rate": 1,
+    "adminmultiplier": 10,
+    "othermultiplier": 1.0,
+    "w1upgrades": 0,
+    "player_level": 1,
+    "research_page_unlocked": False,
+    "technology_page_unlocked": False,
+    "mining_page_unlocked": False,
+    # order size for city / black hole upgrades: 1, 10, 100 or "max"
+    "buy_mode": 1,
+    # --- black hole ---
+    "blackhole_page_unlocked": False,
+    "blackhole_page_first_visit": False,
+    "blackhole_growth": 0,
+    "blackhole_upgrades_count": 0,
+    "ships_count": 0,
+    "blackhole_unlock_cost": 5000000000,
+    "admin_ore_granted_msg": "",
+    # --- sanity ---
+    "sanity_points": 0,
+    # 0=city upgrades, 1=research, 2=mining, 3=black hole
+    "sanity_stage": 0,
+    # sent to World 2 and waiting for the return to rotate the stage
+    "awaiting_cycle_return": False,
+    "cycle_return_applied": False,
+    "last_send_cause": None,
+    "last_send_depth": None,
+    # --- mining ---
+    "current_ore": None,
+    "ore_hp": 100,
+    "ore_max_hp": 100,
+    "ore_damage": 10,
+    "auto_mine_damage": 0,
+    "auto_miner_count": 0,
+    "depth": 1,
+    "max_depth": 1,
+    # --- combat ---
+    "combat_started": False,
+    "player_hp": 100,
+    "player_max_hp": 100,
+    "enemy_hp": 80,
+    "enemy_max_hp": 80,
+    "player_heals": 3,
+    "player_ability_charges": 1,
+    "current_enemy_name": None,
+    "current_enemy_region": None,
+    # World 2 regions cleared since the last return
+    "consecutive_defeats": 0,
+    # (columns, rows above, rows below) of padding around map labels
+    "zone_padding": (2, 0, 0),
+    # new on every map_art change (see set_map_art); caches of the map key on it
+    "map_art_version": 0,
+    # next line of the Forgotten Sanctum dialogue (admin rules)
+    "forgotten_sanctum_dialogue_index": 0,
+    # when true, effect messages are not printed
+    "quiet_effects": False,
+}
+
+# tables, collections and helpers set up by init()
+CONTAINER_FIELDS = (
+    "ore_inventory", "sanity_awarded",
+    "upgrades", "research", "technology", "blackhole_upgrades",
+    "ore_types", "ore_sampler", "map_art", "region_enemy_map",
+    "dungeon_progression_order", "defeated_regions", "killed_monsters",
+    "combat_log", "combat_rules", "keymap", "rng",
+)
+# shared between copies: read-only data and stateless helpers
+SHARED_FIELDS = frozenset(("ore_types", "ore_sampler", "combat_rules", "current_ore"))
+
+
+class GameState:
+    """Every field of one game; see ``DEFAULTS`` and ``CONTAINER_FIELDS``."""
+
+    __slots__ = tuple(DEFAULTS) + CONTAINER_FIELDS
+
+    def copy(self):
+        """An independent snapshot: tables, dicts, sets and lists are copied,
+        read-only data (``SHARED_FIELDS``) is shared."""
+        new = GameState.__new__(GameState)
+        for name in GameState.__slots__:
+            value = getattr(self, name)
+            if name not in SHARED_FIELDS:
+                if isinstance(value, list):
+                    value = [dict(e) if isinstance(e, dict) else e for e in value]
+                elif isinstance(value, (dict, set)):
+                    value = value.copy()
+            setattr(new, name, value)
+        # the key index points at entries, so it follows the copied tables
+        new.keymap = keymap.KeyMap(new)
+        new.rng = self.rng.copy()
+        return new
+
+    __copy__ = copy
+
+    def __repr__(self):
+        return f"<GameState world={self.world} money={self.money!r} depth={self.depth}>"
+
+
+# map_art versions are never reused, not even across games
+_map_versions = itertools.count(1)
+
+
+def set_map_art(game, lines):
+    """Replace ``game.map_art`` (or, with the same list, mark an in-place
+    edit) and give it a new ``map_art_version``."""
+    game.map_art = lines
+    game.map_art_version = next(_map_versions)
+
+
+def new_game(seed=None, **tables_override):
+    """A fresh ``GameState``; see ``init()`` for the arguments."""
+    return init(GameState(), seed, **tables_override)
+
+
+def init(game, seed=None, **tables_override):
+    """Reset ``game`` to a new game and return it.
+
+    Keyword arguments replace whole tables (``upgrades=``, ``research=``,
+    ``technology=``, ``ore_types=``, ...) before the effects are
+    validated; a frontend with its own balance passes its tables here.
+    ``seed`` seeds the game's random streams (see ``dysnesia.rng``).
+    """
+    for name, value in DEFAULTS.items():
+        setattr(game, name, value)
+    game.ore_inventory = dict.fromkeys(tables.ORE_NAMES, 0)
+    game.sanity_awarded = dict(tables.SANITY_AWARDED)
+    game.upgrades = tables.fresh(tables.UPGRADES)
+    game.research = tables.fresh(tables.RESEARCH)
+    game.technology = tables.fresh(tables.TECHNOLOGY)
+    game.blackhole_upgrades = tables.fresh(tables.BLACKHOLE_UPGRADES)
+    # read-only; rebuild the sampler after swapping it
+    game.ore_types = tables.ORE_TYPES
+    game.map_art = list(tables.MAP_ART)
+    game.region_enemy_map = tables.region_enemy_map()
+    game.dungeon_progression_order = list(tables.DUNGEON_PROGRESSION_ORDER)
+    game.defeated_regions = set()
+    game.killed_monsters = []
+    game.combat_log = []
+    game.combat_rules = combat.Rules()
+    game.rng = rng.RNG(seed)
+    for name, value in tables_override.items():
+        setattr(game, name, value)
+    set_map_art(game, game.map_art)
+    game.ore_sampler = ores.OreSampler(game.ore_types)
+    game.keymap = keymap.KeyMap(game)
+    validate(game)
+    return game
+
+
+def validate(game):
+    """Check every table's effects against ``game``; raises ValueError."""
+    for name in ("upgrades", "research", "technology", "blackhole_upgrades"):
+        effects.validate_table(getattr(game, name), game, name)
@@ -0,0 +1,442 @@
+"""Canonical data tables shared by every frontend.
+
+These are templates: a game gets its own mutable copies through
+``fresh()`` (see ``dysnesia.state``), so purchases never write back into
+the module-level tables and several games can run in one process.
+Frontends and plug-in layers (``dysnesia.admin``) adjust their copies
+after ``state.new_game()`` rather than editing the tables here.
+"""
+from dysnesia import effects
+
+
+def fresh(table):
+    """Mutable copy of a list-of-dicts table (one level deep)."""
+    return [dict(e) for e in table]
+
+
+def normalize(label):
+    """Region key of a map label: ``"MIRROR MARSH"`` -> ``"mirror_marsh"``."""
+    return label.lower().replace(" ", "_")
+
+
+def region_enemy_map(labels=None, custom=None):
+    """Region key -> enemy name, with ``enemy_a``, ``enemy_b``, ... for unnamed regions."""
+    labels = CLICK_LABELS if labels is None else labels
+    custom = CUSTOM_ENEMY_NAMES if custom is None else custom
+    out = {}
+    for i, lbl in enumerate(labels):
+        norm = normalize(lbl)
+        if norm in custom:
+            out[norm] = custom[norm]
+        else:
+            # a letter sequence (a, b, c, ...), wrapping after 'z'
+            out[norm] = f"enemy_{chr(ord('a') + (i % 26))}"
+    return out
+
+
+# --- SANITY ---
+# the player sees a 0-200 bar
+SANITY_TARGET = 200
+# points a normal purchase gives while its page is the active sanity stage
+SANITY_INCREMENTS = {
+    'city': 4,
+    'research': 12,
+    'technology': 8,
+    'blackhole': 20,
+}
+# one-off milestone awards
+SANITY_EVENT_AMOUNTS = {
+    'mine_half': 25,
+    'bh_unlock': 40,
+    'bh_finish': 80,
+}
+# one weight per sanity stage: 0=city, 1=research, 2=mining, 3=black hole
+SANITY_WEIGHTS = [1, 1, 2, 1]
+# which one-off events have been awarded
+SANITY_AWARDED = {
+    'research_unlock': False,
+    'tech_unlock': False,
+    'mine_half': False,
+    'bh_unlock': False,
+    'bh_finish': False,
+    'post_depth3_return': False,
+}
+
+# --- CITY UPGRADES ---
+UPGRADES = [
+    {"key": "a", "name": "Hire Worker", "rate_inc": 1, "base_cost": 10,
+     "cost": 10, "multiplier": 1.15, "count": 0, "max": 100, "seen": False},
+    {"key": "s", "name": "Hire Manager", "rate_inc": 10, "base_cost": 100,
+     "cost": 100, "multiplier": 1.15, "count": 0, "max": 75, "seen": False},
+    {"key": "d", "name": "Hire Senior Manager", "rate_inc": 100,
+     "base_cost": 1000, "cost": 1000, "multiplier": 1.15, "count": 0, "max": 50, "seen": False},
+    {"key": "f", "name": "Upgrade Hardware", "rate_inc": 10000,
+     "base_cost": 10000, "cost": 10000, "multiplier": 1.15, "count": 0, "max": 30, "seen": False},
+    {"key": "g", "name": "Unlock Research", "rate_inc": 0,
+     "base_cost": 1000000, "cost": 1000000, "multiplier": 0, "count": 0, "seen": False, "max": 1,
+     "effect": effects.set_flag("research_page_unlocked")},
+]
+
+# --- RESEARCH ---
+RESEARCH = [
+    {"key": "1", "name": "Quantum Processors",
+     "cost": 500000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 1.5)},
+    {"key": "2", "name": "Nanofabrication Labs",
+     "cost": 2000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 2.5)},
+     {"key": "3", "name": "Adaptive AI Networks",
+     "cost": 6000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 3)},
+    {"key": "4", "name": "Fusion Power Cells",
+     "cost": 30000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 3.5)},
+    {"key": "5", "name": "Smart Infrastructure",
+     "cost": 150000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 4)},
+    {"key": "6", "name": "Synthetic Bio-Alloys",
+     "cost": 500000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 5)},
+    {"key": "7", "name": "Interlinked Drone Swarms",
+     "cost": 2000000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 10)},
+    {"key": "8", "name": "Neural Cloud Integration",
+     "cost": 40000000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 15)},
+    {"key": "9", "name": "Cryogenic Superconductors",
+     "cost": 120000000000, "purchased": False,
+     "effect": effects.mul("othermultiplier", 20)},
+    {"key": "0", "name": "Unlock Technology",
+     "cost": 1000000000000, "purchased": False,
+     "effect": effects.set_flag("technology_page_unlocked")},
+]
+
+# --- ORES ---
+# ore inventory slots, in display order
+ORE_NAMES = (
+    "stone",
+    "coal",
+    "iron",
+    "copper",
+    "silver",
+    "gold",
+    "emerald",
+    "ruby",
+    "diamond",
+    "mythril",
+    "adamantite",
+    "orichalcum",
+    "orichalcum_shard",  # Depth 5 only; required to unlock Black Hole
+)
+
+ORE_TYPES = {
+    1: [
+        {"name": "stone", "color": "░", "hp": 50, "value": 1, "weight": 50},
+        {"name": "coal", "color": "▓", "hp": 75, "value": 3, "weight": 30},
+        {"name": "copper", "color": "▒", "hp": 100, "value": 5, "weight": 20},
+    ],
+    2: [
+        {"name": "coal", "color": "▓", "hp": 75, "value": 3, "weight": 30},
+        {"name": "copper", "color": "▒", "hp": 100, "value": 5, "weight": 25},
+        {"name": "iron", "color": "▓", "hp": 150, "value": 10, "weight": 25},
+        {"name": "silver", "color": "░", "hp": 200, "value": 20, "weight": 20},
+    ],
+    3: [
+        {"name": "iron", "color": "▓", "hp": 150, "value": 10, "weight": 30},
+        {"name": "silver", "color": "░", "hp": 200, "value": 20, "weight": 25},
+        {"name": "gold", "color": "█", "hp": 300, "value": 50, "weight": 25},
+        {"name": "emerald", "color": "◆", "hp": 400, "value": 100, "weight": 20},
+    ],
+    4: [
+        {"name": "gold", "color": "█", "hp": 300, "value": 50, "weight": 30},
+        {"name": "emerald", "color": "◆", "hp": 400, "value": 100, "weight": 25},
+        {"name": "ruby", "color": "♦", "hp": 500, "value": 200, "weight": 25},
+        {"name": "diamond", "color": "◊", "hp": 750, "value": 500, "weight": 20},
+    ],
+    5: [
+        {"name": "diamond", "color": "◊", "hp": 750, "value": 500, "weight": 30},
+        {"name": "mythril", "color": "▲", "hp": 1000, "value": 1000, "weight": 25},
+        {"name": "adamantite", "color": "■", "hp": 1500, "value": 2000, "weight": 20},
+        {"name": "orichalcum", "color": "★", "hp": 2500, "value": 5000, "weight": 15},
+        {"name": "orichalcum_shard", "color": "✶", "hp": 3000, "value": 7500, "weight": 10},
+    ],
+}
+
+# --- TECHNOLOGY / MINING ---
+TECHNOLOGY = [
+    # Tier 1 - Basic tools
+    {"key": "1", "name": "Stone Pickaxe", "ore_costs": {}, "money_cost": 0, 
+     "damage": 15, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 15), "unlocks": ["2", "3"], "desc": "+15 damage"},
+    
+    {"key": "2", "name": "Iron Pickaxe", "ore_costs": {"stone": 3}, "money_cost": 100000, 
+     "damage": 25, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 25), "unlocks": ["4", "5"], "desc": "+25 damage"},
+    
+    {"key": "3", "name": "Hire First Miner", "ore_costs": {"stone": 5, "coal": 3}, "money_cost": 50000, 
+     "damage": 0, "auto_damage": 5, "depth_unlock": 0, "purchased": False,
+     "effect": (effects.add("auto_mine_damage", 5), effects.add("auto_miner_count", 1)), "unlocks": ["6"], "desc": "+5 auto damage"},
+    
+    # Tier 2 - Unlock Depth 2
+    {"key": "4", "name": "Deeper Shaft", "ore_costs": {"coal": 5, "copper": 2}, "money_cost": 500000, 
+     "damage": 0, "auto_damage": 0, "depth_unlock": 2, "purchased": False,
+     "effect": effects.at_least("max_depth", 2), "unlocks": ["7", "8"], "desc": "Unlock Depth 2"},
+    
+    {"key": "5", "name": "Steel Pickaxe", "ore_costs": {"copper": 5, "iron": 2}, "money_cost": 750000, 
+     "damage": 50, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 50), "unlocks": ["9"], "desc": "+50 damage"},
+    
+    {"key": "6", "name": "Mining Team", "ore_costs": {"coal": 10, "copper": 5}, "money_cost": 1000000, 
+    "damage": 0, "auto_damage": 15, "depth_unlock": 0, "purchased": False,
+    "effect": (effects.add("auto_mine_damage", 15), effects.add("auto_miner_count", 3)), "unlocks": ["0"], "desc": "+15 auto damage"},
+        
+    # Tier 3 - Unlock Depth 3
+    {"key": "7", "name": "Reinforced Shaft", "ore_costs": {"iron": 10, "silver": 5}, "money_cost": 5000000, 
+     "damage": 0, "auto_damage": 0, "depth_unlock": 3, "purchased": False,
+     "effect": effects.at_least("max_depth", 3), "unlocks": ["q", "w"], "desc": "Unlock Depth 3"},
+    
+    {"key": "8", "name": "Diamond Drill", "ore_costs": {"iron": 12, "silver": 8}, "money_cost": 10000000, 
+     "damage": 100, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 100), "unlocks": ["e"], "desc": "+100 damage"},
+    
+    {"key": "9", "name": "Titanium Pickaxe", "ore_costs": {"silver": 10}, "money_cost": 7500000, 
+     "damage": 75, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 75), "unlocks": ["e"], "desc": "+75 damage"},
+    
+    {"key": "0", "name": "Mining Crew", "ore_costs": {"iron": 15, "silver": 10}, "money_cost": 15000000, 
+     "damage": 0, "auto_damage": 30, "depth_unlock": 0, "purchased": False,
+     "effect": (effects.add("auto_mine_damage", 30), effects.add("auto_miner_count", 5)), "unlocks": ["r"], "desc": "+30 auto damage"},
+    
+    # Tier 4 - Unlock Depth 4
+    {"key": "w", "name": "Deep Mining Shaft", "ore_costs": {"gold": 8, "emerald": 5}, "money_cost": 50000000, 
+     "damage": 0, "auto_damage": 0, "depth_unlock": 4, "purchased": False,
+     "effect": effects.at_least("max_depth", 4), "unlocks": ["t", "y"], "desc": "Unlock Depth 4"},
+    
+    {"key": "e", "name": "Laser Drill", "ore_costs": {"gold": 10, "emerald": 6}, "money_cost": 75000000, 
+     "damage": 200, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 200), "unlocks": ["u"], "desc": "+200 damage"},
+    
+    {"key": "t", "name": "Mithril Pickaxe", "ore_costs": {"gold": 12, "emerald": 8}, "money_cost": 100000000, 
+     "damage": 150, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 150), "unlocks": ["u"], "desc": "+150 damage"},
+    
+    {"key": "y", "name": "Mining Operation", "ore_costs": {"gold": 15, "emerald": 10}, "money_cost": 125000000, 
+     "damage": 0, "auto_damage": 50, "depth_unlock": 0, "purchased": False,
+     "effect": (effects.add("auto_mine_damage", 50), effects.add("auto_miner_count", 10)), "unlocks": ["i"], "desc": "+50 auto damage"},
+    
+    # Tier 5 - Unlock Depth 5
+    {"key": "u", "name": "Ancient Depths", "ore_costs": {"ruby": 10, "diamond": 8}, "money_cost": 500000000, 
+     "damage": 0, "auto_damage": 0, "depth_unlock": 5, "purchased": False,
+     "effect": effects.at_least("max_depth", 5), "unlocks": ["o", "p"], "desc": "Unlock Depth 5"},
+    
+    {"key": "i", "name": "Plasma Cutter", "ore_costs": {"ruby": 12, "diamond": 10}, "money_cost": 750000000, 
+     "damage": 400, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 400), "unlocks": ["o"], "desc": "+400 damage"},
+    
+    {"key": "o", "name": "Quantum Drill", "ore_costs": {"diamond": 15}, "money_cost": 1000000000, 
+     "damage": 300, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 300), "unlocks": ["o"], "desc": "+300 damage"},
+    
+    {"key": "p", "name": "Industrial Complex", "ore_costs": {"ruby": 20, "diamond": 12}, "money_cost": 2000000000, 
+     "damage": 0, "auto_damage": 100, "depth_unlock": 0, "purchased": False,
+     "effect": (effects.add("auto_mine_damage", 100), effects.add("auto_miner_count", 20)), "unlocks": ["p"], "desc": "+100 auto damage"},
+    
+    # Final upgrades
+    {"key": "[", "name": "Nano-Excavator", "ore_costs": {"mythril": 25, "adamantite": 15}, "money_cost": 5000000000, 
+     "damage": 1000, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.add("ore_damage", 1000), "unlocks": [], "desc": "+1000 damage"},
+    
+    {"key": "]", "name": "Unlock Next World", "ore_costs": {"mythril": 50, "adamantite": 30, "orichalcum": 25}, "money_cost": 25000000000, 
+     "damage": 0, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
+     "effect": effects.message("Next world unlocked!"), "unlocks": [], "desc": "???"},
+]
+
+# --- BLACK HOLE ---
+# each level bought applies ``effect`` once
+BLACKHOLE_UPGRADES = [
+    {"key": "z", "name": "Siphon Matter", "desc": "+50 rate", "base_cost": 5000000000000, "cost": 5000000000000, "multiplier": 1.35, "count": 0, "max": 20, "seen": False,
+     "effect": effects.add("rate", 50)},
+    {"key": "x", "name": "Event Horizon", "desc": "+2 ships", "base_cost": 25000000000000, "cost": 25000000000000, "multiplier": 1.6, "count": 0, "max": 10, "seen": False,
+     "effect": effects.add("ships_count", 2)},
+    {"key": "c", "name": "Singularity Core", "desc": "+50% other mult", "base_cost": 10000000000000, "cost": 10000000000000, "multiplier": 1.5, "count": 0, "max": 6, "seen": False,
+     "effect": effects.mul("othermultiplier", 1.5)},
+    {"key": "v", "name": "Accretion Ring", "desc": "Grow size", "base_cost": 250000000000000, "cost": 250000000000000, "multiplier": 1.35, "count": 0, "max": 8, "seen": False,
+     "effect": effects.add("blackhole_growth", 1)},
+    {"key": "s", "name": "Orbital Dockyards", "desc": "+1 ship", "base_cost": 1000000000000000, "cost": 1000000000000000, "multiplier": 1.5, "count": 0, "max": 50, "seen": False,
+     "effect": effects.add("ships_count", 1)},
+    {"key": "n", "name": "Break The Reality", "desc": "Break the reality", "base_cost": 10000000000000000, "cost": 10000000000000000, "multiplier": 0, "count": 0, "max": 1, "seen": False,
+     "effect": effects.set_flag("research_page_unlocked")},
+]
+
+# --- WORLD 2: MAP ---
+MAP_ART = [
+"                                   N",
+"                                   ^",
+"                                   |",
+"                           ~ ~ ~ ~ | ~ ~ ~ ~ ~     ",
+"         WHISPERING PINES     ~ ~  |  ~ ~         /\\        ",
+"         /\\   /\\    /\\      ~ ~ ~  |    /\\   /  \\    /\\ ",
+"       /  \\ /  \\  /  \\  ~ ~ ~ ~ ~  |   /  \\_/    \\__/  \\",
+"      /    \\/    \\/    \\           |  /                  \\",
+"     /    FOREST TRAIL    \\         | /   SILENT GRAVEYARD \\",
+"    /                      \\        |/    ╔══════════════╗  \\",
+"   /________________________\\       /\\    ║  XX X XXX  X ║   \\",
+"                             \\     /  \\   ║   X XX    X   ║    \\",
+"                              \\   /    \\  ║ XX X XXX X X  ║     \\",
+"                               \\ /      \\ ╚══════════════╝      \\",
+"                                |                    \\            \\",
+"                                |                     \\            \\",
+"                                |      HOLLOWED        \\            \\",
+"                                |       FARMLANDS       |=========|",
+"                                |       _____   ___     |   ||    |",
+"                                |______/     \\_/   \\____|   ||    |",
+"                                   | (//////////)       |   ||    |",
+"                                   |                     |   ||    |",
+"                                   |         SUNKEN      |   ||    |",
+"                                   |       MARKETPLACE   |   ||    |",
+"                 OLD RESIDENTIAL  |   ~~~~~~   ~~~~~~   |   ||    |",
+"                     DISTRICT     |  / shops \\ / stalls\\ |   ||    |",
+"               +----+   +----+    |                          ||    |",
+"               |H01 |---|H02 |    |--------------------------||----|",
+"               +----+   +----+    |                          ||",
+"                 |            alleys         |                ||",
+"                 |                            \\              ||",
+"                 |                             \\             ||",
+"                 |            MIRROR MARSH      \\            ||",
+"                /             ~~~~~~~~~~~~       \\           ||",
+"             ~~~   *&^%#$@$!C%!$*@*#*%&@  ~~~      \\          ||",
+"                \\__________________________________\\         ||",
+"                                 |                            ||",
+"                                 |    OBSIDIAN QUARRY         ||",
+"                                 |   █████  █████  ████       ||",
+"                                 |  █████  █████  ████        ||",
+"                                 |____________________________||",
+"                                                 |",
+"                                                 |",
+"                                      FORGOTTEN SANCTUM",
+"                                          ▓▓▓▓▓▓▓▓▓▓▓",
+"                                         ▓           ▓",
+"                                         ▓           ▓",
+"                                         ▓           ▓",
+"                                          ▓▓▓▓▓▓▓▓▓▓▓",
+"                                                 ",
+"                           (To Elysea after defeating Terivon)",
+]
+
+CLICK_LABELS = (
+    "WHISPERING PINES",
+    "HOLLOWED FARMLANDS",
+    "CRUMBLING OVERPASS",
+    "SUNKEN MARKETPLACE",
+    "MIRROR MARSH",
+    "OBSIDIAN QUARRY",
+    "OLD RESIDENTIAL DISTRICT",         # label spans two lines: "OLD RESIDENTIAL" + "DISTRICT"
+    "FORGOTTEN SANCTUM",
+    "SILENT GRAVEYARD",
+)
+
+# Hand-placed click zones (screen rows for a map printed from row 4) for
+# the labels the scanner can't box well; they replace the scanned zone.
+ZONE_OVERRIDES = {
+    "sunken_marketplace": {
+        "row_start": 26,
+        "row_end": 27,
+        "col_start": max(1, 25 - 3 + 20),
+        "col_end": min(200, 26 + 8 + 20),
+    },
+    "hollowed_farmlands": {
+        "row_start": 20,
+        "row_end": 21,
+        "col_start": max(1, 19 - 3 + 21),
+        "col_end": min(200, 20 + 8 + 21),
+    },
+    # two-line label; generous column range so clicks hit either line
+    "old_residential_district": {
+        "row_start": 28,
+        "row_end": 29,
+        "col_start": max(1, 15 - 4 + 7),
+        "col_end": min(200, 15 + 20),
+    },
+}
+
+DUNGEON_PROGRESSION_ORDER = [
+    'whispering_pines',
+    'silent_graveyard',
+    'hollowed_farmlands',
+    'sunken_marketplace',
+    'old_residential_district',
+    'mirror_marsh',
+    'obsidian_quarry',
+    'forgotten_sanctum'
+]
+
+# --- WORLD 2: ENEMIES ---
+MONSTER_NAMES = [
+    "Adam", "Boreal Wisp", "Cinderhound", "Dreadling", "Elder Faun",
+    "Fangrat", "Gloomrot", "Hollow Stalker", "Ironclad Beetle",
+    "Jaded Lurker", "Kelvin", "Lurking Shade", "Mire Serpent",
+    "Nether Imp", "Oaken Brute", "Pestilent Rat", "Quarry Golem",
+    "Ravaged Soldier", "Sable Wolf", "Terivon", "Umber Bat",
+    "Vicious Spriggan", "Wretched Ghoul", "Xylophant", "Yawning Horror",
+    "Zereth"
+]
+
+CUSTOM_ENEMY_NAMES = {
+    'whispering_pines': 'Shrouded Wanderer',
+    'silent_graveyard': 'Fading Crawler',
+    'hollowed_farmlands': 'Bent Wraith',
+    'sunken_marketplace': 'Drifting Mannequin',
+    'old_residential_district': 'Hallway Watcher',
+    'mirror_marsh': 'Refracted Shade',
+    # forgotten_sanctum will display a dynamic error-like name (None means dynamic)
+    'forgotten_sanctum': None,
+    'obsidian_quarry': 'Crystalline Husk',
+}
+
+# region -> (left, right) art
+ENEMY_ASCII = {
+    'whispering_pines': (
+        ["   .--.", "  /../ ", " (  : )", "  | ||", "   --- "],
+        ["  .--.  ", " (    ) ", "  ( : )>", "   --- ", "  /___ "]
+    ),
+    'silent_graveyard': (
+        ["   .-.", "  (   )", " ( : ) ", "  /|/", "  /  "],
+        ["  ._.", " (o o)", "  -_- ", "  /|/", "  /  "]
+    ),
+    'hollowed_farmlands': (
+        ["   /  ", "  /   ", " (    )", "  |  |", "  /__ "],
+        ["   ~~  ", " (.. )", "  ( : )>", "  /  ", "  /___ "]
+    ),
+    'sunken_marketplace': (
+        ["  [====]", "  |::..|", "  |:.. |", "   /   ", "  /____"],
+        ["  _____ ", " (_____)", "  ( : )>", "  /   ", "  /___ "]
+    ),
+    'old_residential_district': (
+        ["  |--|", " [____]", "  (..)", "  /|/", "  /__ "],
+        ["  /_/_ ", " ( o.o )", "  ( : ) ", "  /   ", "  /___ "]
+    ),
+    'mirror_marsh': (
+        ["   ~~~", "  ~o~ ", " (  : )", "  /   ", " /____"],
+        ["  ~~~  ", " ~o~   ", "  ( : )>", "  /   ", " /____" ]
+    ),
+    'forgotten_sanctum': (
+        # normal human ASCII art for the Forgotten Sanctum enemy
+        ["   O", "  /|/", "  /  ", "", ""],
+        ["   O", "  /|/", "  /  ", "", ""]
+    ),
+}
+
+# (player, enemy) art for regions missing from ENEMY_ASCII
+DEFAULT_ASCII = (
+    ["  (o_o)", "  (•_•)", " <( : ) ", "   -  ", "  /___ "],
+    ["  (._.)", " ( o.o )", "  ( : )> ", "   -  ", "  /___ "]
+)
+
+# the player's side of every fight
+PLAYER_ASCII = [
+    "  (\\_/)",
+    "  (•_•)",
+    " <( : ) ",
+    "  /   \\",
+    "  /___\\",
+]
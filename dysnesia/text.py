@@ -0,0 +1,80 @@
+"""Terminal display width of strings, shared by every renderer.
+
+Wide (East Asian ``W``/``F``) characters take two columns and combining
+marks none. Pure ASCII strings -- nearly every line the game draws --
+skip the Unicode tables entirely, and everything else is memoized, so
+redrawing the same map or planet art costs a dict lookup per line.
+"""
+import functools
+import unicodedata
+
+# distinct non-ASCII strings remembered by display_width()
+WIDTH_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=1024)
+def char_width(ch):
+    """Columns one character occupies: 0, 1 or 2."""
+    if unicodedata.combining(ch):
+        return 0
+    if unicodedata.east_asian_width(ch) in ("W", "F"):
+        return 2
+    return 1
+
+
+@functools.lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def _wide_width(s):
+    return sum(char_width(ch) for ch in s)
+
+
+def cache_clear():
+    """Forget every memoized width (cold benchmarks)."""
+    char_width.cache_clear()
+    _wide_width.cache_clear()
+
+
+def display_width(s):
+    """Columns ``s`` occupies in a terminal."""
+    if s.isascii():
+        return len(s)
+    return _wide_width(s)
+
+
+def truncate(s, width):
+    """Longest prefix of ``s`` that fits in ``width`` columns."""
+    if s.isascii():
+        return s[:width]
+    if _wide_width(s) <= width:
+        return s
+    used = 0
+    for i, ch in enumerate(s):
+        used += char_width(ch)
+        if used > width:
+            return s[:i]
+    return s
+
+
+def fit(s, width):
+    """``s`` truncated and space-padded to exactly ``width`` columns."""
+    s = truncate(s, width)
+    return s + " " * (width - display_width(s))
+
+
+def wrap(s, width):
+    """Split ``s`` into rows of at most ``width`` columns, as a terminal would."""
+    if display_width(s) <= width:
+        return [s]
+    if s.isascii():
+        return [s[i:i + width] for i in range(0, len(s), width)]
+    rows = []
+    start = 0
+    used = 0
+    for i, ch in enumerate(s):
+        w = char_width(ch)
+        if used + w > width:
+            rows.append(s[start:i])
+            start = i
+            used = 0
+        used += w
+    rows.append(s[start:])
+    return rows
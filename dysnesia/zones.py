@@ -0,0 +1,185 @@
+"""Click zones for the World 2 map.
+
+``make_absolute_zones()`` boxes every map label in screen coordinates. It
+scans every map line for every label (plus a
+two-line lookahead), which is far too much work to repeat each time the
+map opens. ``ZoneCache`` runs it once per version of the map art and keeps
+the result as a ``ZoneIndex``; placing the zones for a different top row
+is then a constant row offset, and scrolling is handled at hit-test time.
+
+Clicks are resolved through a row-bucketed grid (map row -> per-column
+zone names), so a hit test is two lookups no matter how many labelled
+regions the map grows to.
+"""
+from dysnesia.text import display_width
+
+
+def normalize(label):
+    return label.lower().replace(" ", "_")
+
+
+def locate_labels(map_lines, labels):
+    """Locate each label in ``map_lines`` (the last line it appears on wins).
+
+    Returns ``{region: (row, start_char, first_len, second_len, col)}``
+    with 1-based ``row`` and display column ``col``; a label wrapped onto
+    the next line has ``first_len`` characters on ``row`` and
+    ``second_len`` on the line after.
+    """
+    found = {}
+    n = len(map_lines)
+    for i, line in enumerate(map_lines, start=1):
+        upper = line.upper()
+        next_line = map_lines[i] if i < n else None
+        combined = None
+        for label in labels:
+            norm = normalize(label)
+            if label in upper:
+                start = upper.index(label)
+                found[norm] = (i, start, len(label), 0, display_width(line[:start]) + 1)
+                continue
+            if next_line is None:
+                continue
+            # a label wrapped across this line and the next
+            if combined is None:
+                combined = (line + " " + next_line).upper()
+            if label not in combined:
+                continue
+            idx = combined.index(label)
+            if idx < len(line):
+                first = min(len(line) - idx, len(label))
+                found[norm] = (i, idx, first, max(0, len(label) - first), display_width(line[:idx]) + 1)
+            else:
+                start = idx - (len(line) + 1)
+                found[norm] = (i + 1, start, 0, min(len(next_line) - start, len(label)),
+                               display_width(next_line[:start]) + 1)
+    return found
+
+
+def make_absolute_zones(map_lines, map_top_row, labels, padding=(2, 0, 0), overrides=None):
+    """Clickable rectangles for every label found in ``map_lines``.
+
+    The map's first line is printed at screen row ``map_top_row``.
+    ``padding`` is (columns, rows above, rows below) added around each
+    label; ``overrides`` maps regions to hand-placed zones that replace
+    the scanned ones.
+    """
+    pad_col, pad_top, pad_bottom = padding
+    out = {}
+    for name, (r, start, first_len, second_len, col) in locate_labels(map_lines, labels).items():
+        # display width of the label, possibly across two lines
+        width = 0
+        if first_len > 0:
+            width += display_width(map_lines[r - 1][start:start + first_len])
+        if second_len > 0 and r < len(map_lines):
+            width += display_width(map_lines[r][:second_len])
+        if width == 0:
+            width = 6
+        row = map_top_row + r - 1
+        out[name] = {
+            "row_start": row - pad_top,
+            # a label spilling onto the next line takes that row too
+            "row_end": row + 1 - pad_top if second_len > 0 else row + pad_bottom,
+            "col_start": max(1, col - pad_col),
+            "col_end": col + width - 1 + pad_col,
+        }
+    if overrides:
+        for name, zone in overrides.items():
+            out[name] = dict(zone)
+    return out
+
+
+def shift(zones, rows):
+    """Copy of ``zones`` moved down by ``rows`` screen rows."""
+    if not rows:
+        return zones
+    return {
+        name: {
+            "row_start": z["row_start"] + rows,
+            "row_end": z["row_end"] + rows,
+            "col_start": z["col_start"],
+            "col_end": z["col_end"],
+        }
+        for name, z in zones.items()
+    }
+
+
+class ZoneIndex:
+    """Click zones of one map version, laid out for a map printed from ``base_top_row``."""
+
+    def __init__(self, zones, base_top_row):
+        self.zones = zones
+        self.base_top_row = base_top_row
+        # map top row -> zones shifted for it
+        self._screen = {base_top_row: zones}
+        # row -> list indexed by column of the zone name covering that cell
+        self._grid = self._build_grid(zones)
+
+    @staticmethod
+    def _build_grid(zones):
+        grid = {}
+        # paint in reverse so that, where zones overlap, the first one in
+        # the dict wins -- the same answer as a linear scan
+        for name, z in reversed(list(zones.items())):
+            c0 = max(1, z["col_start"])
+            c1 = z["col_end"]
+            if c1 < c0:
+                continue
+            for row in range(z["row_start"], z["row_end"] + 1):
+                cells = grid.get(row)
+                if cells is None:
+                    cells = grid[row] = []
+                if len(cells) <= c1:
+                    cells.extend([None] * (c1 + 1 - len(cells)))
+                for col in range(c0, c1 + 1):
+                    cells[col] = name
+        return grid
+
+    def hit(self, row, col, map_top_row=None, scroll=0):
+        """Zone under screen cell (``row``, ``col``), both 1-based.
+
+        ``map_top_row`` is where the map's first line is printed and
+        ``scroll`` how many map lines are scrolled off the top. Returns
+        ``(name, zone)`` with the zone in screen rows for ``map_top_row``
+        (unscrolled, like ``screen_zones()``), or None.
+        """
+        if map_top_row is None:
+            map_top_row = self.base_top_row
+        cells = self._grid.get(row + scroll - (map_top_row - self.base_top_row))
+        if cells is None or not 0 <= col < len(cells):
+            return None
+        name = cells[col]
+        if name is None:
+            return None
+        return name, self.screen_zones(map_top_row)[name]
+
+    def screen_zones(self, map_top_row):
+        """Zones in screen rows (1-based) for a map whose first line is at ``map_top_row``."""
+        zones = self._screen.get(map_top_row)
+        if zones is None:
+            zones = self._screen[map_top_row] = shift(self.zones, map_top_row - self.base_top_row)
+        return zones
+
+
+class ZoneCache:
+    """Builds the ``ZoneIndex`` for a map once per map version.
+
+    ``build(map_lines, top_row)`` is the zone builder, e.g.
+    ``make_absolute_zones``. The version is ``game.map_art_version``, which
+    ``state.set_map_art()`` renews on every change to the map.
+    """
+
+    def __init__(self, build, base_top_row=1):
+        self._build = build
+        self.base_top_row = base_top_row
+        self._key = None
+        self._index = None
+
+    def get(self, map_lines, version):
+        if self._index is None or version != self._key:
+            self._index = ZoneIndex(self._build(map_lines, self.base_top_row), self.base_top_row)
+            self._key = version
+        return self._index
+
+    def invalidate(self):
+        self._index = None
@@ -1,9 +1,18 @@
+import contextlib
+import io
 import os
 import sys
 import time
-import select
-import random
-import unicodedata
+import shutil
+import tempfile
+from dysnesia import city, combat, economy, glitch, idle, keymap, mining, planet, replay, save, state, tables, zones
+from dysnesia.tables import SANITY_TARGET, SANITY_INCREMENTS, SANITY_EVENT_AMOUNTS, SANITY_WEIGHTS
+from dysnesia.clock import SimClock, FramePacer
+from dysnesia.profiler import Profiler
+from dysnesia.reactor import InputReactor, wait_ms
+from dysnesia.screen import ConsoleScreen
+from dysnesia.text import char_width, display_width, fit
+from dysnesia.money import format_money
 try:
     import curses
     HAVE_CURSES = True
@@ -32,65 +41,24 @@ locale.setlocale(locale.LC_ALL, '')
 
 # --- CROSS-PLATFORM get_char ---
 USING_WINDOWS = sys.platform == "win32"
-if USING_WINDOWS:
-    import msvcrt
-
-    def get_char():
-        if msvcrt.kbhit():
-            ch = msvcrt.getch()
-            try:
-                return ch.decode()
-            except Exception:
-                return None
-        return None
-else:
+if not USING_WINDOWS:
     import termios
     import tty
 
-    def get_char():
-        dr, _, _ = select.select([sys.stdin], [], [], 0)
-        if dr:
-            return sys.stdin.read(1)
-        return None
+# all console keyboard input goes through one reactor, which can also block
+# until a key arrives (see pace_frame)
+input_reactor = InputReactor()
+
+def get_char():
+    return input_reactor.read_char()
 
 def flush_stdin(timeout=0.01):
     """Drain any pending bytes from stdin to avoid leftover escape sequences."""
     try:
-        if USING_WINDOWS:
-            # drain msvcrt buffer
-            import msvcrt
-            start = time.time()
-            while time.time() - start < timeout:
-                if not msvcrt.kbhit():
-                    break
-                try:
-                    msvcrt.getch()
-                except Exception:
-                    break
-        else:
-            while True:
-                dr, _, _ = select.select([sys.stdin], [], [], timeout)
-                if not dr:
-                    break
-                # read and discard
-                try:
-                    sys.stdin.read(1024)
-                except Exception:
-                    break
+        input_reactor.drain(timeout)
     except Exception:
         pass
 
-def display_width(s):
-    w = 0
-    for ch in s:
-        if unicodedata.combining(ch):
-            continue
-        if unicodedata.east_asian_width(ch) in ("W", "F"):
-            w += 2
-        else:
-            w += 1
-    return w
-
 # record last printed map top row so mouse clicks can be interpreted correctly
 map_last_top_row = 1
 # toggle on-screen zone debug markers
@@ -108,9 +76,8 @@ def get_cursor_position(timeout=0.05):
         resp = ''
         start = time.time()
         while time.time() - start < timeout:
-            dr, _, _ = select.select([sys.stdin], [], [], timeout)
-            if dr:
-                c = sys.stdin.read(1)
+            c = input_reactor.read_char(timeout)
+            if c:
                 resp += c
                 if c == 'R':
                     break
@@ -126,15 +93,15 @@ def get_cursor_position(timeout=0.05):
 
 # --- Curses helpers for reduced-flicker rendering ---
 def sanitize_for_curses(s):
+    if s.isascii():
+        return s
     out = []
     for ch in s:
         try:
-            if unicodedata.combining(ch):
+            w = char_width(ch)
+            if w == 0:
                 continue
-            if unicodedata.east_asian_width(ch) in ("W", "F"):
-                out.append('?')
-            else:
-                out.append(ch)
+            out.append('?' if w == 2 else ch)
         except Exception:
             out.append('?')
     return ''.join(out)
@@ -215,12 +182,12 @@ def render_line(win, y, text):
         return
     if y < 0 or y >= maxy:
         return
-    # create a padded version so we clear any leftover characters from previous content
-    line = text[:maxx-1]
+    # create a padded version (in display columns) so we clear any leftover
+    # characters from previous content
     try:
-        line_padded = line.ljust(maxx-1)
+        line_padded = fit(text, maxx-1)
     except Exception:
-        line_padded = line
+        line_padded = text[:maxx-1]
     last = getattr(win, '_last_screen', None)
     if last is None:
         try:
@@ -250,360 +217,202 @@ def present_frame(win):
             pass
 
 
-def research_view():
-    """Handle the research page: only redraw when money increases or research bought."""
-    global money, timea, page, world, research_needs_update, last_money_for_research
-    # initial render
-    need_render = True
-    if last_money_for_research is None:
-        need_render = True
-
-    while world == 1 and page == 1:
-        if need_render:
-            clear()
-            if not research_page_unlocked:
-                print("Research not unlocked yet.")
-            else:
-                print(f"Money: {money:.2f}\n")
-                print("=== RESEARCH ===\n")
-                draw_research_tree()
-                for res in research:
-                    st = "— COMPLETED" if res["purchased"] else f"| Cost: ${res['cost']}"
-                    print(f"[{res['key']}] {res['name']} {st}")
-            if research_page_unlocked:
-                print("\nPress [R] to switch pages.")
-            last_money_for_research = money
-            research_needs_update = False
-            need_render = False
-
-        # handle input and money ticks locally so we don't redraw unnecessarily
-        key = get_key()
-        timea += 0.1
-        if timea >= 1:
-            money += rate * adminmultiplier * othermultiplier
-            timea = 0.0
-            research_needs_update = True
-
-        if key:
-            k = key.lower()
-            if k == 'k':
-                if world == 1:
-                    glitch_transition()
-                    world = 2
-            elif k == 'q':
-                # ignore 'q' — do not quit the game
-                pass
-            elif k == 'r' and research_page_unlocked:
-                page = 0
-                return
-            else:
-                for r in research:
-                    if k == r["key"]:
-                        buy_research(r)
-                        research_needs_update = True
-                        need_render = True
-                        break
-
-        # decide if we need to re-render due to money change or purchases
-        if research_needs_update or (last_money_for_research is not None and money > last_money_for_research):
-            need_render = True
-
-        time.sleep(0.1)
-
-
 def kill_list_view():
     """Render the World 4 kill list once and only re-render when it changes.
     Blocks until the user presses [K] to go back to the map or [Q] to quit."""
-    global world, killed_monsters
     last_snapshot = None
     need_render = True
-    while world == 4:
+    while GAME.world == 4:
+        frame_profiler.enter("kill_list")
         if need_render:
             clear()
             print("=== KILL LIST ===\n")
             print("Monsters killed:\n")
-            if killed_monsters:
-                for i, name in enumerate(killed_monsters, start=1):
+            if GAME.killed_monsters:
+                for i, name in enumerate(GAME.killed_monsters, start=1):
                     print(f"{i}. {name}")
             else:
                 print("[No kills yet]\n")
             print("\nPress [K] to go back to Map.")
-            last_snapshot = list(killed_monsters)
+            last_snapshot = list(GAME.killed_monsters)
+            print_profile_overlay()
             need_render = False
 
         key = get_key()
+        run_simulation()
+        frame_profiler.begin("input")
         if key:
             k = key.lower()
             if k == 'k':
-                world = 2
+                GAME.world = 2
+                frame_profiler.end("input")
                 return
             elif k == 'q':
                 # ignore 'q' — do not quit
                 pass
 
         # Re-render if the kill list changed while viewing
-        if killed_monsters != last_snapshot:
+        if GAME.killed_monsters != last_snapshot:
             need_render = True
+        frame_profiler.end("input")
 
-        time.sleep(0.1)
-
-
-def home_view():
-    """Render World 1 main city/upgrades page only when state changes."""
-    global money, timea, page, world, w1upgrades
-    last_money = None
-    last_upgrades = None
-    need_render = True
-
-    while world == 1 and page == 0:
-        if need_render:
-            clear()
-            print(f"Money: {money:.2f}\n")
-            update_building_heights(w1upgrades)
-            draw_city()
-
-            print("\n=== UPGRADES ===")
-            any_seen = False
-            for upg in upgrades:
-                if money >= upg["cost"] * 0.1:
-                    upg["seen"] = True
-                if upg["seen"]:
-                    any_seen = True
-                    status = (
-                        f"+{upg['rate_inc']}/sec | Cost: ${upg['cost']}"
-                        if upg["count"] < upg["max"] else "MAXED"
-                    )
-                    print(f"[{upg['key'].upper()}] {upg['name']} ({upg['count']}/{upg['max']}) {status}")
-            if not any_seen:
-                print("(No upgrades available yet...)")
-            if research_page_unlocked:
-                print("\nPress [R] to go to Research.")
-            if technology_page_unlocked:
-                print("Press [T] to go to Technology.")
-            sanity = 20 - w1upgrades
-            bar = int((sanity / 20) * length)
-            print("\n[" + "#" * bar + " " * (length - bar) + "]\n")
-
-            last_money = money
-            last_upgrades = w1upgrades
-            need_render = False
-
-        # update money timer (don't force redraw here; render only when value changed)
-        timea += 0.1
-        if timea >= 1:
-            money += rate * adminmultiplier * othermultiplier
-            timea = 0.0
+        pace_frame(idle=not need_render)
 
-        key = get_key()
-        if key:
-            k = key.lower()
-            if k == 'k':
-                world = 2
-                return
-            elif k == 'q':
-                # ignore 'q' — do not quit
-                pass
-            elif k == 'r' and research_page_unlocked:
-                page = 1
-                return
-            elif k == 't' and technology_page_unlocked:
-                page = 2
-                return
-            else:
-                for upg in upgrades:
-                    if k == upg["key"]:
-                        buy_upgrade(upg)
-                        need_render = True
-                        break
 
-        # re-render if money or upgrades changed externally
-        if money != last_money or w1upgrades != last_upgrades:
-            need_render = True
+# --- GAME STATE ---
+# every game field and table lives on this GameState (see dysnesia.state);
+# the functions below read and write it as GAME.<field>
+GAME = state.new_game()
+length = 40
 
-        time.sleep(0.1)
 
+def ships_money_multiplier():
+    """Return a multiplier for money based on ships_count. 5% per ship."""
+    return economy.ships_money_multiplier(GAME)
+
+
+# --- SIMULATION CLOCK ---
+# One monotonic fixed-timestep clock drives all income and auto-mining; the
+# page loops only render and pace their frames.
+sim_clock = SimClock()
+# the pacer's sleep returns early on a keypress
+frame_pacer = FramePacer(sleep=input_reactor.wait)
+# catch-ups longer than this many ticks are projected in closed form
+IDLE_BATCH_TICKS = 30
+
+# --- FRAME PROFILER ---
+# render / input / sim time per view; [`] toggles the overlay line and [~]
+# writes the percentiles to PROFILE_DUMP_PATH
+frame_profiler = Profiler()
+PROFILE_DUMP_PATH = os.path.join(tempfile.gettempdir(), "dysnesia_profile.txt")
+
+
+def profiler_key(key):
+    """Handle the profiler hotkeys (a character or curses key code). True if consumed."""
+    if isinstance(key, int):
+        key = chr(key) if 0 <= key < 0x110000 else ''
+    if key == '`':
+        frame_profiler.overlay = not frame_profiler.overlay
+        return True
+    if key == '~':
+        try:
+            frame_profiler.dump(PROFILE_DUMP_PATH)
+        except OSError:
+            pass
+        return True
+    return False
 
-def mining_view():
-    """Render mining page only when relevant state changes."""
-    global money, timea, page, world, current_ore, ore_hp, depth
-    last_money = None
-    last_ore_hp = None
-    last_depth = None
-    need_render = True
 
-    while world == 1 and page == 2:
-        if not technology_page_unlocked:
-            clear()
-            print("Mining not unlocked yet.")
-            print("\nPress [R] to return to City")
-            key = get_key()
-            if key and key.lower() == 'r':
-                page = 0
-                return
-            time.sleep(0.1)
-            continue
-
-        # time and auto-mining
-        timea += 0.1
-        if timea >= 1:
-            money += rate * adminmultiplier * othermultiplier
-            auto_mine_tick()
-            timea = 0.0
-            need_render = True
+def print_profile_overlay():
+    if frame_profiler.overlay:
+        print("\n" + frame_profiler.overlay_line())
 
-        if need_render:
-            clear()
-            # Left column
-            print(f"Money: ${money:.2f}")
-            print("")
-            if current_ore is None:
-                spawn_new_ore()
-            draw_mine_shaft()
-
-            # Right column: technology list
-            print("=== TECHNOLOGY ===")
-            available = []
-            for tech in technology:
-                if not tech.get("purchased"):
-                    available.append(tech)
-            if not available:
-                print("(None available)")
-            else:
-                for tech in available:
-                    ore_costs = " ".join(f"{n[:3]}:{a}" for n, a in tech.get("ore_costs", {}).items())
-                    print(f"[{tech['key'].upper()}] {tech['name']} - {ore_costs} | ${tech['money_cost']}")
 
-            last_money = money
-            last_ore_hp = ore_hp
-            last_depth = depth
-            need_render = False
+# profiler view names of the main loop's pages, by world and (World 1) page
+PAGE_VIEWS = {0: "city", 1: "research", 2: "mining", 3: "blackhole"}
+WORLD_VIEWS = {2: "map", 3: "combat", 4: "kill_list"}
 
-        key = get_key()
-        if key:
-            k = key.lower()
-            if k == ' ':
-                mine_ore()
-                need_render = True
-            elif k == 'k':
-                glitch_transition()
-                world = 2
-            elif k == 'q':
-                # ignore 'q' — do not quit
-                pass
-            elif k == 'z':
-                # ADMIN BUTTON (debug): give 50 of each ore when pressed in Mining
-                try:
-                    for ore_name in ore_inventory:
-                        ore_inventory[ore_name] += 50
-                    need_render = True
-                except Exception:
-                    pass
-            elif k == 'r':
-                page = 0
-                return
-            elif k in '12345':
-                new_depth = int(k)
-                if new_depth <= max_depth:
-                    depth = new_depth
-                    spawn_new_ore()
-                    # TRIGGER: When reaching depth 4, award sanity and send to World 2
-                    if depth == 4:
-                        try:
-                            award_sanity_event('depth_4_reach')
-                            try:
-                                trigger_send_to_world2('mining', depth)
-                            except Exception:
-                                trigger_send_to_world2('mining')
-                        except Exception:
-                            pass
-                    need_render = True
-            else:
-                for tech in technology:
-                    if k == tech["key"]:
-                        buy_technology(tech)
-                        need_render = True
-                        break
 
-        if money != last_money or ore_hp != last_ore_hp or depth != last_depth:
-            need_render = True
+def page_view():
+    """Profiler view name of what the main loop is about to show."""
+    if transition is not None:
+        return "transition"
+    if GAME.world == 1:
+        return PAGE_VIEWS.get(GAME.page, "city")
+    return WORLD_VIEWS.get(GAME.world, f"world{GAME.world}")
 
-        time.sleep(0.1)
 
-# --- GAME STATE ---
-world = 1
-timea = 0.0
-money = 0
-rate = 1
-adminmultiplier = 10
-othermultiplier = 1.0
-page = 0
-research_page_unlocked = False
-technology_page_unlocked = False
-w1upgrades = 0
-length = 40
-player_level = 1
+def sim_tick(n=1):
+    """Advance the economy by `n` simulation ticks (one second each) in one update.
 
-# --- BLACK HOLE / WORLD1 ALTERNATE PAGE ---
-# Locked by default; unlocked by completing mining end or admin button
-blackhole_page_unlocked = False
-blackhole_page_first_visit = False  # Track first BH page visit for sanity award
-admin_ore_granted_msg = ""  # Message to display when admin button is pressed
-blackhole_growth = 0
-blackhole_upgrades_count = 0
-ships_count = 0
-blackhole_unlock_cost = 5000000000
+    Income is linear and mining carries overflow damage, so n ticks are
+    exactly one tick with n times the income and damage.
+    """
+    GAME.money += n * GAME.rate * GAME.adminmultiplier * GAME.othermultiplier * ships_money_multiplier()
+    auto_mine_tick(n)
+
+
+def run_simulation():
+    """Run every simulation tick that has come due. Returns how many ran."""
+    with frame_profiler.section("sim"):
+        n = sim_clock.due()
+        if n > IDLE_BATCH_TICKS:
+            # long stall (curses view, resumed session): skip the
+            # tick-by-tick replay and apply the idle projection in one step
+            idle.catch_up(GAME, n * sim_clock.tick)
+            persist('catch_up')
+            return n
+        if n:
+            sim_tick(n)
+        global last_autosave_tick
+        if sim_clock.ticks - last_autosave_tick >= AUTOSAVE_TICKS:
+            last_autosave_tick = sim_clock.ticks
+            persist('tick')
+        return n
+
+
+def pace_frame(idle=False):
+    """Present the console frame, then wait for a key, the next frame or sim tick.
+
+    Pages with nothing animating pass ``idle=True`` and sleep until the next
+    sim tick or keypress instead of waking every frame.
+    """
+    console.present()
+    frame_profiler.end("render")
+    frame_pacer.wait(sim_clock, idle)
+
+
+# --- PERSISTENCE ---
+# snapshot + append-only journal; disk I/O happens on the save thread
+save_manager = save.SaveManager(slot="main")
+# journal money/ore progress at least this often (in sim ticks)
+AUTOSAVE_TICKS = 10
+last_autosave_tick = 0
+# seconds the "saving stopped" notice stays up; it is shown once
+SAVE_FAILED_NOTICE_SECONDS = 5.0
+save_failure_shown = False
+
+
+def persist(event):
+    """Journal whatever changed since the last record (never blocks on disk)."""
+    global save_failure_shown
+    if save_manager.failed is not None:
+        if not save_failure_shown:
+            save_failure_shown = True
+            show_notice(f"Saving stopped ({save_manager.failed.strerror or save_manager.failed}); "
+                        "progress from now on is not saved.", SAVE_FAILED_NOTICE_SECONDS)
+        return
+    try:
+        save_manager.record(event, save.capture(GAME))
+    except Exception:
+        pass
 
 
-def ships_money_multiplier():
-    """Return a multiplier for money based on ships_count. 5% per ship."""
+def load_game():
+    """Restore the last save and credit the time spent away. Returns True if a save was found."""
     try:
-        return 1.0 + ships_count * 0.05
+        data = save_manager.load()
     except Exception:
-        return 1.0
-
-# research rendering state
-last_money_for_research = None
-research_needs_update = True
+        data = None
+    if data:
+        save.restore(GAME, data)
+        spawn_new_ore()
+        try:
+            away = time.time() - float(save_manager.saved_at)
+            if away > 0:
+                idle.catch_up(GAME, away)
+        except Exception:
+            pass
+    try:
+        save_manager.start()
+    except Exception:
+        pass
+    sim_clock.reset()
+    return bool(data)
 
-# --- SANITY / PROGRESSION STATE ---
+# --- SANITY / PROGRESSION ---
 # Sanity accumulates from upgrades on a rotating active page. When full,
 # the player is sent to world 2. After returning, the active page rotates.
-sanity_points = 0
-# larger sanity scale (player sees a ~0-200 bar instead of tiny 0-5)
-SANITY_TARGET = 200
-# stages: 0=city upgrades,1=research,2=mining,3=blackhole final
-sanity_stage = 0
-# per-stage increments (how many points a normal purchase gives when that
-# page is the active sanity contributor)
-SANITY_INCREMENTS = {
-    'city': 4,
-    'research': 12,
-    'technology': 8,
-    'blackhole': 20,
-}
-# one-off event amounts (milestones)
-SANITY_EVENT_AMOUNTS = {
-    'mine_half': 25,
-    'bh_unlock': 40,
-    'bh_finish': 80,
-}
-SANITY_WEIGHTS = [1, 1, 2, 1]
-# when true we have sent player to world2 and await their return to rotate stage
-awaiting_cycle_return = False
-cycle_return_applied = False
-# remember what caused the send so we can pick the next active sanity stage
-last_send_cause = None
-# remember the depth at which we triggered the send (if applicable)
-last_send_depth = None
-# one-time sanity event awards to align progression milestones
-sanity_awarded = {
-    'research_unlock': False,
-    'tech_unlock': False,
-    'mine_half': False,
-    'bh_unlock': False,
-    'bh_finish': False,
-    'post_depth3_return': False,
-}
 
 
 def award_sanity_event(ev_key):
@@ -611,36 +420,34 @@ def award_sanity_event(ev_key):
 
     Events: 'research_unlock','tech_unlock','mine_half','bh_unlock','bh_finish'
     """
-    global sanity_awarded
-    if sanity_awarded.get(ev_key):
+    if GAME.sanity_awarded.get(ev_key):
         return
-    sanity_awarded[ev_key] = True
+    GAME.sanity_awarded[ev_key] = True
     try:
         # award different amounts for milestone events when defined
         amt = SANITY_EVENT_AMOUNTS.get(ev_key, 1) if 'SANITY_EVENT_AMOUNTS' in globals() else 1
         add_sanity(amt)
     except Exception:
         try:
-            global sanity_points
-            sanity_points += SANITY_EVENT_AMOUNTS.get(ev_key, 1) if 'SANITY_EVENT_AMOUNTS' in globals() else 1
+            GAME.sanity_points += SANITY_EVENT_AMOUNTS.get(ev_key, 1) if 'SANITY_EVENT_AMOUNTS' in globals() else 1
         except Exception:
             pass
 
 
 def add_sanity(amount=1):
     """Add sanity points and trigger world2 transition if full."""
-    global sanity_points, SANITY_TARGET
+    global SANITY_TARGET
     try:
-        sanity_points += int(amount)
+        GAME.sanity_points += int(amount)
     except Exception:
         try:
-            sanity_points += int(float(amount))
+            GAME.sanity_points += int(float(amount))
         except Exception:
-            sanity_points += 1
+            GAME.sanity_points += 1
     # cap at SANITY_TARGET, but do NOT auto-send to world2 here.
     # The player should be sent to World 2 only when explicitly unlocking Research.
-    if sanity_points >= SANITY_TARGET:
-        sanity_points = SANITY_TARGET
+    if GAME.sanity_points >= SANITY_TARGET:
+        GAME.sanity_points = SANITY_TARGET
 
 
 def trigger_send_to_world2(cause=None, depth=None):
@@ -651,593 +458,67 @@ def trigger_send_to_world2(cause=None, depth=None):
             (e.g. 'mining', 'research', 'blackhole'). Used to pick the
             next active sanity stage when the player returns.
     """
-    global world, awaiting_cycle_return, cycle_return_applied, last_send_cause
     try:
         glitch_transition()
-        world = 2
+        GAME.world = 2
     except Exception:
         pass
-    awaiting_cycle_return = True
-    cycle_return_applied = False
-    last_send_cause = cause
-    global last_send_depth
+    GAME.awaiting_cycle_return = True
+    GAME.cycle_return_applied = False
+    GAME.last_send_cause = cause
     try:
-        last_send_depth = int(depth) if depth is not None else None
+        GAME.last_send_depth = int(depth) if depth is not None else None
     except Exception:
-        last_send_depth = None
-
-# --- MINING STATE ---
-current_ore = None
-ore_hp = 100
-ore_max_hp = 100
-ore_damage = 10
-auto_mine_damage = 0
-depth = 1
-max_depth = 1
-
-# --- COMBAT STATE ---
-combat_started = False
-player_hp = 100
-player_max_hp = 100
-enemy_hp = 80
-enemy_max_hp = 80
-player_heals = 3
-combat_log = []
-player_ability_charges = 1
-
-# --- MONSTER / KILL LIST ---
-MONSTER_NAMES = [
-    "Adam", "Boreal Wisp", "Cinderhound", "Dreadling", "Elder Faun",
-    "Fangrat", "Gloomrot", "Hollow Stalker", "Ironclad Beetle",
-    "Jaded Lurker", "Kelvin", "Lurking Shade", "Mire Serpent",
-    "Nether Imp", "Oaken Brute", "Pestilent Rat", "Quarry Golem",
-    "Ravaged Soldier", "Sable Wolf", "Terivon", "Umber Bat",
-    "Vicious Spriggan", "Wretched Ghoul", "Xylophant", "Yawning Horror",
-    "Zereth"
-]
-killed_monsters = []
-current_enemy_name = None
-current_enemy_region = None
-
-# --- MAP ART (UPDATED MAP WITH GRAVEYARD NEAR TOP) ---
-map_art = [
-"                                   N",
-"                                   ^",
-"                                   |",
-"                           ~ ~ ~ ~ | ~ ~ ~ ~ ~     ",
-"         WHISPERING PINES     ~ ~  |  ~ ~         /\\        ",
-"         /\\   /\\    /\\      ~ ~ ~  |    /\\   /  \\    /\\ ",
-"       /  \\ /  \\  /  \\  ~ ~ ~ ~ ~  |   /  \\_/    \\__/  \\",
-"      /    \\/    \\/    \\           |  /                  \\",
-"     /    FOREST TRAIL    \\         | /   SILENT GRAVEYARD \\",
-"    /                      \\        |/    ╔══════════════╗  \\",
-"   /________________________\\       /\\    ║  XX X XXX  X ║   \\",
-"                             \\     /  \\   ║   X XX    X   ║    \\",
-"                              \\   /    \\  ║ XX X XXX X X  ║     \\",
-"                               \\ /      \\ ╚══════════════╝      \\",
-"                                |                    \\            \\",
-"                                |                     \\            \\",
-"                                |      HOLLOWED        \\            \\",
-"                                |       FARMLANDS       |=========|",
-"                                |       _____   ___     |   ||    |",
-"                                |______/     \\_/   \\____|   ||    |",
-"                                   | (//////////)       |   ||    |",
-"                                   |                     |   ||    |",
-"                                   |         SUNKEN      |   ||    |",
-"                                   |       MARKETPLACE   |   ||    |",
-"                 OLD RESIDENTIAL  |   ~~~~~~   ~~~~~~   |   ||    |",
-"                     DISTRICT     |  / shops \\ / stalls\\ |   ||    |",
-"               +----+   +----+    |                          ||    |",
-"               |H01 |---|H02 |    |--------------------------||----|",
-"               +----+   +----+    |                          ||",
-"                 |            alleys         |                ||",
-"                 |                            \\              ||",
-"                 |                             \\             ||",
-"                 |            MIRROR MARSH      \\            ||",
-"                /             ~~~~~~~~~~~~       \\           ||",
-"             ~~~   *&^%#$@$!C%!$*@*#*%&@  ~~~      \\          ||",
-"                \\__________________________________\\         ||",
-"                                 |                            ||",
-"                                 |    OBSIDIAN QUARRY         ||",
-"                                 |   █████  █████  ████       ||",
-"                                 |  █████  █████  ████        ||",
-"                                 |____________________________||",
-"                                                 |",
-"                                                 |",
-"                                      FORGOTTEN SANCTUM",
-"                                          ▓▓▓▓▓▓▓▓▓▓▓",
-"                                         ▓           ▓",
-"                                         ▓           ▓",
-"                                         ▓           ▓",
-"                                          ▓▓▓▓▓▓▓▓▓▓▓",
-"                                                 ",
-"                           (To Elysea after defeating Terivon)",
-]
-
-# clickable labels (all 8 locations + graveyard)
-click_labels = {
-    "WHISPERING PINES": [],
-    "HOLLOWED FARMLANDS": [],
-    "CRUMBLING OVERPASS": [],
-    "SUNKEN MARKETPLACE": [],
-    "MIRROR MARSH": [],
-    "OBSIDIAN QUARRY": [],
-    "OLD RESIDENTIAL DISTRICT": [],         # label spans two lines: "OLD RESIDENTIAL" + "DISTRICT"
-    "FORGOTTEN SANCTUM": [],
-    "SILENT GRAVEYARD": []
-}
-
-# assign one monster name per region (so each region has a set name)
-# Use sequential identifiers so you can edit them manually: enemy_a, enemy_b, ...
-region_enemy_map = {}
-# Explicit per-region names for important regions (editable)
-custom_names = {
-    'whispering_pines': 'Shrouded Wanderer',
-    'silent_graveyard': 'Fading Crawler',
-    'hollowed_farmlands': 'Bent Wraith',
-    'sunken_marketplace': 'Drifting Mannequin',
-    'old_residential_district': 'Hallway Watcher',
-    'mirror_marsh': 'Refracted Shade',
-    # forgotten_sanctum will display a dynamic error-like name (None means dynamic)
-    'forgotten_sanctum': None,
-    'obsidian_quarry': 'Crystalline Husk',
-}
-for i, lbl in enumerate(click_labels.keys()):
-    norm = lbl.lower().replace(" ", "_")
-    if norm in custom_names:
-        region_enemy_map[norm] = custom_names[norm]
-    else:
-        # generate a letter sequence (a, b, c, ...). Wrap after 'z' back to 'a'.
-        letter = chr(ord('a') + (i % 26))
-        region_enemy_map[norm] = f"enemy_{letter}"
-
-# track which regions have been defeated (so each enemy can only be killed once)
-defeated_regions = set()
-
-# Dungeon progression order (sequential unlock)
-dungeon_progression_order = [
-    'whispering_pines',
-    'silent_graveyard',
-    'hollowed_farmlands',
-    'sunken_marketplace',
-    'old_residential_district',
-    'mirror_marsh',
-    'obsidian_quarry',
-    'forgotten_sanctum'
-]
-
-# Track consecutive defeats for world switching (switch after every 2 defeats)
-consecutive_defeats = 0
-
+        GAME.last_send_depth = None
 
 def get_next_available_dungeon():
     """Return the normalized name of the next dungeon that can be entered based on progression."""
-    for region in dungeon_progression_order:
-        if region not in defeated_regions:
-            return region
-    return None  # All dungeons defeated
+    return combat.next_available_dungeon(GAME)
 
 def locate_labels_in_map(map_lines):
-    """
-    Finds the first occurrence of each label in the provided map_lines
-    and returns a dict mapping normalized names to (row_index_1based, col_index_1based).
-    """
-    def display_width(s):
-        w = 0
-        for ch in s:
-            if unicodedata.combining(ch):
-                continue
-            if unicodedata.east_asian_width(ch) in ("W", "F"):
-                w += 2
-            else:
-                w += 1
-        return w
-
-    labels_found = {}
-    keys = list(click_labels.keys())
-    for i, line in enumerate(map_lines, start=1):
-        upper = line.upper()
-        for key in keys:
-            norm = key.lower().replace(" ", "_")
-            # exact single-line match
-            if key == "OLD RESIDENTIAL":
-                target = "OLD RESIDENTIAL"
-            else:
-                target = key
-
-            if target in upper:
-                start_char = upper.index(target)
-                col = display_width(line[:start_char]) + 1
-                labels_found[norm] = (i, start_char, len(target), 0, col)
-                continue
-
-            # try to detect a label split across this line and the next (two-line labels)
-            # look ahead one line
-            if i < len(map_lines):
-                next_line = map_lines[i]
-                # build a combined string with a single space between lines to emulate wrapped label
-                combined = (line + " "+ next_line).upper()
-                if target in combined:
-                    # find index in combined and translate back to first/second line indices
-                    idx = combined.index(target)
-                    # if idx is before len(line), the start is on this line
-                    if idx < len(line):
-                        start_char = idx
-                        # determine how many chars are on the first line
-                        first_part = min(len(line) - start_char, len(target))
-                        second_part = max(0, len(target) - first_part)
-                        col = display_width(line[:start_char]) + 1
-                        labels_found[norm] = (i, start_char, first_part, second_part, col)
-                        continue
-                    else:
-                        # starts on next line; record as start on next line
-                        start_on_next = idx - (len(line) + 1)
-                        start_char = start_on_next
-                        first_part = 0
-                        second_part = min(len(next_line) - start_char, len(target))
-                        col = display_width(next_line[:start_char]) + 1
-                        labels_found[norm] = (i+1, start_char, first_part, second_part, col)
-                        continue
-
-    return labels_found
+    """Position of every clickable label in map_lines (see zones.locate_labels)."""
+    return zones.locate_labels(map_lines, tables.CLICK_LABELS)
 
 def make_absolute_zones(map_lines, map_top_row):
     """
     Given the map text lines and the top row where the map is printed,
     return clickable rectangular zones for each found label.
     """
-    labels = locate_labels_in_map(map_lines)
-    zones = {}
-    pad_col = 2
-    pad_row_top = 0
-    pad_row_bottom = 0
-    for name_key, data in labels.items():
-        # data can be (row, start_char_index, first_len, second_len, display_col)
-        if len(data) == 5:
-            r, start_char, first_len, second_len, display_col = data
-        elif len(data) == 4:
-            # older format: (row, start_char, key_char_len, display_col)
-            r, start_char, first_len, display_col = data
-            second_len = 0
-        else:
-            # fallback
-            r = data[0]
-            start_char = 0
-            first_len = 6
-            second_len = 0
-            display_col = 1
-
-        # compute display width of the label text, possibly across two lines
-        label_len = 0
-        line = map_lines[r-1]
-        if first_len > 0:
-            snippet = line[start_char:start_char+first_len]
-            label_len += display_width(snippet)
-        if second_len > 0 and r < len(map_lines):
-            next_line = map_lines[r]
-            snippet2 = next_line[0:second_len]
-            label_len += display_width(snippet2)
-        if label_len == 0:
-            label_len = 6
-
-        row_start = map_top_row + r - 1 - pad_row_top
-        row_end = map_top_row + r - 1 + pad_row_bottom
-        # if the label spills to the next line, extend row_end
-        if second_len > 0:
-            row_end = map_top_row + (r) - 1 + 1 - pad_row_top
-
-        zones[name_key] = {
-            "row_start": row_start,
-            "row_end":   row_end,
-            "col_start": max(1, display_col - pad_col),
-            "col_end":   display_col + label_len - 1 + pad_col,
-        }
-    # Hard overrides for known multi-line problematic labels (screen coords)
-    # Expand the columns a bit so clicks are easier to hit.
-    zones["sunken_marketplace"] = {
-        "row_start": 26,
-        "row_end": 27,
-        "col_start": max(1, 25 - 3 + 20),
-        "col_end": min(200, 26 + 8 + 20),
-    }
-    zones["hollowed_farmlands"] = {
-        "row_start": 20,
-        "row_end": 21,
-        "col_start": max(1, 19 - 3 + 21),
-        "col_end": min(200, 20 + 8 + 21),
-    }
-    # Hard override for OLD RESIDENTIAL DISTRICT (two-line label)
-    zones["old_residential_district"] = {
-        "row_start": 28,
-        "row_end": 29,
-        # generous column range to ensure clicks hit the multi-line label
-        "col_start": max(1, 15 - 4 + 7),
-        "col_end": min(200, 15 + 20),
-    }
-    return zones
-
-# --- UPGRADE DATA ---
-upgrades = [
-    {"key": "a", "name": "Hire Worker", "rate_inc": 1, "base_cost": 10,
-     "cost": 10, "multiplier": 1.15, "count": 0, "max": 100, "seen": False},
-    {"key": "s", "name": "Hire Manager", "rate_inc": 10, "base_cost": 100,
-     "cost": 100, "multiplier": 1.15, "count": 0, "max": 75, "seen": False},
-    {"key": "d", "name": "Hire Senior Manager", "rate_inc": 100,
-     "base_cost": 1000, "cost": 1000, "multiplier": 1.15, "count": 0, "max": 50, "seen": False},
-    {"key": "f", "name": "Upgrade Hardware", "rate_inc": 10000,
-     "base_cost": 10000, "cost": 10000, "multiplier": 1.15, "count": 0, "max": 30, "seen": False},
-    {"key": "g", "name": "Unlock Research", "rate_inc": 0,
-     "base_cost": 1000000, "cost": 1000000, "multiplier": 0, "count": 0, "seen": False, "max": 1,},
-]
-ore_inventory = {
-    "stone": 0,
-    "coal": 0,
-    "iron": 0,
-    "copper": 0,
-    "silver": 0,
-    "gold": 0,
-    "emerald": 0,
-    "ruby": 0,
-    "diamond": 0,
-    "mythril": 0,
-    "adamantite": 0,
-    "orichalcum": 0,
-    "orichalcum_shard": 0,  # Depth 5 only; required to unlock Black Hole
-}
-
-
-# --- RESEARCH DATA ---
-research = [
-    {"key": "1", "name": "Quantum Processors",
-     "cost": 500000, "purchased": False,
-     "effect": "othermultiplier *= 1.5"},
-    {"key": "2", "name": "Nanofabrication Labs",
-     "cost": 2000000, "purchased": False,
-     "effect": "othermultiplier *= 2.5"},
-     {"key": "3", "name": "Adaptive AI Networks",
-     "cost": 6000000, "purchased": False,
-     "effect": "othermultiplier *= 3"},
-    {"key": "4", "name": "Fusion Power Cells",
-     "cost": 30000000, "purchased": False,
-     "effect": "othermultiplier *= 3.5"},
-    {"key": "5", "name": "Smart Infrastructure",
-     "cost": 150000000, "purchased": False,
-     "effect": "othermultiplier *= 4"},
-    {"key": "6", "name": "Synthetic Bio-Alloys",
-     "cost": 500000000, "purchased": False,
-     "effect": "othermultiplier *= 5"},
-    {"key": "7", "name": "Interlinked Drone Swarms",
-     "cost": 2000000000, "purchased": False,
-     "effect": "othermultiplier *= 10"},
-    {"key": "8", "name": "Neural Cloud Integration",
-     "cost": 40000000000, "purchased": False,
-     "effect": "othermultiplier *= 15"},
-    {"key": "9", "name": "Cryogenic Superconductors",
-     "cost": 120000000000, "purchased": False,
-     "effect": "othermultiplier *= 20"},
-    {"key": "0", "name": "Unlock Technology",
-     "cost": 1000000000000, "purchased": False,
-     "effect": "technology_page_unlocked = True"},
-]
-
-
-# --- ORE TYPES BY DEPTH ---
-ore_types = {
-    1: [
-        {"name": "stone", "color": "░", "hp": 50, "value": 1, "weight": 50},
-        {"name": "coal", "color": "▓", "hp": 75, "value": 3, "weight": 30},
-        {"name": "copper", "color": "▒", "hp": 100, "value": 5, "weight": 20},
-    ],
-    2: [
-        {"name": "coal", "color": "▓", "hp": 75, "value": 3, "weight": 30},
-        {"name": "copper", "color": "▒", "hp": 100, "value": 5, "weight": 25},
-        {"name": "iron", "color": "▓", "hp": 150, "value": 10, "weight": 25},
-        {"name": "silver", "color": "░", "hp": 200, "value": 20, "weight": 20},
-    ],
-    3: [
-        {"name": "iron", "color": "▓", "hp": 150, "value": 10, "weight": 30},
-        {"name": "silver", "color": "░", "hp": 200, "value": 20, "weight": 25},
-        {"name": "gold", "color": "█", "hp": 300, "value": 50, "weight": 25},
-        {"name": "emerald", "color": "◆", "hp": 400, "value": 100, "weight": 20},
-    ],
-    4: [
-        {"name": "gold", "color": "█", "hp": 300, "value": 50, "weight": 30},
-        {"name": "emerald", "color": "◆", "hp": 400, "value": 100, "weight": 25},
-        {"name": "ruby", "color": "♦", "hp": 500, "value": 200, "weight": 25},
-        {"name": "diamond", "color": "◊", "hp": 750, "value": 500, "weight": 20},
-    ],
-    5: [
-        {"name": "diamond", "color": "◊", "hp": 750, "value": 500, "weight": 30},
-        {"name": "mythril", "color": "▲", "hp": 1000, "value": 1000, "weight": 25},
-        {"name": "adamantite", "color": "■", "hp": 1500, "value": 2000, "weight": 20},
-        {"name": "orichalcum", "color": "★", "hp": 2500, "value": 5000, "weight": 15},
-        {"name": "orichalcum_shard", "color": "✶", "hp": 3000, "value": 7500, "weight": 10},
-    ],
-}
-
-ENEMY_ASCII = {
-    'whispering_pines': (
-        ["   .--.", "  /../ ", " (  : )", "  | ||", "   --- "],
-        ["  .--.  ", " (    ) ", "  ( : )>", "   --- ", "  /___ "]
-    ),
-    'silent_graveyard': (
-        ["   .-.", "  (   )", " ( : ) ", "  /|/", "  /  "],
-        ["  ._.", " (o o)", "  -_- ", "  /|/", "  /  "]
-    ),
-    'hollowed_farmlands': (
-        ["   /  ", "  /   ", " (    )", "  |  |", "  /__ "],
-        ["   ~~  ", " (.. )", "  ( : )>", "  /  ", "  /___ "]
-    ),
-    'sunken_marketplace': (
-        ["  [====]", "  |::..|", "  |:.. |", "   /   ", "  /____"],
-        ["  _____ ", " (_____)", "  ( : )>", "  /   ", "  /___ "]
-    ),
-    'old_residential_district': (
-        ["  |--|", " [____]", "  (..)", "  /|/", "  /__ "],
-        ["  /_/_ ", " ( o.o )", "  ( : ) ", "  /   ", "  /___ "]
-    ),
-    'mirror_marsh': (
-        ["   ~~~", "  ~o~ ", " (  : )", "  /   ", " /____"],
-        ["  ~~~  ", " ~o~   ", "  ( : )>", "  /   ", " /____" ]
-    ),
-    'forgotten_sanctum': (
-        # normal human ASCII art for the Forgotten Sanctum enemy
-        ["   O", "  /|/", "  /  ", "", ""],
-        ["   O", "  /|/", "  /  ", "", ""]
-    ),
-}
+    return zones.make_absolute_zones(map_lines, map_top_row, tables.CLICK_LABELS,
+                                     GAME.zone_padding, tables.ZONE_OVERRIDES)
+
+# Click zones are built once per GAME.map_art_version: change the map only
+# through state.set_map_art(). The hard overrides in make_absolute_zones()
+# are screen rows for a map printed from row 4 (three header lines), so the
+# cache is laid out for that row.
+map_zone_cache = zones.ZoneCache(make_absolute_zones, base_top_row=4)
+
+# --- MINING ---
+# the ore tables and per-depth alias samplers are part of the game state
 
 def spawn_new_ore():
-    """Spawn a new ore based on current depth"""
-    global current_ore, ore_hp, ore_max_hp
-    
-    if depth not in ore_types:
-        depth_ores = ore_types[max(ore_types.keys())]
-    else:
-        depth_ores = ore_types[depth]
-    
-    # Weighted random selection
-    total_weight = sum(ore["weight"] for ore in depth_ores)
-    rand = random.randint(1, total_weight)
-    
-    current_weight = 0
-    for ore in depth_ores:
-        current_weight += ore["weight"]
-        if rand <= current_weight:
-            current_ore = ore.copy()
-            ore_max_hp = ore["hp"]
-            ore_hp = ore_max_hp
-            return
+    """Spawn a new ore based on current depth (shared read-only record, O(1))"""
+    mining.spawn_new_ore(GAME)
 
 def mine_ore():
     """Mine the current ore (manual click)"""
-    global ore_hp, ore_inventory, money
-    if current_ore is None:
-        spawn_new_ore()
-        return
-    
-    ore_hp -= ore_damage
-    if ore_hp <= 0:
-        # Ore destroyed - add to inventory and spawn new one
-        ore_inventory[current_ore["name"]] += 1
-        money += current_ore["value"] * adminmultiplier * othermultiplier
-        spawn_new_ore()
-
-def auto_mine_tick():
-    """Auto miners damage the ore"""
-    global ore_hp, ore_inventory, money, auto_mine_damage
-    if auto_mine_damage <= 0:
-        return
-    
-    if current_ore is None:
-        spawn_new_ore()
-        return
-    
-    ore_hp -= auto_mine_damage
-    if ore_hp <= 0:
-        ore_inventory[current_ore["name"]] += 1
-        money += current_ore["value"] * adminmultiplier * othermultiplier
-        spawn_new_ore()
-# --- TECHNOLOGY/MINING DATA ---
-# Ore inventory
-
-mining_page_unlocked = False
-auto_miner_count = 0
+    mining.mine_ore(GAME)
 
-technology = [
-    # Tier 1 - Basic tools
-    {"key": "1", "name": "Stone Pickaxe", "ore_costs": {}, "money_cost": 0, 
-     "damage": 15, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 15", "unlocks": ["2", "3"], "desc": "+15 damage"},
-    
-    {"key": "2", "name": "Iron Pickaxe", "ore_costs": {"stone": 3}, "money_cost": 100000, 
-     "damage": 25, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 25", "unlocks": ["4", "5"], "desc": "+25 damage"},
-    
-    {"key": "3", "name": "Hire First Miner", "ore_costs": {"stone": 5, "coal": 3}, "money_cost": 50000, 
-     "damage": 0, "auto_damage": 5, "depth_unlock": 0, "purchased": False,
-     "effect": "auto_mine_damage += 5; auto_miner_count += 1", "unlocks": ["6"], "desc": "+5 auto damage"},
-    
-    # Tier 2 - Unlock Depth 2
-    {"key": "4", "name": "Deeper Shaft", "ore_costs": {"coal": 5, "copper": 2}, "money_cost": 500000, 
-     "damage": 0, "auto_damage": 0, "depth_unlock": 2, "purchased": False,
-     "effect": "max_depth = max(max_depth, 2)", "unlocks": ["7", "8"], "desc": "Unlock Depth 2"},
-    
-    {"key": "5", "name": "Steel Pickaxe", "ore_costs": {"copper": 5, "iron": 2}, "money_cost": 750000, 
-     "damage": 50, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 50", "unlocks": ["9"], "desc": "+50 damage"},
-    
-    {"key": "6", "name": "Mining Team", "ore_costs": {"coal": 10, "copper": 5}, "money_cost": 1000000, 
-    "damage": 0, "auto_damage": 15, "depth_unlock": 0, "purchased": False,
-    "effect": "auto_mine_damage += 15; auto_miner_count += 3", "unlocks": ["0"], "desc": "+15 auto damage"},
-        
-    # Tier 3 - Unlock Depth 3
-    {"key": "7", "name": "Reinforced Shaft", "ore_costs": {"iron": 10, "silver": 5}, "money_cost": 5000000, 
-     "damage": 0, "auto_damage": 0, "depth_unlock": 3, "purchased": False,
-     "effect": "max_depth = max(max_depth, 3)", "unlocks": ["q", "w"], "desc": "Unlock Depth 3"},
-    
-    {"key": "8", "name": "Diamond Drill", "ore_costs": {"iron": 12, "silver": 8}, "money_cost": 10000000, 
-     "damage": 100, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 100", "unlocks": ["e"], "desc": "+100 damage"},
-    
-    {"key": "9", "name": "Titanium Pickaxe", "ore_costs": {"silver": 10}, "money_cost": 7500000, 
-     "damage": 75, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 75", "unlocks": ["e"], "desc": "+75 damage"},
-    
-    {"key": "0", "name": "Mining Crew", "ore_costs": {"iron": 15, "silver": 10}, "money_cost": 15000000, 
-     "damage": 0, "auto_damage": 30, "depth_unlock": 0, "purchased": False,
-     "effect": "auto_mine_damage += 30; auto_miner_count += 5", "unlocks": ["r"], "desc": "+30 auto damage"},
-    
-    # Tier 4 - Unlock Depth 4
-    {"key": "w", "name": "Deep Mining Shaft", "ore_costs": {"gold": 8, "emerald": 5}, "money_cost": 50000000, 
-     "damage": 0, "auto_damage": 0, "depth_unlock": 4, "purchased": False,
-     "effect": "max_depth = max(max_depth, 4)", "unlocks": ["t", "y"], "desc": "Unlock Depth 4"},
-    
-    {"key": "e", "name": "Laser Drill", "ore_costs": {"gold": 10, "emerald": 6}, "money_cost": 75000000, 
-     "damage": 200, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 200", "unlocks": ["u"], "desc": "+200 damage"},
-    
-    {"key": "t", "name": "Mithril Pickaxe", "ore_costs": {"gold": 12, "emerald": 8}, "money_cost": 100000000, 
-     "damage": 150, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 150", "unlocks": ["u"], "desc": "+150 damage"},
-    
-    {"key": "y", "name": "Mining Operation", "ore_costs": {"gold": 15, "emerald": 10}, "money_cost": 125000000, 
-     "damage": 0, "auto_damage": 50, "depth_unlock": 0, "purchased": False,
-     "effect": "auto_mine_damage += 50; auto_miner_count += 10", "unlocks": ["i"], "desc": "+50 auto damage"},
-    
-    # Tier 5 - Unlock Depth 5
-    {"key": "u", "name": "Ancient Depths", "ore_costs": {"ruby": 10, "diamond": 8}, "money_cost": 500000000, 
-     "damage": 0, "auto_damage": 0, "depth_unlock": 5, "purchased": False,
-     "effect": "max_depth = max(max_depth, 5)", "unlocks": ["o", "p"], "desc": "Unlock Depth 5"},
-    
-    {"key": "i", "name": "Plasma Cutter", "ore_costs": {"ruby": 12, "diamond": 10}, "money_cost": 750000000, 
-     "damage": 400, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 400", "unlocks": ["o"], "desc": "+400 damage"},
-    
-    {"key": "o", "name": "Quantum Drill", "ore_costs": {"diamond": 15}, "money_cost": 1000000000, 
-     "damage": 300, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 300", "unlocks": ["o"], "desc": "+300 damage"},
-    
-    {"key": "p", "name": "Industrial Complex", "ore_costs": {"ruby": 20, "diamond": 12}, "money_cost": 2000000000, 
-     "damage": 0, "auto_damage": 100, "depth_unlock": 0, "purchased": False,
-     "effect": "auto_mine_damage += 100; auto_miner_count += 20", "unlocks": ["p"], "desc": "+100 auto damage"},
-    
-    # Final upgrades
-    {"key": "[", "name": "Nano-Excavator", "ore_costs": {"mythril": 25, "adamantite": 15}, "money_cost": 5000000000, 
-     "damage": 1000, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "ore_damage += 1000", "unlocks": [], "desc": "+1000 damage"},
-    
-    {"key": "]", "name": "Unlock Next World", "ore_costs": {"mythril": 50, "adamantite": 30, "orichalcum": 25}, "money_cost": 25000000000, 
-     "damage": 0, "auto_damage": 0, "depth_unlock": 0, "purchased": False,
-     "effect": "print('Next world unlocked!')", "unlocks": [], "desc": "???"},
-]
+def auto_mine_tick(ticks=1):
+    """Auto miners damage the ore for `ticks` ticks; overflow carries into the next ores"""
+    mining.auto_mine_tick(GAME, ticks)
 
 
 # --- CITY DATA ---
 city_buildings = []
+# rendered skyline rows are reused until a building's height changes
+city_skyline = city.Skyline(width=100, max_height=15, spacing=1)
+city_clouds = None
+# w1upgrades the building heights were last computed for (None = stale)
+city_heights_for = None
 
 def generate_city_layout():
-    global city_buildings
+    global city_buildings, city_clouds, city_heights_for
     num_buildings = 25
     types = [
         {"name": "house",      "roof": "▲", "body": "▓"},
@@ -1254,174 +535,58 @@ def generate_city_layout():
     city_buildings = []
     for i in range(num_buildings):
         width = 1 + (mid - abs(i - mid)) // 2
-        b_type = random.choice(types)
-        offset = random.randint(0, 2)
+        b_type = GAME.rng.city.choice(types)
+        offset = GAME.rng.city.randint(0, 2)
         city_buildings.append({
             "width": width, "type": b_type, "base": 1, "height": 1,
             "pos": i, "mid_offset": abs(i - mid), "rand_offset": offset
         })
+    city_skyline.clear()
+    city_clouds = city.CloudStrip(width=100, rand=GAME.rng.city.random)
+    city_heights_for = None
 
 def update_building_heights(upgrades_count):
+    global city_heights_for
+    if upgrades_count == city_heights_for:
+        return
+    city_heights_for = upgrades_count
     max_height = 15
     for b in city_buildings:
         pyramid_height = int(upgrades_count / 2 / (b["mid_offset"] + 1)) + 1
         b["height"] = min(max_height, pyramid_height + b["rand_offset"])
 
 def draw_city():
+    global city_clouds
     width = 100
-    max_height = 15
-    spacing = 1
-    cloud_line = "".join("☁" if random.random() > 0.85 else " " for _ in range(width))
-    print(cloud_line + "\n")
-    for y in reversed(range(max_height)):
-        line = ""
-        for b in city_buildings:
-            b_height = b["height"]
-            b_width = b["width"]
-            b_type = b["type"]
-            if y < b_height:
-                line += (b_type["roof"] if y == b_height - 1 else b_type["body"]) * b_width
-            else:
-                line += " " * b_width
-            line += " " * spacing
-        print(line.center(width))
+    if city_clouds is None:
+        city_clouds = city.CloudStrip(width=width, rand=GAME.rng.city.random)
+    print(city_clouds.next() + "\n")
+    for line in city_skyline.lines(city_buildings):
+        print(line)
     print("_" * width)
 
-
 # --- BLACK HOLE PAGE: art, upgrades, helpers ---
 def generate_planet_art(size, ships):
     """Generate a stylized planet with orbiting ships.
-    `size` controls planet radius; `ships` is number of ships on orbit."""
-    import math
-    art_lines = []
-    planet_radius = 2 + size
-    height = planet_radius * 2 + 1
-    width = planet_radius * 4 + 1
-    cx = width // 2
-    cy = height // 2
-
-    # create blank canvas
-    canvas = [[" "] * width for _ in range(height)]
-
-    # draw planet (filled circle)
-    for y in range(height):
-        for x in range(width):
-            dx = (x - cx) / 2.0
-            dy = y - cy
-            dist = math.hypot(dx, dy)
-            if dist <= planet_radius * 0.6:
-                canvas[y][x] = "O"
-            elif dist <= planet_radius * 0.95:
-                canvas[y][x] = "o"
-            elif dist <= planet_radius * 1.15:
-                canvas[y][x] = "~"
-
-    # draw multiple landscape-oriented orbits and distribute ships across them
-    # number of orbits scales with size (at least 1, cap at 5)
-    orbit_count = max(1, min(5, 1 + (size // 2)))
-    # create orbit radii (landscape: rx significantly > ry)
-    orbits = []
-    for j in range(orbit_count):
-        rx = int(planet_radius * (3.2 + j * 1.0))
-        ry = max(1, int(planet_radius * (0.7 + j * 0.25)))
-        orbits.append((rx, ry))
-
-    # dotted orbits (more horizontal emphasis)
-    for (orbit_r_x, orbit_r_y) in orbits:
-        for a in range(0, 360, 8):
-            ang = math.radians(a)
-            ox = int(cx + orbit_r_x * math.cos(ang))
-            oy = int(cy + orbit_r_y * math.sin(ang))
-            if 0 <= oy < height and 0 <= ox < width and canvas[oy][ox] == " ":
-                canvas[oy][ox] = "."
-
-    # ship glyphs to make orbit pretty
-    ship_glyphs = ["▲", "▶", "✦", "◉", "✺", "*", "✶"]
-    if ships > 0:
-        # distribute ships across orbits proportional to orbit size (approx circumference)
-        weights = []
-        for (rx, ry) in orbits:
-            weights.append(rx + ry)
-        total_w = max(1, sum(weights))
-        per_orbit = [max(0, (ships * w) // total_w) for w in weights]
-        # distribute remainder
-        rem = ships - sum(per_orbit)
-        j = 0
-        while rem > 0:
-            per_orbit[j % orbit_count] += 1
-            rem -= 1
-            j += 1
-
-        idx = 0
-        for j, (orbit_r_x, orbit_r_y) in enumerate(orbits):
-            cnt = per_orbit[j]
-            if cnt <= 0:
-                continue
-            # give each orbit a phase offset so ships stagger between rings
-            phase = j * 0.6
-            for k in range(cnt):
-                angle = 2 * math.pi * k / max(1, cnt) + phase
-                sx = int(cx + orbit_r_x * math.cos(angle))
-                sy = int(cy + orbit_r_y * math.sin(angle))
-                if 0 <= sy < height and 0 <= sx < width:
-                    glyph = ship_glyphs[idx % len(ship_glyphs)]
-                    canvas[sy][sx] = glyph
-                idx += 1
-
-    for row in canvas:
-        art_lines.append("".join(row))
-    art_lines.append(" ")
-    art_lines.append(f" Planet Size: {size} | Ships: {ships} ")
-    return art_lines
-
-
-blackhole_upgrades = [
-    {"key": "z", "name": "Siphon Matter", "desc": "+50 rate", "base_cost": 5000000000000, "cost": 5000000000000, "multiplier": 1.35, "count": 0, "max": 20, "seen": False},
-    {"key": "x", "name": "Event Horizon", "desc": "+2 ships", "base_cost": 25000000000000, "cost": 25000000000000, "multiplier": 1.6, "count": 0, "max": 10, "seen": False},
-    {"key": "c", "name": "Singularity Core", "desc": "+50% other mult", "base_cost": 10000000000000, "cost": 10000000000000, "multiplier": 1.5, "count": 0, "max": 6, "seen": False},
-    {"key": "v", "name": "Accretion Ring", "desc": "Grow size", "base_cost": 250000000000000, "cost": 250000000000000, "multiplier": 1.35, "count": 0, "max": 8, "seen": False},
-    {"key": "s", "name": "Orbital Dockyards", "desc": "+1 ship", "base_cost": 1000000000000000, "cost": 1000000000000000, "multiplier": 1.5, "count": 0, "max": 50, "seen": False},
-    {"key": "n", "name": "Break The Reality", "desc": "Break the reality", "base_cost": 10000000000000000, "cost": 10000000000000000, "multiplier": 0, "count": 0, "max": 1, "seen": False},
-]
-
-
-def buy_blackhole_upgrade(upg):
-    """Purchase and apply black hole upgrade effects."""
-    global money, rate, adminmultiplier, othermultiplier, blackhole_growth, blackhole_upgrades_count, research_page_unlocked, ships_count
-    if upg["count"] >= upg["max"]:
+    `size` controls planet radius; `ships` is number of ships on orbit.
+    The planet and orbits are cached per size; only the ships are redrawn."""
+    return list(planet.console_art(size, ships))
+
+def buy_blackhole_upgrade(upg, amount=1):
+    """Purchase up to `amount` levels (int or "max") and apply their effects at once."""
+    n = economy.buy_blackhole_upgrade(GAME, upg, amount)
+    if n <= 0:
         return
-    if money < upg["cost"]:
-        return
-    money -= upg["cost"]
-    upg["count"] += 1
-    blackhole_upgrades_count += 1
-
-    # apply effects by key
-    if upg["key"] == "z":
-        rate += 50
-    elif upg["key"] == "x":
-        # Event Horizon now adds ships to the orbit (bigger effect than dockyards)
-        ships_count += 2
-    elif upg["key"] == "c":
-        othermultiplier *= 1.5
-    elif upg["key"] == "v":
-        blackhole_growth += 1
-    elif upg["key"] == "s":
-        ships_count += 1
-    elif upg["key"] == "n":
-        # Breaking the reality unlocks research (keeps original effect)
-        research_page_unlocked = True
     # Award a smaller, reliable sanity bump for BH purchases so the bar
     # progresses when the player invests in BH upgrades but doesn't jump
     # excessively. Use about one quarter of the configured BH increment.
     try:
         base = SANITY_INCREMENTS.get('blackhole', 1)
         bump = max(1, int(base // 4))
-        add_sanity(bump)
+        add_sanity(bump * n)
     except Exception:
         try:
-            global sanity_points
-            sanity_points += 1
+            GAME.sanity_points += n
         except Exception:
             pass
 
@@ -1442,17 +607,33 @@ def buy_blackhole_upgrade(upg):
                 pass
     except Exception:
         pass
+    persist('buy_blackhole_upgrade')
+
+
+def unlock_blackhole():
+    """Unlock the black hole page from the mining end. Returns True on success.
 
-    # increase cost for next purchase when multiplier >0
-    if upg.get("multiplier", 0) and upg["multiplier"] > 0:
-        upg["cost"] = int(upg["cost"] * upg["multiplier"])
+    Requires depth 5, one orichalcum_shard (depth 5 only ore) and the money cost.
+    """
+    if not economy.unlock_blackhole(GAME):
+        return False
+    try:
+        award_sanity_event('bh_unlock')
+    except Exception:
+        pass
+    persist('blackhole_unlock')
+    try:
+        # also send player to world 2 on BH unlock
+        trigger_send_to_world2('blackhole')
+    except Exception:
+        pass
+    return True
 
 
 def draw_blackhole_page():
     """Render the black hole (planet + ships) page to stdout (non-curses)."""
-    global blackhole_growth, ships_count
     # time-based income handled by main loop
-    art = generate_planet_art(blackhole_growth, ships_count)
+    art = generate_planet_art(GAME.blackhole_growth, GAME.ships_count)
     # center the art to terminal width
     import shutil
     term_width = shutil.get_terminal_size().columns
@@ -1461,8 +642,8 @@ def draw_blackhole_page():
 
     print("\n=== BLACK HOLE UPGRADES ===\n")
     any_seen = False
-    for upg in blackhole_upgrades:
-        if money >= upg["cost"] * 0.1: upg["seen"] = True
+    for upg in GAME.blackhole_upgrades:
+        if GAME.money >= upg["cost"] * 0.1: upg["seen"] = True
         if upg["seen"]:
             any_seen = True
             # show count/max; if max == 1, just show count to avoid "/1" clutter
@@ -1470,24 +651,64 @@ def draw_blackhole_page():
                 cnt_str = f"({upg['count']})"
             else:
                 cnt_str = f"({upg['count']}/{upg['max']})"
-            status = f"Cost: ${upg['cost']} | {cnt_str}"
+            status = f"Cost: ${format_money(upg['cost'])} | {cnt_str}"
             print(f"[{upg['key'].upper()}] {upg['name']} - {upg['desc']} {status}")
     if not any_seen:
         print("(No black hole upgrades available yet...)")
 
 
 # --- INPUT / CLEAR ---
-def clear(): os.system("cls" if os.name == "nt" else "clear")
+# console pages are captured per frame and repainted as a line diff
+console = ConsoleScreen()
+
+
+def clear():
+    """Start a new console frame (shown by the next present/pace_frame)."""
+    if not frame_profiler.is_open("render"):
+        frame_profiler.begin("render")
+    console.begin()
+    print_notice()
+
+
+# a message shown at the top of the console frames for a few seconds; the
+# main loop keeps running (and drops it later) instead of sleeping on it
+notice = None
+notice_until = 0.0
+notice_shown = False
+
+
+def show_notice(text, seconds):
+    global notice, notice_until, notice_shown
+    notice = text
+    notice_until = time.monotonic() + seconds
+    notice_shown = False
+
+
+def print_notice():
+    """Print the current notice; it goes once its time is up and it has been on screen."""
+    global notice, notice_shown
+    if notice is None:
+        return
+    if notice_shown and time.monotonic() >= notice_until:
+        notice = None
+        return
+    print(notice)
+    notice_shown = True
+
+
 def get_key():
     # unified wrapper that uses the cross-platform `get_char` implementation
-    return get_char()
+    key = get_char()
+    if key and profiler_key(key):
+        return None
+    return key
 
 
 def render_sanity_bar_console():
     """Print the sanity bar for console pages."""
     try:
-        global sanity_points, SANITY_TARGET
-        filled = int(sanity_points)
+        global SANITY_TARGET
+        filled = int(GAME.sanity_points)
         total = int(SANITY_TARGET)
         bar_width = 30
         filled_w = int((filled / total) * bar_width) if total > 0 else 0
@@ -1498,24 +719,20 @@ def render_sanity_bar_console():
         pass
 
 # --- BUY FUNCTIONS ---
-def buy_upgrade(upg):
-    global money, rate, w1upgrades, research_page_unlocked, sanity_points, SANITY_TARGET
-    if upg["count"] >= upg["max"]: return
-    if money < upg["cost"]: return
-    money -= upg["cost"]
-    rate += upg["rate_inc"]
-    upg["count"] += 1
-    w1upgrades += 1
+def buy_upgrade(upg, amount=1):
+    """Buy up to `amount` levels (int or "max") of a city upgrade in one step."""
+    global city_heights_for
+    n = economy.buy_upgrade(GAME, upg, amount)
+    if n <= 0: return
     if upg["name"] == "Unlock Research":
-        # Unlocking research: fill bar and send player explicitly
-        research_page_unlocked = True
+        # Research is unlocked by the upgrade's effect: fill bar and send player explicitly
         try:
-            sanity_points = int(SANITY_TARGET)
+            GAME.sanity_points = int(SANITY_TARGET)
         except Exception:
             try:
-                sanity_points = int(float(SANITY_TARGET))
+                GAME.sanity_points = int(float(SANITY_TARGET))
             except Exception:
-                sanity_points = SANITY_TARGET
+                GAME.sanity_points = SANITY_TARGET
         try:
             trigger_send_to_world2('research')
         except Exception:
@@ -1523,39 +740,24 @@ def buy_upgrade(upg):
     else:
         # Normal upgrades increase sanity only if City is the active sanity stage
         try:
-            if sanity_stage == 0:
-                add_sanity(SANITY_INCREMENTS.get('city', 1))
+            if GAME.sanity_stage == 0:
+                add_sanity(SANITY_INCREMENTS.get('city', 1) * n)
         except Exception:
                 try:
-                    sanity_points += SANITY_INCREMENTS.get('city', 1)
+                    GAME.sanity_points += SANITY_INCREMENTS.get('city', 1) * n
                 except Exception:
                     pass
-    # mark research page to update when viewing
-    try:
-        global research_needs_update
-        research_needs_update = True
-    except Exception:
-        pass
-    if upg["count"] < upg["max"]:
-        upg["cost"] = int(upg["cost"] * upg["multiplier"])
+    # buildings grow with w1upgrades; recompute their heights on next draw
+    city_heights_for = None
     # (other milestone sanity awards handled elsewhere)
+    persist('buy_upgrade')
 
 def buy_research(res):
-    global money, adminmultiplier, othermultiplier, page
-    if res["purchased"]: return
-    if money < res["cost"]: return
-    money -= res["cost"]
-    res["purchased"] = True
-    exec(res["effect"], globals())
-    # ensure research view will re-render
-    try:
-        global research_needs_update
-        research_needs_update = True
-    except Exception:
-        pass
+    if not economy.buy_research(GAME, res):
+        return
     # per-stage sanity: research purchases increase sanity when research is active
     try:
-        if sanity_stage == 1:
+        if GAME.sanity_stage == 1:
             add_sanity(SANITY_INCREMENTS.get('research', 1))
     except Exception:
         pass
@@ -1578,29 +780,12 @@ def buy_research(res):
                 pass
     except Exception:
         pass
+    persist('buy_research')
 
 
 def buy_technology(tech):
-    global money, ore_damage, auto_mine_damage, depth, max_depth, ore_inventory, auto_miner_count
-    if tech["purchased"]: 
+    if not economy.buy_technology(GAME, tech):
         return
-
-    # Check money
-    if money < tech["money_cost"]: 
-        return
-
-    # Check ore costs
-    for ore_name, ore_amount in tech["ore_costs"].items():
-        if ore_inventory.get(ore_name, 0) < ore_amount:
-            return
-
-    # Purchase
-    money -= tech["money_cost"]
-    for ore_name, ore_amount in tech["ore_costs"].items():
-        ore_inventory[ore_name] -= ore_amount
-
-    tech["purchased"] = True
-    exec(tech["effect"], globals())
     # If this tech unlocked a deep depth (>=4), send player to world 2
     try:
         # Only send player to world 2 when unlocking depth 4 (not depth 5)
@@ -1616,50 +801,19 @@ def buy_technology(tech):
         pass
     # per-stage sanity: technology/mining purchases increase sanity when mining is active
     try:
-        if sanity_stage == 2:
+        if GAME.sanity_stage == 2:
             add_sanity(SANITY_INCREMENTS.get('technology', 1))
     except Exception:
         pass
+    persist('buy_technology')
 
 
 
 
-def draw_mine_shaft():
-    """Draw the current ore being mined with HP bar"""
-    if current_ore is None:
-        spawn_new_ore()
-    
-    ore_name = current_ore["name"].upper()
-    ore_symbol = current_ore["color"]
-    hp_percent = ore_hp / ore_max_hp if ore_max_hp > 0 else 0
-    bar_width = 30
-    filled = int(hp_percent * bar_width)
-    hp_bar = "[" + "#" * filled + " " * (bar_width - filled) + "]"
-    
-    shaft = f"""
-    ╔═══════════════════════════════════════════════════╗
-    ║              MINING SHAFT - DEPTH {depth}              ║
-    ╚═══════════════════════════════════════════════════╝
-           |                             |
-           |                             |
-          _|_____________________________|_
-         /                                 \\
-        /         {ore_symbol * 5}  {ore_symbol * 5}  {ore_symbol * 5}          \\
-       /        {ore_symbol * 7}  {ore_symbol * 7}  {ore_symbol * 7}        \\
-      /       {ore_symbol * 9}  {ore_symbol * 9}  {ore_symbol * 9}       \\
-     /      {ore_symbol * 11}  {ore_symbol * 11}  {ore_symbol * 11}      \\
-    /___________________________________________\\
-    
-    Current Ore: {ore_name}
-    HP: {hp_bar} {ore_hp}/{ore_max_hp}
-    Value: ${current_ore["value"]} | Click Damage: {ore_damage} | Auto DPS: {auto_mine_damage}
-    """
-    print(shaft)
-
 def draw_technology_tree():
     """Draw mining tech tree"""
     nodes = []
-    for tech in technology:
+    for tech in GAME.technology:
         mark = "X" if tech["purchased"] else " "
         nodes.append(f"[{tech['key'].upper()}:{mark}]")
     
@@ -1708,15 +862,17 @@ def draw_technology_tree():
     print(tree)
 
 # --- MOUSE CLICK FUNCTIONS ---
+# straight to the terminal: a console frame may be capturing stdout
 def enable_mouse():
-    sys.stdout.write("\033[?1000h\033[?1006h"); sys.stdout.flush()
+    console.control("\033[?1000h\033[?1006h")
 def disable_mouse():
-    sys.stdout.write("\033[?1000l\033[?1006l"); sys.stdout.flush()
+    console.control("\033[?1000l\033[?1006l")
 
 def read_mouse_sequence():
     seq = ""
     while True:
-        c = sys.stdin.read(1)
+        # the rest of a sequence arrives together; a lone ESC times out
+        c = input_reactor.read_char(timeout=0.05)
         if not c: return None
         seq += c
         if c in ("M", "m"): break
@@ -1726,8 +882,8 @@ def read_mouse_sequence():
 def draw_research_tree():
     nodes = []
     for i in range(10):
-        if i < len(research):
-            r = research[i]
+        if i < len(GAME.research):
+            r = GAME.research[i]
             mark = "X" if r["purchased"] else " "
             nodes.append(f"[R{i+1}:{mark}]")
         else:
@@ -1753,47 +909,46 @@ def format_bar(value, maximum, width=20):
     return "[" + "#" * filled + " " * (width - filled) + "]"
 
 
+# the glitch effect playing over the pages, if any; the main loop draws it
+noise_pool = glitch.NoisePool()
+transition = None
+
+
 def glitch_transition():
-    """Display a glitch effect for 5 seconds when transitioning between worlds."""
-    glitch_chars = list('#$%*^&@!~+=<>?/|')
-    try:
-        import shutil
-        term_height, term_width = 24, 80
-        try:
-            term_width, term_height = shutil.get_terminal_size()
-        except Exception:
-            pass
-        
-        duration = 5.0
-        start = time.time()
-        frame_count = 0
-        
-        while time.time() - start < duration:
-            clear()
-            # Generate random glitch screen
-            for row in range(term_height - 1):
-                line = ''.join(random.choice(glitch_chars) for _ in range(term_width - 1))
-                print(line)
-            
-            # Flash by alternating between different patterns
-            time.sleep(0.08 if frame_count % 2 == 0 else 0.12)
-            frame_count += 1
-        
-        clear()
-    except Exception:
-        # Fallback: simple glitch
-        for _ in range(5):
-            clear()
-            print(''.join(random.choice(glitch_chars) for _ in range(80)))
-            time.sleep(0.5)
+    """Start the 5 second glitch effect between worlds. It plays over the
+    next frames of the main loop (see play_transition) while the
+    simulation keeps running; a key skips it."""
+    global transition
+    transition = glitch.Transition(noise_pool, GAME.rng.glitch, clock=time.monotonic)
+
+
+def play_transition(key):
+    """Draw the playing transition's next frame when it is due and wait for
+    the one after (or a key, or a sim tick). ``key`` moves it on a step.
+
+    Returns False, and forgets the transition, once it is over.
+    """
+    global transition
+    if key:
+        if key == '\x1b':
+            # a mouse report is one press, not one per byte
+            read_mouse_sequence()
+        transition.press(key)
+    if transition.done():
+        transition = None
+        return False
+    if transition.due():
         clear()
+        cols, rows = shutil.get_terminal_size()
+        print("\n".join(transition.frame(cols, rows)))
+        console.present()
+        frame_profiler.end("render")
+    input_reactor.wait(min(transition.time_to_next(), sim_clock.time_to_next()))
+    return True
 
 
 # --- ENEMY DISPLAY HELPERS ---
-def random_error_name(length=8):
-    """Return a short garbled string made of punctuation to simulate corruption."""
-    chars = list('%&*^#@$!<>?/~')
-    return ''.join(random.choice(chars) for _ in range(length))
+random_error_name = combat.random_error_name
 
 
 def get_enemy_display_name(region_key):
@@ -1802,133 +957,32 @@ def get_enemy_display_name(region_key):
     Otherwise return the configured name.
     """
     try:
-        if region_key is None:
-            return random_error_name()
-        if region_key == 'forgotten_sanctum':
-            return random_error_name()
-        name = region_enemy_map.get(region_key)
-        if not name:
-            return region_key.replace('_', ' ').title()
-        return name
+        return combat.enemy_display_name(GAME, region_key)
     except Exception:
-        return random_error_name()
-
-
-# ASCII art per-region (left, right)
-ENEMY_ASCII = {
-    'whispering_pines': (
-        ["   .--.", "  /../ ", " (  : )", "  | ||", "   --- "],
-        ["  .--.  ", " (    ) ", "  ( : )>", "   --- ", "  /___ "]
-    ),
-    'silent_graveyard': (
-        ["   .-.", "  (   )", " ( : ) ", "  /|/", "  /  "],
-        ["  ._.", " (o o)", "  -_- ", "  /|/", "  /  "]
-    ),
-    'hollowed_farmlands': (
-        ["   /  ", "  /   ", " (    )", "  |  |", "  /__ "],
-        ["   ~~  ", " (.. )", "  ( : )>", "  /  ", "  /___ "]
-    ),
-    'sunken_marketplace': (
-        ["  [====]", "  |::..|", "  |:.. |", "   /   ", "  /____"],
-        ["  _____ ", " (_____)", "  ( : )>", "  /   ", "  /___ "]
-    ),
-    'old_residential_district': (
-        ["  |--|", " [____]", "  (..)", "  /|/", "  /__ "],
-        ["  /_/_ ", " ( o.o )", "  ( : ) ", "  /   ", "  /___ "]
-    ),
-    'mirror_marsh': (
-        ["   ~~~", "  ~o~ ", " (  : )", "  /   ", " /____"],
-        ["  ~~~  ", " ~o~   ", "  ( : )>", "  /   ", " /____" ]
-    ),
-    'forgotten_sanctum': (
-        # normal human ASCII art for the Forgotten Sanctum enemy
-        ["   O", "  /|/", "  /  ", "", ""],
-        ["   O", "  /|/", "  /  ", "", ""]
-    ),
-}
+        return random_error_name(rng=GAME.rng.glitch)
+
 
 # Player ASCII (left side) — stays consistent across all combats
-PLAYER_ASCII = [
-    "  (\\_/)",
-    "  (•_•)",
-    " <( : ) ",
-    "  /   \\",
-    "  /___\\",
-]
+PLAYER_ASCII = tables.PLAYER_ASCII
 
 
 def get_ascii_for_region(region_key):
     """Return (left, right) ascii lists for a region. Falls back to default pair."""
-    if not region_key:
-        # default simple art (avoid backslashes to ensure portability)
-        return (
-            ["  (o_o)", "  (•_•)", " <( : ) ", "   -  ", "  /___ "],
-            ["  (._.)", " ( o.o )", "  ( : )> ", "   -  ", "  /___ "]
-        )
-    art = ENEMY_ASCII.get(region_key)
-    if art:
-        return art
-    # try approximate match by prefix
-    for k in ENEMY_ASCII:
-        if k in region_key:
-            return ENEMY_ASCII[k]
-    # default
-    # fallback default
-    return (
-        ["  (o_o)", "  (•_•)", " <( : ) ", "   -  ", "  /___ "],
-        ["  (._.)", " ( o.o )", "  ( : )> ", "   -  ", "  /___ "]
-    )
+    return combat.ascii_for_region(region_key)
 
 def enter_combat(location_name=None):
-    global combat_started, player_hp, player_max_hp, enemy_hp, enemy_max_hp, player_heals, player_ability_charges, combat_log, current_enemy_name, current_enemy_region
-    # determine the region key (normalize)
-    if location_name:
-        region_key = str(location_name).lower()
-    else:
-        # pick a random region if none provided
-        try:
-            region_key = random.choice(list(region_enemy_map.keys()))
-        except Exception:
-            region_key = None
-
-    # pick the enemy name assigned to that region (or random fallback)
-    try:
-        enemy_name = region_enemy_map.get(region_key, random.choice(MONSTER_NAMES))
-    except Exception:
-        enemy_name = random.choice(MONSTER_NAMES)
-
-    current_enemy_region = region_key
-
-    # if the region's enemy was already defeated, show message and do not start combat
-    if region_key in defeated_regions:
-        combat_started = False
-        combat_log = [f"'{enemy_name}' has already been defeated!"]
-        return
-
-    # start combat normally
-    combat_started = True
-    player_max_hp = 100
-    player_hp = player_max_hp
-    enemy_max_hp = 80
-    enemy_hp = enemy_max_hp
-    player_heals = 3
-    player_ability_charges = 1
-    # store canonical name (may be None for dynamically-named regions)
-    current_enemy_name = enemy_name
-    # display name may be dynamic (e.g., forgotten_sanctum)
-    display_name = get_enemy_display_name(region_key)
-    combat_log = [f"'{display_name}' has appeared at {location_name or 'Unknown Location'}!"]
+    combat.enter_combat(GAME, location_name)
 
 def draw_combat_ui():
     # choose ascii art based on current region (if available)
-    left, right = get_ascii_for_region(current_enemy_region)
+    left, right = get_ascii_for_region(GAME.current_enemy_region)
     width = 80
     # header
-    display_name = get_enemy_display_name(current_enemy_region)
+    display_name = get_enemy_display_name(GAME.current_enemy_region)
     print("=== ENEMY - COMBAT ===\n")
     print(f"Enemy: {display_name}\n")
     # draw ascii side-by-side: left is player art, right is enemy art
-    _, enemy_right = get_ascii_for_region(current_enemy_region)
+    _, enemy_right = get_ascii_for_region(GAME.current_enemy_region)
     left = PLAYER_ASCII
     gap = width - 20
     for i in range(max(len(left), len(enemy_right))):
@@ -1938,120 +992,46 @@ def draw_combat_ui():
 
     # hp bars
     print()
-    print("Player HP: ", format_bar(player_hp, player_max_hp, 30), f"{player_hp}/{player_max_hp}")
-    print("Enemy  HP: ", format_bar(enemy_hp, enemy_max_hp, 30), f"{enemy_hp}/{enemy_max_hp}")
+    print("Player HP: ", format_bar(GAME.player_hp, GAME.player_max_hp, 30), f"{GAME.player_hp}/{GAME.player_max_hp}")
+    print("Enemy  HP: ", format_bar(GAME.enemy_hp, GAME.enemy_max_hp, 30), f"{GAME.enemy_hp}/{GAME.enemy_max_hp}")
 
     # combat log (last 4 messages)
     print("\n-- Combat Log --")
-    for msg in combat_log[-4:]:
+    for msg in GAME.combat_log[-4:]:
         print(" - " + msg)
 
     # action bar at bottom-ish
     print("\n" + "-" * width)
-    actions = f"[A] Attack   [H] Heal ({player_heals})   [U] Ability ({player_ability_charges})"
+    actions = f"[A] Attack   [H] Heal ({GAME.player_heals})   [U] Ability ({GAME.player_ability_charges})"
     print(actions.center(width))
 
 def perform_player_action(action):
-    global enemy_hp, player_hp, player_heals, combat_log, player_ability_charges, combat_started, world, current_enemy_name, killed_monsters, consecutive_defeats
-    if action == 'attack':
-        dmg = random.randint(8, 15)
-        enemy_hp -= dmg
-        combat_log.append(f"You attack the enemy for {dmg} dmg.")
-    elif action == 'heal':
-        if player_heals <= 0:
-            combat_log.append("No heals left!")
-        else:
-            heal = random.randint(12, 25)
-            player_hp = min(player_max_hp, player_hp + heal)
-            player_heals -= 1
-            combat_log.append(f"You heal for {heal} HP.")
-    elif action == 'ability':
-        if player_ability_charges <= 0:
-            combat_log.append("No ability charges!")
-        else:
-            dmg = random.randint(20, 35)
-            enemy_hp -= dmg
-            player_ability_charges -= 1
-            combat_log.append(f"You use your ability for {dmg} dmg!")
-
-    # check enemy death
-    if enemy_hp <= 0:
-        combat_log.append("Enemy defeated!")
-        # record the killed monster (most recent first) and mark region defeated
-        try:
-            if current_enemy_region and current_enemy_region not in defeated_regions:
-                defeated_regions.add(current_enemy_region)
-                # Use display name for recording (handles dynamic names like Forgotten Sanctum)
-                try:
-                    canonical = region_enemy_map.get(current_enemy_region)
-                except Exception:
-                    canonical = None
-                if canonical is None:
-                    display_name = get_enemy_display_name(current_enemy_region)
-                else:
-                    display_name = current_enemy_name or canonical
-                if display_name and display_name not in killed_monsters:
-                    killed_monsters.insert(0, display_name)
-                
-                # Increment defeat counter
-                consecutive_defeats += 1
-        except Exception:
-            pass
-        combat_started = False
-        
-        # Check if Forgotten Sanctum was defeated - if so, trigger victory
-        if current_enemy_region == 'forgotten_sanctum':
-            # Trigger permanent glitch effect with victory message
-            glitch_chars = list('#$%*^&@!~+=<>?/|')
-            victory_msg = "You won"
-            terminal_width = 80
-            terminal_height = 30
-            victory_row = terminal_height // 2
-            try:
-                while True:
-                    print('\n' * 50)  # clear screen
-                    # Generate glitch lines before victory message
-                    for row in range(terminal_height):
-                        if row == victory_row:
-                            # Center the "You won" message on this row
-                            padding = (terminal_width - len(victory_msg)) // 2
-                            glitch_before = ''.join(random.choice(glitch_chars) for _ in range(padding))
-                            glitch_after = ''.join(random.choice(glitch_chars) for _ in range(terminal_width - padding - len(victory_msg)))
-                            print(glitch_before + victory_msg + glitch_after)
-                        else:
-                            # Regular glitch line
-                            line_length = random.randint(40, 80)
-                            glitch_line = ''.join(random.choice(glitch_chars) for _ in range(line_length))
-                            print(glitch_line)
-                    time.sleep(0.5)
-            except KeyboardInterrupt:
-                pass
-            return
-        
-        # Switch to world 1 after defeating pairs: 2nd, 4th, 6th dungeons
-        # OR immediately after defeating Obsidian Quarry (dungeon 7)
-        # This means: after (Whispering+Silent), (Hollowed+Sunken),
-        # (Old Res+Mirror), (Obsidian Quarry)
-        total_defeated = len(defeated_regions)
-        if total_defeated in [2, 4, 6] or current_enemy_region == 'obsidian_quarry':
-            world = 1
-            # Note: glitch transition will be shown when combat returns to main loop
-        # Otherwise stay in world 2 for next dungeon
-        return
+    """Play one combat round (see combat.perform_player_action) and react to its outcome."""
+    outcome = combat.perform_player_action(GAME, action)
+    if outcome in (combat.DEFEATED, combat.VICTORY):
+        persist('enemy_defeated')
+    # beating the Forgotten Sanctum ends the game
+    if outcome == combat.VICTORY:
+        victory_screen()
+    return outcome
+
 
-    # enemy turn
-    edmg = random.randint(5, 14)
-    player_hp -= edmg
-    combat_log.append(f"Enemy hits you for {edmg} dmg.")
-    if player_hp <= 0:
-        combat_log.append("You were slain...")
-        combat_started = False
-        # Don't set world here - let curses_combat handle death message
+def victory_screen():
+    """Start the endless glitch screen with the victory message; space ends it."""
+    global transition
+    transition = glitch.Transition(noise_pool, GAME.rng.glitch, steps=(("You won", None),),
+                                   delays=(0.5,), ragged=True, clock=time.monotonic)
+
+
+# how long a "cleared" / "not unlocked" line stays at the bottom of the map
+MAP_MESSAGE_SECONDS = 1.0
+# how long a clicked zone stays highlighted before its fight starts
+MAP_HIGHLIGHT_SECONDS = 0.25
 
 
 def curses_map_view(stdscr):
     """Draw the map using curses and wait for a mouse click on a labeled region.
-    Returns the normalized region name (key in click_labels) or None if canceled."""
+    Returns the normalized region name (a region_enemy_map key) or None if canceled."""
     init_curses_window(stdscr)
     # enable mouse reporting where available
     try:
@@ -2065,7 +1045,7 @@ def curses_map_view(stdscr):
     # ASCII list icon for World 4: [≡]
     list_icon = "[≡]"
     # keep header compact to avoid wrapping issues on narrow terminals
-    header_line1 = f"=== WORLD 2: MAP ===   Level: {player_level}   {list_icon} Kill List"
+    header_line1 = f"=== WORLD 2: MAP ===   Level: {GAME.player_level}   {list_icon} Kill List"
     header_lines = [header_line1, "You seem to have transported to another world... Click on bolded text to enter dungeon.", ""]
     # prepare a full-screen line buffer and render only changed lines
     try:
@@ -2093,8 +1073,8 @@ def curses_map_view(stdscr):
             dest = map_top + vis_i
             if dest >= maxy:
                 break
-            if art_idx < len(map_art):
-                new_lines[dest] = map_art[art_idx][:maxx-1]
+            if art_idx < len(GAME.map_art):
+                new_lines[dest] = GAME.map_art[art_idx][:maxx-1]
             else:
                 new_lines[dest] = ''
 
@@ -2113,12 +1093,70 @@ def curses_map_view(stdscr):
                     except Exception:
                         pass
 
+    def repaint():
+        frame_profiler.begin("render")
+        draw_map()
+        for y, ln in enumerate(new_lines):
+            render_line(stdscr, y, ln)
+        draw_profile_overlay()
+        present_frame(stdscr)
+        frame_profiler.end("render")
+
+    def draw_profile_overlay():
+        if frame_profiler.overlay:
+            render_line(stdscr, maxy - 1, frame_profiler.overlay_line())
+
+    # bottom-line message and when it goes away; the loop below clears it
+    status_until = None
+    # clicked zone (name, zone, highlight deadline); its fight starts after
+    entering = None
+
+    def show_status(msg):
+        nonlocal status_until
+        render_line(stdscr, maxy - 1, msg[:maxx - 1])
+        present_frame(stdscr)
+        status_until = time.monotonic() + MAP_MESSAGE_SECONDS
+
+    def highlight_zone(z, attr):
+        # compute 0-based map_art index for zone start, adjusted for scroll
+        start_idx = z["row_start"] - (map_top + 1) - map_scroll
+        z_h = z["row_end"] - z["row_start"] + 1
+        z_w = z["col_end"] - z["col_start"] + 1
+        col0 = z["col_start"] - 1
+        for i in range(z_h):
+            line_idx = start_idx + i
+            if line_idx < 0 or line_idx >= visible_height:
+                continue
+            y = map_top + line_idx
+            art_idx = map_scroll + line_idx
+            try:
+                stdscr.chgat(y, col0, z_w, attr)
+            except Exception:
+                try:
+                    if attr == curses.A_NORMAL:
+                        # redraw original text without attributes
+                        stdscr.addstr(y, col0, GAME.map_art[art_idx][0:z_w])
+                    else:
+                        # fallback: mark with brackets in the line buffer and render
+                        lbl = GAME.map_art[art_idx][0:z_w]
+                        render_line(stdscr, y, _overlay(new_lines[y], col0, '[' + lbl[:max(0, z_w-2)] + ']'))
+                except Exception:
+                    pass
+
+    def next_deadline():
+        """Seconds until the message or the highlight is due, or None."""
+        due = [d for d in (status_until, entering and entering[2]) if d is not None]
+        return max(0.0, min(due) - time.monotonic()) if due else None
+
     # initial draw
+    frame_profiler.enter("curses_map_view")
+    frame_profiler.begin("render")
     draw_map()
 
     # compute zones in display coords using existing helper
     # pass map_top+1 (1-based row index) so calculations align with zone math
-    absolute_zones = make_absolute_zones(map_art, map_top + 1)
+    zone_index = map_zone_cache.get(GAME.map_art, GAME.map_art_version)
+    absolute_zones = zone_index.screen_zones(map_top + 1)
 
     # draw debug boxes (optional) - we'll overlay short markers at label starts
     def _overlay(line, col, txt):
@@ -2167,177 +1205,133 @@ def curses_map_view(stdscr):
                     except Exception:
                         pass
     
+    draw_profile_overlay()
     present_frame(stdscr)
+    frame_profiler.end("render")
 
     while True:
+        frame_profiler.enter("curses_map_view")
+        # block until a key/click arrives, the next sim tick is due or the
+        # bottom-line message / zone highlight runs out
+        stdscr.timeout(wait_ms(sim_clock, next_deadline()))
         ch = stdscr.getch()
-        if ch == curses.KEY_MOUSE:
-            try:
-                _, mx, my, _, bstate = curses.getmouse()
-            except Exception:
-                continue
-            # left click
-            if bstate & curses.BUTTON1_CLICKED:
-                # Check if clicking on the World 4 button (top-right area of header)
-                # The button "[≡] Kill List" is in row 0 (map_top)
-                # It's positioned near the end of header_line1
-                if my == 0:  # header row
-                    # Check if click is in the area of the header button text
-                    try:
-                        maxy, maxx = stdscr.getmaxyx()
-                        btn_text = f"{list_icon} Kill List"
-                        btn_start = maxx - len(btn_text) - 2
-                        if mx >= btn_start:
-                            return ("world4_button", False)
-                    except Exception:
-                        # fallback conservative behavior
-                        if mx >=  stdscr.getmaxyx()[1] - 30:
-                            return ("world4_button", False)
-                
-                # handle mouse wheel (BUTTON4/BUTTON5) if available
+        now = time.monotonic()
+        if status_until is not None and now >= status_until:
+            status_until = None
+            render_line(stdscr, maxy - 1, '')
+            draw_profile_overlay()
+            present_frame(stdscr)
+        if entering is not None and now >= entering[2]:
+            name, z, _ = entering
+            # revert the temporary highlight so attributes aren't left set
+            highlight_zone(z, curses.A_NORMAL)
+            stdscr.refresh()
+            # After highlighting, enter curses combat UI directly (stay in curses)
+            did = curses_combat(stdscr, name, absolute_zones, map_top)
+            return (name, bool(did))
+        if ch == -1:
+            run_simulation()
+            if frame_profiler.overlay:
+                draw_profile_overlay()
+                present_frame(stdscr)
+            continue
+        if profiler_key(ch):
+            render_line(stdscr, maxy - 1, '')
+            repaint()
+            continue
+        if entering is not None:
+            # the clicked zone's fight is about to start
+            continue
+        with frame_profiler.section("input"):
+            if ch == curses.KEY_MOUSE:
                 try:
-                    btn4 = getattr(curses, 'BUTTON4_PRESSED')
-                    btn5 = getattr(curses, 'BUTTON5_PRESSED')
+                    _, mx, my, _, bstate = curses.getmouse()
                 except Exception:
-                    btn4 = btn5 = 0
-                if btn4 and (bstate & btn4):
-                    map_scroll = max(0, map_scroll - 3)
-                    draw_map()
-                    for y, ln in enumerate(new_lines):
-                        render_line(stdscr, y, ln)
-                    present_frame(stdscr)
                     continue
-                if btn5 and (bstate & btn5):
-                    map_scroll = min(max(0, len(map_art) - visible_height), map_scroll + 3)
-                    draw_map()
-                    for y, ln in enumerate(new_lines):
-                        render_line(stdscr, y, ln)
-                    present_frame(stdscr)
-                    continue
-
-                # find which zone contains (my+1, mx+1) taking scroll into account
-                matched = None
-                for name, z in absolute_zones.items():
-                    disp_row_start = z["row_start"] - map_scroll
-                    disp_row_end = z["row_end"] - map_scroll
-                    if disp_row_start <= my+1 <= disp_row_end and z["col_start"] <= mx+1 <= z["col_end"]:
-                        matched = (name, z)
-                        break
-                
-                if matched:
-                    name, z = matched
-                    
-                    # Check if dungeon is already cleared
-                    if name in defeated_regions:
+                # left click
+                if bstate & curses.BUTTON1_CLICKED:
+                    # Check if clicking on the World 4 button (top-right area of header)
+                    # The button "[≡] Kill List" is in row 0 (map_top)
+                    # It's positioned near the end of header_line1
+                    if my == 0:  # header row
+                        # Check if click is in the area of the header button text
                         try:
                             maxy, maxx = stdscr.getmaxyx()
-                            location_display = name.replace('_', ' ').title()
-                            msg = f"{location_display} has been cleared."
-                            render_line(stdscr, maxy-1, msg[:maxx-1])
-                            present_frame(stdscr)
-                            time.sleep(1.0)
-                            # Clear message
-                            render_line(stdscr, maxy-1, '')
-                            present_frame(stdscr)
+                            btn_text = f"{list_icon} Kill List"
+                            btn_start = maxx - len(btn_text) - 2
+                            if mx >= btn_start:
+                                return ("world4_button", False)
                         except Exception:
-                            pass
+                            # fallback conservative behavior
+                            if mx >=  stdscr.getmaxyx()[1] - 30:
+                                return ("world4_button", False)
+                
+                    # handle mouse wheel (BUTTON4/BUTTON5) if available
+                    try:
+                        btn4 = getattr(curses, 'BUTTON4_PRESSED')
+                        btn5 = getattr(curses, 'BUTTON5_PRESSED')
+                    except Exception:
+                        btn4 = btn5 = 0
+                    if btn4 and (bstate & btn4):
+                        map_scroll = max(0, map_scroll - 3)
+                        repaint()
                         continue
-                    
-                    # Check if this is the available dungeon
-                    if available_dungeon and name != available_dungeon:
-                        # Not the available dungeon, show locked message
-                        try:
-                            maxy, maxx = stdscr.getmaxyx()
-                            location_display = name.replace('_', ' ').title()
-                            msg = f"{location_display} has not been unlocked"
-                            render_line(stdscr, maxy-1, msg[:maxx-1])
-                            present_frame(stdscr)
-                            time.sleep(1.0)
-                            # Clear message
-                            render_line(stdscr, maxy-1, '')
-                            present_frame(stdscr)
-                        except Exception:
-                            pass
+                    if btn5 and (bstate & btn5):
+                        map_scroll = min(max(0, len(GAME.map_art) - visible_height), map_scroll + 3)
+                        repaint()
                         continue
+
+                    # find which zone contains (my+1, mx+1) taking scroll into account
+                    matched = zone_index.hit(my+1, mx+1, map_top + 1, map_scroll)
                 
-                present_frame(stdscr)
-                if matched:
-                    name, z = matched
+                    if matched:
+                        name, z = matched
                     
-                    # visually highlight the matched zone briefly
-                    # compute 0-based map_art index for zone start, adjusted for scroll
-                    start_idx = z["row_start"] - (map_top + 1) - map_scroll
-                    z_h = z["row_end"] - z["row_start"] + 1
-                    z_w = z["col_end"] - z["col_start"] + 1
-                    col0 = z["col_start"] - 1
-                    for i in range(z_h):
-                        line_idx = start_idx + i
-                        if line_idx < 0 or line_idx >= visible_height:
-                            continue
-                        y = map_top + line_idx
-                        try:
-                            stdscr.chgat(y, col0, z_w, curses.A_REVERSE)
-                        except Exception:
-                            # fallback: mark with brackets in the line buffer and render
+                        # Check if dungeon is already cleared
+                        if name in GAME.defeated_regions:
                             try:
-                                art_idx = map_scroll + line_idx
-                                lbl = map_art[art_idx][0:z_w]
-                                new = _overlay(new_lines[y], col0, '[' + lbl[:max(0, z_w-2)] + ']')
-                                render_line(stdscr, y, new)
+                                location_display = name.replace('_', ' ').title()
+                                show_status(f"{location_display} has been cleared.")
                             except Exception:
                                 pass
-                    present_frame(stdscr)
-                    time.sleep(0.25)
-                    # revert the temporary highlight so attributes aren't left set
-                    for i in range(z_h):
-                        line_idx = start_idx + i
-                        y = map_top + line_idx
-                        try:
-                            stdscr.chgat(y, col0, z_w, curses.A_NORMAL)
-                        except Exception:
+                            continue
+                    
+                        # Check if this is the available dungeon
+                        if available_dungeon and name != available_dungeon:
+                            # Not the available dungeon, show locked message
                             try:
-                                # redraw original text without attributes
-                                stdscr.addstr(y, col0, map_art[line_idx][0:z_w])
+                                location_display = name.replace('_', ' ').title()
+                                show_status(f"{location_display} has not been unlocked")
                             except Exception:
                                 pass
-                    stdscr.refresh()
-                    # After highlighting, enter curses combat UI directly (stay in curses)
-                    did = curses_combat(stdscr, name, absolute_zones, map_top)
-                    return (name, bool(did))
-        if ch in (ord('q'), 27):
-            return None
-        elif ch in (ord('k'), ord('K')):
-            return (None, False)
-        elif ch == curses.KEY_UP:
-            map_scroll = max(0, map_scroll - 1)
-            draw_map()
-            for y, ln in enumerate(new_lines):
-                render_line(stdscr, y, ln)
-            present_frame(stdscr)
-        elif ch == curses.KEY_DOWN:
-            map_scroll = min(max(0, len(map_art) - visible_height), map_scroll + 1)
-            draw_map()
-            for y, ln in enumerate(new_lines):
-                render_line(stdscr, y, ln)
-            present_frame(stdscr)
-        elif ch == curses.KEY_PPAGE:
-            map_scroll = max(0, map_scroll - visible_height)
-            draw_map()
-            for y, ln in enumerate(new_lines):
-                render_line(stdscr, y, ln)
-            present_frame(stdscr)
-        elif ch == curses.KEY_NPAGE:
-            map_scroll = min(max(0, len(map_art) - visible_height), map_scroll + visible_height)
-            draw_map()
-            for y, ln in enumerate(new_lines):
-                render_line(stdscr, y, ln)
-            present_frame(stdscr)
-
-        # small sleep to cap redraw rate and reduce CPU usage / flicker
-        try:
-            time.sleep(0.03)
-        except Exception:
-            pass
+                            continue
+                
+                    present_frame(stdscr)
+                    if matched:
+                        name, z = matched
+                    
+                        # visually highlight the matched zone briefly; the
+                        # loop above starts the fight once the highlight is due
+                        highlight_zone(z, curses.A_REVERSE)
+                        present_frame(stdscr)
+                        entering = (name, z, time.monotonic() + MAP_HIGHLIGHT_SECONDS)
+                        continue
+            if ch in (ord('q'), 27):
+                return None
+            elif ch in (ord('k'), ord('K')):
+                return (None, False)
+            elif ch == curses.KEY_UP:
+                map_scroll = max(0, map_scroll - 1)
+                repaint()
+            elif ch == curses.KEY_DOWN:
+                map_scroll = min(max(0, len(GAME.map_art) - visible_height), map_scroll + 1)
+                repaint()
+            elif ch == curses.KEY_PPAGE:
+                map_scroll = max(0, map_scroll - visible_height)
+                repaint()
+            elif ch == curses.KEY_NPAGE:
+                map_scroll = min(max(0, len(GAME.map_art) - visible_height), map_scroll + visible_height)
+                repaint()
 
 
 def map_view_fallback():
@@ -2346,9 +1340,9 @@ def map_view_fallback():
     print("=== WORLD 2: MAP (text mode) ===")
     print("Click not available — choose a location by number or press [Q] to cancel.")
     # print map preview
-    for line in map_art:
+    for line in GAME.map_art:
         print(line)
-    labels = locate_labels_in_map(map_art)
+    labels = locate_labels_in_map(GAME.map_art)
     keys = list(labels.keys())
     if not keys:
         print("(No labeled locations found)")
@@ -2384,6 +1378,8 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
     enter_combat(location_name=region)
 
     while True:
+        frame_profiler.enter("curses_combat")
+        frame_profiler.begin("render")
         try:
             maxy, maxx = stdscr.getmaxyx()
         except Exception:
@@ -2393,7 +1389,7 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
         new_lines = [''] * maxy
         # title uses the display name (may be dynamic for some regions)
         display_name = get_enemy_display_name(region)
-        title = f"Enemy: {display_name}   Level: {player_level}"
+        title = f"Enemy: {display_name}   Level: {GAME.player_level}"
         new_lines[0] = title[:maxx-1]
 
         # left side is player's consistent ASCII; right is enemy art for this region
@@ -2419,9 +1415,9 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
 
         # HP bars
         if 8 < maxy:
-            new_lines[8] = f"Player HP: {player_hp}/{player_max_hp} "[:maxx-1]
+            new_lines[8] = f"Player HP: {GAME.player_hp}/{GAME.player_max_hp} "[:maxx-1]
         if 9 < maxy:
-            new_lines[9] = format_bar(player_hp, player_max_hp, min(30, maxx-20))[:maxx-1]
+            new_lines[9] = format_bar(GAME.player_hp, GAME.player_max_hp, min(30, maxx-20))[:maxx-1]
         try:
             if 8 < maxy:
                 col = maxx - 40
@@ -2429,7 +1425,7 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
                     line = new_lines[8]
                     if len(line) < col:
                         line = line + ' ' * (col - len(line))
-                    line = (line[:col] + f"Enemy HP: {enemy_hp}/{enemy_max_hp}")[:maxx-1]
+                    line = (line[:col] + f"Enemy HP: {GAME.enemy_hp}/{GAME.enemy_max_hp}")[:maxx-1]
                     new_lines[8] = line
             if 9 < maxy:
                 col = maxx - 40
@@ -2437,7 +1433,7 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
                     line = new_lines[9]
                     if len(line) < col:
                         line = line + ' ' * (col - len(line))
-                    line = (line[:col] + format_bar(enemy_hp, enemy_max_hp, min(30, maxx-20)))[:maxx-1]
+                    line = (line[:col] + format_bar(GAME.enemy_hp, GAME.enemy_max_hp, min(30, maxx-20)))[:maxx-1]
                     new_lines[9] = line
         except Exception:
             pass
@@ -2445,7 +1441,7 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
         # combat log
         if 11 < maxy:
             new_lines[11] = "-- Combat Log --"
-            for i, msg in enumerate(combat_log[-(maxy-18):], start=0):
+            for i, msg in enumerate(GAME.combat_log[-(maxy-18):], start=0):
                 y = 12 + i
                 if y < maxy - 4:
                     new_lines[y] = msg[:maxx-1]
@@ -2453,36 +1449,42 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
         # actions
         if maxy - 2 >= 0:
             new_lines[maxy-2] = "[A] Attack   [H] Heal   [U] Ability"[:maxx-1]
+        if frame_profiler.overlay and maxy - 1 > 0:
+            new_lines[maxy-1] = frame_profiler.overlay_line()
 
         # render frame
         for y, ln in enumerate(new_lines):
             render_line(stdscr, y, ln)
         present_frame(stdscr)
+        frame_profiler.end("render")
 
+        # wait for a key; wake at the next sim tick to keep income running
+        stdscr.timeout(wait_ms(sim_clock))
         ch = stdscr.getch()
-        if ch in (ord('a'), ord('A')):
-            perform_player_action('attack')
-        elif ch in (ord('h'), ord('H')):
-            perform_player_action('heal')
-        elif ch in (ord('u'), ord('U')):
-            perform_player_action('ability')
+        if ch == -1:
+            run_simulation()
+        elif profiler_key(ch):
+            continue
+        else:
+            with frame_profiler.section("input"):
+                if ch in (ord('a'), ord('A')):
+                    perform_player_action('attack')
+                elif ch in (ord('h'), ord('H')):
+                    perform_player_action('heal')
+                elif ch in (ord('u'), ord('U')):
+                    perform_player_action('ability')
         # Removed k key - player cannot exit combat manually
 
-        # small sleep to cap redraw/input polling rate
-        try:
-            time.sleep(0.03)
-        except Exception:
-            pass
-
         # check combat end
-        if not combat_started:
+        if not GAME.combat_started:
             # Check if player died (HP <= 0)
-            if player_hp <= 0:
+            if GAME.player_hp <= 0:
                 # Player died - show death message
                 msg = "You have died! Press [space] to restart."
                 render_line(stdscr, maxy-3, msg[:maxx-1])
                 present_frame(stdscr)
-                # Wait for space bar
+                # Wait for space bar (blocking, no polling)
+                stdscr.timeout(-1)
                 while True:
                     ch = stdscr.getch()
                     if ch == ord(' '):
@@ -2492,11 +1494,12 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
                 return True
             else:
                 # Player won - display victory message with enemy name
-                enemy_display = get_enemy_display_name(current_enemy_region) if current_enemy_region else "Enemy"
+                enemy_display = get_enemy_display_name(GAME.current_enemy_region) if GAME.current_enemy_region else "Enemy"
                 msg = f"You have defeated {enemy_display}! Press [space] to exit."
                 render_line(stdscr, maxy-3, msg[:maxx-1])
                 present_frame(stdscr)
-                # Wait for space bar
+                # Wait for space bar (blocking, no polling)
+                stdscr.timeout(-1)
                 while True:
                     ch = stdscr.getch()
                     if ch == ord(' '):
@@ -2505,118 +1508,66 @@ def curses_combat(stdscr, region, absolute_zones=None, map_top=0):
                 return True
 
 
+# frame period of the animated black hole view
+BLACKHOLE_FRAME_SECONDS = 0.08
+orbital_cache = planet.OrbitalCache()
+
+
 def curses_blackhole_view(stdscr):
     """Animated black hole (planet + ships) view using curses."""
     curses.curs_set(0)
     stdscr.nodelay(True)
     stdscr.keypad(True)
     angle_offset = 0.0
-    import math
+    # ships advance 6 degrees per 0.08s frame, measured in real time so a
+    # keypress waking the loop early doesn't speed them up
+    spin_start = time.monotonic()
 
     while True:
+        frame_profiler.enter("curses_blackhole_view")
+        # keep income ticking while the orbital view is open
+        run_simulation()
+        frame_profiler.begin("render")
+        angle_offset = (time.monotonic() - spin_start) / BLACKHOLE_FRAME_SECONDS * 6.0
         stdscr.erase()
         maxy, maxx = stdscr.getmaxyx()
         title = "=== BLACK HOLE - ORBITAL VIEW ==="
         safe_addstr(stdscr, 0, max(0, (maxx - len(title)) // 2), title)
 
-        # compute planet parameters
-        pr = max(1, 2 + blackhole_growth)
-        pw = pr * 4 + 1
-        cx = maxx // 2
-        cy = maxy // 2
-
-        # draw planet
-        for dy in range(-pr, pr + 1):
-            for dx in range(-pw // 2, pw // 2 + 1):
-                sx = cx + dx
-                sy = cy + dy
-                if sx < 0 or sx >= maxx or sy < 1 or sy >= maxy - 4:
-                    continue
-                d = math.hypot((dx / 2.0), dy)
-                if d <= pr * 0.6:
-                    ch = 'O'
-                elif d <= pr * 0.95:
-                    ch = 'o'
-                elif d <= pr * 1.15:
-                    ch = '~'
-                else:
-                    ch = ' '
-                try:
-                    safe_addstr(stdscr, sy, sx, ch)
-                except Exception:
-                    pass
-
-        # multiple landscape orbits (rx > ry) and animated ships
-        orbit_count = max(1, min(5, 1 + (blackhole_growth // 2)))
-        orbits = []
-        for j in range(orbit_count):
-            rx = int(pr * (3.2 + j * 1.0))
-            ry = max(1, int(pr * (0.7 + j * 0.25)))
-            orbits.append((rx, ry))
-
-        # draw dotted orbits (landscape emphasis)
-        for j, (orbit_rx, orbit_ry) in enumerate(orbits):
-            step = 10
-            for a in range(0, 360, step):
-                ang = math.radians(a + int(angle_offset * (0.5 + j * 0.3)))
-                ox = int(cx + (orbit_rx * math.cos(ang)))
-                oy = int(cy + (orbit_ry * math.sin(ang)))
-                if 1 <= oy < maxy - 4 and 0 <= ox < maxx:
-                    try:
-                        safe_addstr(stdscr, oy, ox, '.')
-                    except Exception:
-                        pass
-
-        # distribute ships across orbits proportional to orbit size
-        ship_glyphs = ['▲', '◆', '✦', '✸', '✺', '✶', '✹']
-        if ships_count > 0:
-            weights = [(rx + ry) for (rx, ry) in orbits]
-            total_w = max(1, sum(weights))
-            per_orbit = [max(0, (ships_count * w) // total_w) for w in weights]
-            rem = ships_count - sum(per_orbit)
-            jj = 0
-            while rem > 0:
-                per_orbit[jj % orbit_count] += 1
-                rem -= 1
-                jj += 1
-
-            idx = 0
-            for j, (orbit_rx, orbit_ry) in enumerate(orbits):
-                cnt = per_orbit[j]
-                if cnt <= 0:
-                    continue
-                phase = j * 0.7
-                for k in range(cnt):
-                    ang = 2 * math.pi * k / max(1, cnt) + (angle_offset / (6.0 + j)) + phase
-                    sx = int(cx + (orbit_rx * math.cos(ang)))
-                    sy = int(cy + (orbit_ry * math.sin(ang)))
-                    glyph = ship_glyphs[idx % len(ship_glyphs)]
-                    try:
-                        if 1 <= sy < maxy - 4 and 0 <= sx < maxx:
-                            safe_addstr(stdscr, sy, sx, glyph)
-                    except Exception:
-                        pass
-                    idx += 1
+        # planet and orbit rasters are cached per (growth, terminal size);
+        # each frame only places the dots for this rotation and the ships
+        layer = orbital_cache.get(GAME.blackhole_growth, maxy, maxx)
+        pw = layer.planet_width
+        for (sy, sx, text) in layer.planet:
+            safe_addstr(stdscr, sy, sx, text)
+        for j in range(len(layer.orbits)):
+            for (oy, ox) in layer.dots(j, int(angle_offset * (0.5 + j * 0.3))):
+                safe_addstr(stdscr, oy, ox, '.')
+        for (sy, sx, glyph) in layer.ships(GAME.ships_count, angle_offset):
+            safe_addstr(stdscr, sy, sx, glyph)
 
         # Right column: upgrades and info
         col = maxx - 38
         if col < pw + 5:
             col = pw + 6
         try:
-            safe_addstr(stdscr, 2, col, f"Money: ${money:.2f}")
-            safe_addstr(stdscr, 3, col, f"Ships: {ships_count}  (mult x{ships_money_multiplier():.2f})")
-            safe_addstr(stdscr, 4, col, f"Planet Size: {blackhole_growth}")
+            safe_addstr(stdscr, 2, col, f"Money: ${format_money(GAME.money)}")
+            safe_addstr(stdscr, 3, col, f"Ships: {GAME.ships_count}  (mult x{ships_money_multiplier():.2f})")
+            safe_addstr(stdscr, 4, col, f"Planet Size: {GAME.blackhole_growth}")
             safe_addstr(stdscr, 6, col, "=== BLACK HOLE UPGRADES ===")
             ry = 7
-            for upg in blackhole_upgrades:
-                seen = upg.get('seen', False) or (money >= upg['cost'] * 0.1)
+            for upg in GAME.blackhole_upgrades:
+                seen = upg.get('seen', False) or (GAME.money >= upg['cost'] * 0.1)
                 if seen:
                     # if this upgrade has max==1, avoid showing "/1"
                     if upg['max'] == 1:
                         cnt_str = f"({upg['count']})"
                     else:
                         cnt_str = f"({upg['count']}/{upg['max']})"
-                    status = f"${upg['cost']} {cnt_str}"
+                    status = f"${format_money(upg['cost'])} {cnt_str}"
+                    if GAME.buy_mode != 1 and upg['count'] < upg['max']:
+                        n_lv, total = economy.quote(upg, GAME.money, GAME.buy_mode)
+                        status = f"{economy.buy_mode_label(GAME.buy_mode)} ({n_lv}): ${format_money(total)} {cnt_str}"
                     safe_addstr(stdscr, ry, col, f"[{upg['key'].upper()}] {upg['name']}")
                     safe_addstr(stdscr, ry + 1, col, f"   {upg['desc']} - {status}")
                     ry += 2
@@ -2626,9 +1577,9 @@ def curses_blackhole_view(stdscr):
                 filled_w = 0
                 try:
                     if SANITY_TARGET > 0:
-                        filled_w = int((sanity_points / float(SANITY_TARGET)) * bar_len)
+                        filled_w = int((GAME.sanity_points / float(SANITY_TARGET)) * bar_len)
                 except Exception:
-                    filled_w = int(sanity_points)
+                    filled_w = int(GAME.sanity_points)
                 filled_w = max(0, min(bar_len, filled_w))
                 bar = "[" + "#" * filled_w + " " * (bar_len - filled_w) + "]"
                 bar_full = f"SANITY: {bar}"
@@ -2636,47 +1587,57 @@ def curses_blackhole_view(stdscr):
                 safe_addstr(stdscr, maxy - 2, bx, bar_full)
             except Exception:
                 pass
-            safe_addstr(stdscr, maxy - 3, col, "[K] Back   [Q] Quit")
+            safe_addstr(stdscr, maxy - 3, col, f"[O] Order: {economy.buy_mode_label(GAME.buy_mode)}   [K] Back   [Q] Quit")
         except Exception:
             pass
 
+        if frame_profiler.overlay:
+            safe_addstr(stdscr, maxy - 1, 0, frame_profiler.overlay_line()[:maxx - 1])
         stdscr.refresh()
+        frame_profiler.end("render")
 
-        # handle input
+        # handle input: wait for a key, the next animation frame or sim tick
         try:
+            stdscr.timeout(wait_ms(sim_clock, BLACKHOLE_FRAME_SECONDS))
             ch = stdscr.getch()
         except Exception:
             ch = -1
 
+        if ch != -1 and profiler_key(ch):
+            continue
         if ch != -1:
-            try:
-                c = chr(ch).lower()
-            except Exception:
-                c = ''
-            if c in ('k', 'r'):
-                return
-            if c in ('q', '\x1b'):
-                return
-            for upg in blackhole_upgrades:
-                if c == upg['key']:
-                    buy_blackhole_upgrade(upg)
-                    break
-            # If player pressed the final upgrade key while viewing the curses
-            # black hole, exit the view so the outer loop can process the
-            # world transition triggered by the purchase.
-            try:
-                if c == 'n':
+            with frame_profiler.section("input"):
+                try:
+                    c = chr(ch).lower()
+                except Exception:
+                    c = ''
+                if c in ('k', 'r'):
                     return
-            except Exception:
-                pass
+                if c in ('q', '\x1b'):
+                    return
+                if c == 'o':
+                    GAME.buy_mode = economy.next_buy_mode(GAME.buy_mode)
+                upg = keymap.lookup(GAME, "blackhole_upgrades", c)
+                if upg is not None:
+                    buy_blackhole_upgrade(upg, GAME.buy_mode)
+                # If player pressed the final upgrade key while viewing the curses
+                # black hole, exit the view so the outer loop can process the
+                # world transition triggered by the purchase.
+                try:
+                    if c == 'n':
+                        return
+                except Exception:
+                    pass
 
-        angle_offset += 6.0
-        time.sleep(0.08)
 
 def main():
-    global world, money, timea, page, w1upgrades, depth, max_depth, ore_hp, ore_max_hp, ore_damage, auto_mine_damage, current_ore, ore_inventory, auto_miner_count, mining_page_unlocked, blackhole_page_unlocked, blackhole_growth, ships_count, blackhole_unlock_cost
     generate_city_layout()
     spawn_new_ore()  # Add this line
+    load_game()
+    # DYSNESIA_RECORD=<file> records the session for python -m dysnesia.replay
+    session = None
+    if os.environ.get(replay.RECORD_ENV):
+        session = replay.record(sys.modules[__name__], os.environ[replay.RECORD_ENV])
     # Configure terminal modes on POSIX only; Windows doesn't have termios/tty
     if not USING_WINDOWS:
         try:
@@ -2697,7 +1658,16 @@ def main():
 
     try:
         while True:
+            frame_profiler.enter(page_view())
             key = get_key()
+            # catch up every simulation tick that came due while we were
+            # rendering or away in a curses view
+            run_simulation()
+            # a glitch transition plays over the pages; the key is its own
+            if transition is not None:
+                if play_transition(key):
+                    continue
+                key = None
             clear()
             
             # (debug admin messages removed)
@@ -2712,34 +1682,32 @@ def main():
 
             # If we returned from world 2 after being sent there by sanity, rotate the active sanity stage
             try:
-                global awaiting_cycle_return, cycle_return_applied, sanity_stage, SANITY_WEIGHTS, sanity_points
-                if awaiting_cycle_return and world == 1 and not cycle_return_applied:
+                global SANITY_WEIGHTS
+                if GAME.awaiting_cycle_return and GAME.world == 1 and not GAME.cycle_return_applied:
                     # If the send was caused by mining progress, make Black Hole
                     # the next active sanity contributor so the player can pursue
                     # unlocking it as the next major milestone.
                     try:
-                        global last_send_cause
-                        if last_send_cause == 'mining':
-                            sanity_stage = 3
+                        if GAME.last_send_cause == 'mining':
+                            GAME.sanity_stage = 3
                         else:
-                            sanity_stage = (sanity_stage + 1) % len(SANITY_WEIGHTS)
+                            GAME.sanity_stage = (GAME.sanity_stage + 1) % len(SANITY_WEIGHTS)
                         # clear the remembered cause
-                        last_send_cause = None
+                        GAME.last_send_cause = None
                     except Exception:
                         try:
-                            sanity_stage = (sanity_stage + 1) % len(SANITY_WEIGHTS)
+                            GAME.sanity_stage = (GAME.sanity_stage + 1) % len(SANITY_WEIGHTS)
                         except Exception:
                             pass
-                    cycle_return_applied = True
-                    awaiting_cycle_return = False
-                    sanity_points = 0
-                    print("You feel your focus shift... new challenges matter more now.")
-                    time.sleep(1.0)
+                    GAME.cycle_return_applied = True
+                    GAME.awaiting_cycle_return = False
+                    GAME.sanity_points = 0
+                    show_notice("You feel your focus shift... new challenges matter more now.", 1.0)
                     # reset per-cycle one-time sanity event flags so milestones
                     # can be awarded again on the next cycle
                     try:
-                        for k in list(sanity_awarded.keys()):
-                            sanity_awarded[k] = False
+                        for k in list(GAME.sanity_awarded.keys()):
+                            GAME.sanity_awarded[k] = False
                     except Exception:
                         pass
             except Exception:
@@ -2748,80 +1716,67 @@ def main():
             # (Sanity bar will be rendered at the bottom of each page)
 
             # --- WORLD 1 RESEARCH PAGE ---
-            if world == 1 and page == 1:
-                if not research_page_unlocked: print("Research not unlocked yet.")
+            if GAME.world == 1 and GAME.page == 1:
+                if not GAME.research_page_unlocked: print("Research not unlocked yet.")
                 else:
-                    print(f"Money: {money:.2f}\n")
-                    timea += 0.1
-                    if timea >= 1:
-                        money += (
-                            rate * adminmultiplier * othermultiplier * ships_money_multiplier()
-                        )
-                        timea = 0.0
+                    print(f"Money: {format_money(GAME.money)}\n")
                     print("=== RESEARCH ===\n")
                     draw_research_tree()
-                    for res in research:
-                        st = "— COMPLETED" if res["purchased"] else f"| Cost: ${res['cost']}"
+                    for res in GAME.research:
+                        st = "— COMPLETED" if res["purchased"] else f"| Cost: ${format_money(res['cost'])}"
                         print(f"[{res['key']}] {res['name']} {st}")
-                if research_page_unlocked: print("\nPress [R] to switch pages.")
+                if GAME.research_page_unlocked: print("\nPress [R] to switch pages.")
                 # render sanity bar at bottom of this page
                 try:
                     render_sanity_bar_console()
                 except Exception:
                     pass
+                print_profile_overlay()
+                frame_profiler.begin("input")
                 if key:
                     k = key.lower()
                     if k == 'k':
-                        if world == 1:
+                        if GAME.world == 1:
                             glitch_transition()
-                            world = 2
+                            GAME.world = 2
                     elif k == 'q':
                         # ignore 'q' in main loop input handling
                         pass
-                    elif k == 'r' and research_page_unlocked: page = 0
+                    elif k == 'r' and GAME.research_page_unlocked: GAME.page = 0
                     else:
-                        for r in research:
-                            if k == r["key"]:
-                                buy_research(r)
-                                break
-                time.sleep(0.1)
+                        r = keymap.lookup(GAME, "research", k)
+                        if r is not None:
+                            buy_research(r)
+                frame_profiler.end("input")
+                pace_frame(idle=True)
                 continue
-            if world == 1 and page == 2:
-                if not technology_page_unlocked: 
+            if GAME.world == 1 and GAME.page == 2:
+                if not GAME.technology_page_unlocked: 
                     print("Mining not unlocked yet.")
                     print("\nPress [R] to return to City")
                 else:
-                    # Time and auto-mining
-                    timea += 0.1
-                    if timea >= 1:
-                        money += (
-                            rate * adminmultiplier * othermultiplier * ships_money_multiplier()
-                        )
-                        auto_mine_tick()
-                        timea = 0.0
-                    
                     # Get terminal width for layout
                     import shutil
                     term_width = shutil.get_terminal_size().columns
                     
                     # Left column content
                     left_content = []
-                    left_content.append(f"Money: ${money:.2f}")
+                    left_content.append(f"Money: ${format_money(GAME.money)}")
                     left_content.append("")
                     
                     # Mine shaft visualization (compact)
-                    if current_ore is None:
+                    if GAME.current_ore is None:
                         spawn_new_ore()
                     
-                    ore_name = current_ore["name"].upper()
-                    ore_symbol = current_ore["color"]
-                    hp_percent = ore_hp / ore_max_hp if ore_max_hp > 0 else 0
+                    ore_name = GAME.current_ore["name"].upper()
+                    ore_symbol = GAME.current_ore["color"]
+                    hp_percent = GAME.ore_hp / GAME.ore_max_hp if GAME.ore_max_hp > 0 else 0
                     bar_width = 25
                     filled = int(hp_percent * bar_width)
                     hp_bar = "[" + "#" * filled + " " * (bar_width - filled) + "]"
                     
                     left_content.append("╔══════════════════════════════╗")
-                    left_content.append(f"║   MINING SHAFT - DEPTH {depth}    ║")
+                    left_content.append(f"║   MINING SHAFT - DEPTH {GAME.depth}    ║")
                     left_content.append("╚══════════════════════════════╝")
                     left_content.append("       |           |")
                     left_content.append("      _|___________|_")
@@ -2832,40 +1787,40 @@ def main():
                     left_content.append("")
                     left_content.append(f"Ore: {ore_name}")
                     left_content.append(f"HP: {hp_bar}")
-                    left_content.append(f"{ore_hp}/{ore_max_hp}")
-                    left_content.append(f"Value: ${current_ore['value']}")
-                    left_content.append(f"Click: {ore_damage} dmg")
-                    left_content.append(f"Auto: {auto_mine_damage} DPS")
+                    left_content.append(f"{GAME.ore_hp}/{GAME.ore_max_hp}")
+                    left_content.append(f"Value: ${GAME.current_ore['value']}")
+                    left_content.append(f"Click: {GAME.ore_damage} dmg")
+                    left_content.append(f"Auto: {GAME.auto_mine_damage} DPS")
                     left_content.append("")
                     
                     # Ore Inventory (compact)
                     left_content.append("=== ORE INVENTORY ===")
-                    for ore_name_inv, amount in ore_inventory.items():
+                    for ore_name_inv, amount in GAME.ore_inventory.items():
                         if amount > 0:
                             left_content.append(f"{ore_name_inv.capitalize()}: {amount}")
-                    if not any(ore_inventory.values()):
+                    if not any(GAME.ore_inventory.values()):
                         left_content.append("(None yet)")
                     left_content.append("")
                     
                     # Depth selector
                     left_content.append("=== DEPTH ===")
-                    left_content.append(f"Current: {depth} | Max: {max_depth}")
+                    left_content.append(f"Current: {GAME.depth} | Max: {GAME.max_depth}")
                     depth_line = ""
-                    for d in range(1, min(max_depth + 1, 6)):
-                        marker = f"[{d}]" if d == depth else f" {d} "
+                    for d in range(1, min(GAME.max_depth + 1, 6)):
+                        marker = f"[{d}]" if d == GAME.depth else f" {d} "
                         depth_line += marker + " "
                     left_content.append(depth_line)
                     left_content.append("")
-                    left_content.append(f"Auto-Miners: {auto_miner_count}")
+                    left_content.append(f"Auto-Miners: {GAME.auto_miner_count}")
                     left_content.append("")
                     left_content.append("[SPACE] Mine")
                     left_content.append("[R] Return to City")
                     left_content.append("[1-5] Change Depth")
                     # Offer Black Hole unlock when player has reached end of mining (depth 5)
-                    if max_depth >= 5 and not blackhole_page_unlocked:
+                    if GAME.max_depth >= 5 and not GAME.blackhole_page_unlocked:
                         left_content.append("")
                         left_content.append("=== BLACK HOLE ===")
-                        left_content.append(f"[U] Unlock Black Hole - Cost: ${blackhole_unlock_cost}")
+                        left_content.append(f"[U] Unlock Black Hole - Cost: ${format_money(GAME.blackhole_unlock_cost)}")
                         left_content.append("(Requires Depth 5)")
                     
                     # Right column content - Tech Tree
@@ -2875,7 +1830,7 @@ def main():
                     
                     # Draw compact tech tree
                     nodes = []
-                    for tech in technology:
+                    for tech in GAME.technology:
                         mark = "X" if tech["purchased"] else " "
                         nodes.append(f"[{tech['key'].upper()}:{mark}]")
                     
@@ -2913,21 +1868,11 @@ def main():
                     
                     # Available upgrades (compact)
                     available_count = 0
-                    for tech in technology:
+                    for tech in GAME.technology:
                         if tech["purchased"]:
                             continue
                         
-                        # Check if unlocked
-                        is_unlocked = False
-                        if tech["key"] == "1":
-                            is_unlocked = True
-                        else:
-                            for prev_tech in technology:
-                                if prev_tech["purchased"] and tech["key"] in prev_tech.get("unlocks", []):
-                                    is_unlocked = True
-                                    break
-                        
-                        if is_unlocked:
+                        if keymap.tech_unlocked(GAME, tech):
                             available_count += 1
                             
                             # Format ore costs (compact)
@@ -2936,7 +1881,7 @@ def main():
                                 ore_cost_str += f"{ore_name_cost[:3]}:{amount} "
                             ore_cost_str = ore_cost_str.strip() if ore_cost_str else "Free"
                             
-                            money_str = f"${tech['money_cost']}"
+                            money_str = f"${format_money(tech['money_cost'])}"
                             
                             # Shorten long names
                             tech_name = tech['name']
@@ -2959,7 +1904,7 @@ def main():
                         right_line = right_content[i] if i < len(right_content) else ""
                         
                         # Pad left column to fixed width
-                        left_line = left_line[:left_width].ljust(left_width)
+                        left_line = fit(left_line, left_width)
                         
                         print(f"{left_line}  {right_line}")
 
@@ -2968,69 +1913,41 @@ def main():
                     render_sanity_bar_console()
                 except Exception:
                     pass
+                print_profile_overlay()
 
+                frame_profiler.begin("input")
                 if key:
                     k = key.lower()
                     if k == ' ':
                         mine_ore()
                     elif k == 'k':
                         glitch_transition()
-                        world = 2
+                        GAME.world = 2
                     elif k == 'q':
                         # ignore 'q' — do not quit
                         pass
                     elif k == 'r': 
-                        page = 0
-                    elif k == 'u' and max_depth >= 5 and not blackhole_page_unlocked:
-                        # Unlock black hole from mining end
-                        # Requires: 1 orichalcum_shard (depth 5 only ore) + money cost
-                        shard_count = ore_inventory.get('orichalcum_shard', 0)
-                        if shard_count >= 1 and money >= blackhole_unlock_cost:
-                            money -= blackhole_unlock_cost
-                            ore_inventory['orichalcum_shard'] -= 1
-                            blackhole_page_unlocked = True
-                            try:
-                                award_sanity_event('bh_unlock')
-                            except Exception:
-                                pass
-                            try:
-                                # also send player to world 2 on BH unlock
-                                trigger_send_to_world2('blackhole')
-                            except Exception:
-                                pass
-                        else:
-                            # not enough ore or money; ignore
-                            pass
+                        GAME.page = 0
+                    elif k == 'u' and GAME.max_depth >= 5 and not GAME.blackhole_page_unlocked:
+                        # Unlock black hole from mining end (ignored when short on ore or money)
+                        unlock_blackhole()
                     elif k in '12345':
                         # First check if this key is a technology key
-                        is_tech_key = False
-                        for tech in technology:
-                            if k == tech["key"]:
-                                # Check if this tech is available to purchase
-                                is_unlocked = False
-                                if tech["key"] == "1":
-                                    is_unlocked = True
-                                else:
-                                    for prev_tech in technology:
-                                        if prev_tech["purchased"] and tech["key"] in prev_tech.get("unlocks", []):
-                                            is_unlocked = True
-                                            break
-                                
-                                if is_unlocked and not tech["purchased"]:
-                                    buy_technology(tech)
-                                    is_tech_key = True
-                                    break
+                        tech = keymap.lookup(GAME, "technology", k)
+                        is_tech_key = tech is not None and not tech["purchased"] and keymap.tech_unlocked(GAME, tech)
+                        if is_tech_key:
+                            buy_technology(tech)
                         
                         # If not a tech key, treat as depth change
                         if not is_tech_key:
                             new_depth = int(k)
-                            if new_depth <= max_depth:
-                                depth = new_depth
+                            if new_depth <= GAME.max_depth:
+                                GAME.depth = new_depth
                                 spawn_new_ore()
                                 # award half-mining milestone when first reaching halfway depth
                                 try:
-                                    half_th = (max_depth + 1) // 2
-                                    if depth >= half_th:
+                                    half_th = (GAME.max_depth + 1) // 2
+                                    if GAME.depth >= half_th:
                                         try:
                                             award_sanity_event('mine_half')
                                         except Exception:
@@ -3039,108 +1956,106 @@ def main():
                                     pass
                     else:
                         # Handle other technology keys (q, w, e, r, t, y, u, i, o, p, 0)
-                        for tech in technology:
-                            if k == tech["key"]: 
-                                buy_technology(tech)
-                                break
+                        tech = keymap.lookup(GAME, "technology", k)
+                        if tech is not None:
+                            buy_technology(tech)
+                frame_profiler.end("input")
                 
-                time.sleep(0.1)
+                pace_frame(idle=True)
                 continue
-            if world == 1 and page == 0:
-                timea += 0.1
-                if timea >= 1:
-                    money += (
-                        rate * adminmultiplier * othermultiplier * ships_money_multiplier()
-                    )
-                    timea = 0.0
-
-                print(f"Money: {money:.2f}\n")
-                update_building_heights(w1upgrades)
+            if GAME.world == 1 and GAME.page == 0:
+                print(f"Money: {format_money(GAME.money)}\n")
+                update_building_heights(GAME.w1upgrades)
                 draw_city()
 
                 print("\n=== UPGRADES ===")
                 any_seen = False
-                for upg in upgrades:
-                    if money >= upg["cost"] * 0.1: upg["seen"] = True
+                for upg in GAME.upgrades:
+                    if GAME.money >= upg["cost"] * 0.1: upg["seen"] = True
                     if upg["seen"]:
                         any_seen = True
-                        status = f"+{upg['rate_inc']}/sec | Cost: ${upg['cost']}" if upg["count"] < upg["max"] else "MAXED"
+                        status = f"+{upg['rate_inc']}/sec | Cost: ${format_money(upg['cost'])}" if upg["count"] < upg["max"] else "MAXED"
+                        if GAME.buy_mode != 1 and upg["count"] < upg["max"]:
+                            n_lv, total = economy.quote(upg, GAME.money, GAME.buy_mode)
+                            status = f"+{upg['rate_inc'] * n_lv}/sec | {economy.buy_mode_label(GAME.buy_mode)} ({n_lv}): ${format_money(total)}"
                         if upg['max'] == 1:
                             cnt_str = f"({upg['count']})"
                         else:
                             cnt_str = f"({upg['count']}/{upg['max']})"
                         print(f"[{upg['key'].upper()}] {upg['name']} {cnt_str} {status}")
                 if not any_seen: print("(No upgrades available yet...)")
-                if research_page_unlocked: print("\nPress [R] to go to Research.")
-                if technology_page_unlocked: print("Press [T] to go to Technology.")
+                else: print(f"[O] Order size: {economy.buy_mode_label(GAME.buy_mode)}")
+                if GAME.research_page_unlocked: print("\nPress [R] to go to Research.")
+                if GAME.technology_page_unlocked: print("Press [T] to go to Technology.")
                 # Black hole page access
-                if blackhole_page_unlocked:
+                if GAME.blackhole_page_unlocked:
                     print("Press [B] to open the Black Hole page.")
                 # (Orichalcum shards are intentionally hidden from main page display)
                 try:
                     render_sanity_bar_console()
                 except Exception:
                     pass
+                print_profile_overlay()
 
             # --- WORLD 1: BLACK HOLE PAGE ---
-            if world == 1 and page == 3:
+            if GAME.world == 1 and GAME.page == 3:
                 # FIRST BH PAGE VISIT: Award sanity if first time entering
                 try:
-                    global blackhole_page_first_visit
-                    if not blackhole_page_first_visit:
+                    if not GAME.blackhole_page_first_visit:
                         award_sanity_event('bh_first_visit')
-                        blackhole_page_first_visit = True
+                        GAME.blackhole_page_first_visit = True
                 except Exception:
                     pass
                 
-                # income and auto effects
-                timea += 0.1
-                if timea >= 1:
-                    money += (
-                        rate * adminmultiplier * othermultiplier *
-                        ships_money_multiplier()
-                    )
-                    timea = 0.0
-
                 # render black hole (animated curses view)
                 disable_mouse()
+                console.release()
                 try:
                     curses.wrapper(curses_blackhole_view)
                 except Exception:
-                    # fallback to static render if curses fails
-                    print(f"Money: {money:.2f}\n")
-                    draw_blackhole_page()
-                    time.sleep(0.5)
+                    # fallback to the static page if curses fails, shown over
+                    # the next frames
+                    page = io.StringIO()
+                    with contextlib.redirect_stdout(page):
+                        print(f"Money: {format_money(GAME.money)}\n")
+                        draw_blackhole_page()
+                    show_notice(page.getvalue(), 0.5)
+                clear()
                 flush_stdin()
                 enable_mouse()
                 # return to city after viewing
-                page = 0
+                GAME.page = 0
                 print("\nPress [R] to return to City.")
 
+                frame_profiler.begin("input")
                 if key:
                     k = key.lower()
                     if k == 'r':
-                        page = 0
+                        GAME.page = 0
                     elif k == 'k':
                         glitch_transition()
-                        world = 2
+                        GAME.world = 2
                     elif k == 'q':
                         # ignore 'q' — do not quit
                         pass
+                    elif k == 'o':
+                        GAME.buy_mode = economy.next_buy_mode(GAME.buy_mode)
                     else:
-                        for upg in blackhole_upgrades:
-                            if k == upg["key"]:
-                                buy_blackhole_upgrade(upg)
-                                break
+                        upg = keymap.lookup(GAME, "blackhole_upgrades", k)
+                        if upg is not None:
+                            buy_blackhole_upgrade(upg, GAME.buy_mode)
+                frame_profiler.end("input")
 
-                time.sleep(0.1)
+                pace_frame(idle=True)
                 continue
 
             # --- WORLD 2 MAP VIEW (curses) ---
-            if world == 2:
+            if GAME.world == 2:
                 # open a curses-based full-screen map and wait for click
                 # disable raw mouse reporting from the outer code while curses runs
                 disable_mouse()
+                # curses / input() own the terminal until the map returns
+                console.release()
                 if HAVE_CURSES:
                     try:
                         region_res = curses.wrapper(curses_map_view)
@@ -3161,34 +2076,36 @@ def main():
                 if region:
                     if region == "world4_button":
                         # Clicked on World 4 button
-                        world = 4
+                        GAME.world = 4
                     elif did_combat:
                         # curses already ran combat and returned — check if should return to world 1
                         # (perform_player_action already set world = 1 if needed)
-                        if world == 1:
+                        if GAME.world == 1:
                             glitch_transition()
                     else:
                         # enter non-curses dungeon (fallback)
-                        world = 3
+                        GAME.world = 3
                         region_name = region.replace("_", " ").upper()
-                        print(f"\nYou clicked {region_name}. Entering Dungeon...")
-                        time.sleep(0.3)
+                        show_notice(f"You clicked {region_name}. Entering Dungeon...\n", 0.3)
+                clear()
                 # If map was canceled (returned None), stay in world 2
                 # Player can only return to world 1 through dungeon progression
 
             # --- DUNGEON / COMBAT VIEW ---
-            if world == 3:
+            if GAME.world == 3:
                 # initialize combat on first entry
-                if not combat_started:
+                if not GAME.combat_started:
                     enter_combat()
                 draw_combat_ui()
+                print_profile_overlay()
 
             # --- WORLD 4 KILL LIST ---
-            if world == 4:
+            if GAME.world == 4:
                 kill_list_view()
 
             # --- INPUT HANDLING ---
 
+            frame_profiler.begin("input")
             if key == '\x1b':
                 rest = read_mouse_sequence()
                 if rest and rest.startswith("[<"):
@@ -3204,21 +2121,20 @@ def main():
                             # Only handle left click (button 0) press
                             if b == 0:
                                 # Check if we're on the mining page and clicked on the ore area
-                                if world == 1 and page == 2 and mining_page_unlocked:
+                                if GAME.world == 1 and GAME.page == 2 and GAME.mining_page_unlocked:
                                     # Ore shaft is at rows 6-14 (the visual part with ore symbols)
                                     # and columns 1-32 in the left column
                                     if 6 <= y <= 14 and 1 <= x <= 32:
                                         mine_ore()  # Mine when clicking on ore visual
                                 # If we're on the Black Hole page, allow clicking to "Break The Reality"
                                 # by clicking anywhere on the right column where upgrades are shown.
-                                elif world == 1 and page == 3:
+                                elif GAME.world == 1 and GAME.page == 3:
                                     try:
-                                        # find the blackhole upgrade with key 'n' and attempt to buy it
-                                        for upg in blackhole_upgrades:
-                                            if upg.get('key') == 'n':
-                                                # attempt purchase; buy_blackhole_upgrade will handle cost and effects
-                                                buy_blackhole_upgrade(upg)
-                                                break
+                                        # the blackhole upgrade on key 'n'; buy_blackhole_upgrade
+                                        # handles cost and effects
+                                        upg = keymap.lookup(GAME, "blackhole_upgrades", 'n')
+                                        if upg is not None:
+                                            buy_blackhole_upgrade(upg)
                                     except Exception:
                                         pass
                                 
@@ -3234,22 +2150,22 @@ def main():
                 if k == 'q': 
                     pass
                 elif k == 'k':
-                    if world == 1:
+                    if GAME.world == 1:
                         glitch_transition()
-                        world = 2
-                elif k == 'r' and research_page_unlocked and world == 1: 
-                    page = 1
-                elif k == 't' and technology_page_unlocked and world == 1:
-                    page = 2
+                        GAME.world = 2
+                elif k == 'r' and GAME.research_page_unlocked and GAME.world == 1: 
+                    GAME.page = 1
+                elif k == 't' and GAME.technology_page_unlocked and GAME.world == 1:
+                    GAME.page = 2
                     # If we were sent to World 2 from mining at depth 3, award
                     # a one-shot sanity bump when the player visits Technology
                     try:
-                        if last_send_depth == 3 and not sanity_awarded.get('post_depth3_return', False):
+                        if GAME.last_send_depth == 3 and not GAME.sanity_awarded.get('post_depth3_return', False):
                             add_sanity(SANITY_INCREMENTS.get('technology', 1))
-                            sanity_awarded['post_depth3_return'] = True
+                            GAME.sanity_awarded['post_depth3_return'] = True
                     except Exception:
                         pass
-                elif world == 3:
+                elif GAME.world == 3:
                     # combat action keys
                     if k == 'a':
                         perform_player_action('attack')
@@ -3257,42 +2173,53 @@ def main():
                         perform_player_action('heal')
                     elif k == 'u':
                         perform_player_action('ability')
-                elif world == 1 and page == 0:
+                elif GAME.world == 1 and GAME.page == 0:
                     if k == 'b':
-                        if blackhole_page_unlocked:
-                            page = 3
+                        if GAME.blackhole_page_unlocked:
+                            GAME.page = 3
                         else:
                             # not unlocked yet
                             pass
                     # (removed admin 'm' unlock)
+                    elif k == 'o':
+                        GAME.buy_mode = economy.next_buy_mode(GAME.buy_mode)
                     else:
-                        for upg in upgrades:
-                            if k == upg["key"]:
-                                buy_upgrade(upg)
-                                break
-                elif world == 1 and page == 1:
-                    for r in research:
-                        if k == r["key"]: 
-                            buy_research(r)
-                            break
-                elif world == 1 and page == 2:
+                        upg = keymap.lookup(GAME, "upgrades", k)
+                        if upg is not None:
+                            buy_upgrade(upg, GAME.buy_mode)
+                elif GAME.world == 1 and GAME.page == 1:
+                    r = keymap.lookup(GAME, "research", k)
+                    if r is not None:
+                        buy_research(r)
+                elif GAME.world == 1 and GAME.page == 2:
                     if k == ' ':
                         mine_ore()
                     elif k in '12345':
                         new_depth = int(k)
-                        if new_depth <= max_depth:
-                            depth = new_depth
+                        if new_depth <= GAME.max_depth:
+                            GAME.depth = new_depth
                             spawn_new_ore()
                     # (removed mining admin 'z' shortcut)
                     else:
-                        for tech in technology:
-                            if k == tech["key"]: 
-                                buy_technology(tech)
-                                break
+                        tech = keymap.lookup(GAME, "technology", k)
+                        if tech is not None:
+                            buy_technology(tech)
+            frame_profiler.end("input")
             
-            time.sleep(0.1)
+            # only the city animates (drifting clouds); every other page just waits
+            # for a key or the next sim tick
+            pace_frame(idle=not (GAME.world == 1 and GAME.page == 0))
 
     finally:
+        # final journal record, then let the save thread flush and stop
+        persist('exit')
+        try:
+            save_manager.close()
+        except Exception:
+            pass
+        if session is not None:
+            session.close(GAME)
+
         # disable mouse
         try:
             disable_mouse()
@@ -3306,7 +2233,7 @@ def main():
             except Exception:
                 pass
 
-        clear()
+        console.wipe()
         print("Exited cleanly.")
 
 if __name__ == "__main__":